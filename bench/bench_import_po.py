@@ -0,0 +1,53 @@
+# bench/bench_import_po.py
+"""
+Time TranslationDB.import_po_entries() for a PO-sized batch against a
+large existing translation memory.
+
+    python -m bench.bench_import_po --db-size 1000000 --entries 40000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from polib import POEntry
+from pref.tran_history.translation_db import TranslationDB
+from bench.bench_list_entries import populate
+
+
+def make_entries(n: int):
+    """Half the sources already exist in the DB, every 5th entry is untranslated."""
+    return [
+        POEntry(
+            msgid=f"Source text number {i}" if i % 2 else f"New source {i}",
+            msgctxt=None if i % 3 else "ctx",
+            msgstr=f"Bản dịch mới {i}" if i % 5 else "",
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="import_po_entries benchmark")
+    parser.add_argument("--db-size", type=int, default=1_000_000)
+    parser.add_argument("--entries", type=int, default=40_000)
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = TranslationDB(os.path.join(tmp, "bench.db"))
+        populate(db.db_path, args.db_size, 1)
+        for label in ("first import", "re-import"):
+            start = time.perf_counter()
+            inserted = db.import_po_entries(entries)
+            print(f"{label:>13}: {time.perf_counter() - start:.3f}s, {inserted} new versions")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# bench/bench_list_entries.py
+"""
+Compare the bulk TranslationDB.list_entries() loader with the old
+one-query-per-record path.
+
+    python -m bench.bench_list_entries --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from pref.tran_history.translation_db import TranslationDB
+from pref.tran_history.tran_db_record import DatabasePORecord
+
+
+def populate(db_path: str, n_entries: int, versions_per_entry: int) -> None:
+    """Fill a fresh DB with `n_entries` sources and a few versions each."""
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    c.execute("PRAGMA synchronous = OFF;")
+    c.execute("BEGIN;")
+    c.executemany(
+        "INSERT INTO english_text(unique_id, en_text, context) VALUES(?,?,?);",
+        ((i, f"Source text number {i}", None if i % 3 else "ctx") for i in range(1, n_entries + 1))
+    )
+    rows = []
+    for i in range(1, n_entries + 1):
+        for v in range(1, versions_per_entry + 1):
+            # every 7th entry carries a blank version that must be filtered out
+            txt = "  " if (i % 7 == 0 and v == 1) else f"Bản dịch {i} phiên bản {v}"
+            rows.append((i, v, txt))
+    c.executemany(
+        "INSERT INTO tran_text(unique_id, version_id, tran_text) VALUES(?,?,?);",
+        rows
+    )
+    conn.commit()
+    conn.close()
+
+
+def legacy_list_entries(db: TranslationDB) -> List[DatabasePORecord]:
+    """The previous N+1 implementation, kept here as the baseline."""
+    c = db.conn.cursor()
+    c.execute("SELECT unique_id, en_text, context FROM english_text ORDER BY unique_id")
+    records = []
+    for uid, en, ctx in c.fetchall():
+        record = DatabasePORecord(unique_id=uid, msgid=en, msgctxt=ctx)
+        mid_lower = en.strip().lower()
+        record.msgstr_versions = [
+            (ver, txt) for ver, txt in db._fetch_translations(uid)
+            if txt.strip() and txt.strip().lower() != mid_lower
+        ]
+        records.append(record)
+    return records
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="list_entries benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--versions", type=int, default=2, help="versions per entry")
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the bulk loader")
+    args = parser.parse_args()
+
+    print(f"{'entries':>10} {'legacy (s)':>12} {'bulk (s)':>10} {'speed-up':>9}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = TranslationDB(os.path.join(tmp, "bench.db"))
+            populate(db.db_path, n, args.versions)
+
+            bulk_t, bulk = timed(db.list_entries)
+            if args.skip_legacy:
+                print(f"{n:>10} {'-':>12} {bulk_t:>10.3f} {'-':>9}")
+            else:
+                legacy_t, legacy = timed(legacy_list_entries, db)
+                assert [(r.unique_id, r.msgstr_versions) for r in legacy] == \
+                       [(r.unique_id, r.msgstr_versions) for r in bulk], "loaders disagree"
+                print(f"{n:>10} {legacy_t:>12.3f} {bulk_t:>10.3f} {legacy_t / bulk_t:>8.1f}x")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
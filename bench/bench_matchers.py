@@ -0,0 +1,120 @@
+# bench/bench_matchers.py
+"""
+Time every search.matchers backend per pattern length over a source tree
+(the Blender manual by default), to keep BACKEND_BY_LENGTH current.
+
+    python -m bench.bench_matchers $BLENDER_MANUAL --glob "*.rst,*.po"
+    python -m bench.bench_matchers $BLENDER_MANUAL --patterns "Shader" "AOV conflicting"
+
+Patterns default to words/phrases sampled from the corpus, one per length
+in --lengths. The pure-Python boyer_moore backend is timed on at most
+--bm-limit bytes and scaled up, since it takes minutes on a full tree.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from search.fast_search import find_all_files
+from search.matchers import MATCHER_BACKENDS, select_backend
+
+
+def load_corpus(root: str, globs: List[str]) -> List[bytes]:
+    blobs = []
+    for path in find_all_files(root, globs):
+        try:
+            with open(path, "rb") as f:
+                blobs.append(f.read())
+        except OSError:
+            pass
+    return blobs
+
+
+def sample_patterns(blobs: List[bytes], lengths: List[int], seed: int = 7) -> List[bytes]:
+    """One substring per length, taken from a random word boundary in the corpus."""
+    rng = random.Random(seed)
+    text = b"\n".join(blobs)
+    out = []
+    for n in lengths:
+        for _ in range(1000):
+            i = text.find(b" ", rng.randrange(len(text))) + 1
+            cand = text[i:i + n]
+            if len(cand) == n and cand[:1].isalpha() and b"\n" not in cand:
+                out.append(cand)
+                break
+    return out
+
+
+def time_backend(name: str, patterns, blobs: List[bytes], byte_limit: int = 0, repeat: int = 1):
+    """
+    Best-of-`repeat` seconds for one pass over the corpus (scaled up if
+    byte_limit cut it short), and the match count (None when cut short).
+    """
+    matcher = MATCHER_BACKENDS[name](patterns)
+    total = sum(len(b) for b in blobs)
+    best = None
+    for _ in range(repeat):
+        scanned, hits = 0, 0
+        start = time.perf_counter()
+        for blob in blobs:
+            hits += len(matcher.search(blob))
+            scanned += len(blob)
+            if byte_limit and scanned >= byte_limit:
+                break
+        elapsed = (time.perf_counter() - start) * total / max(scanned, 1)
+        best = elapsed if best is None else min(best, elapsed)
+    return best, hits if scanned >= total else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="literal matcher benchmark")
+    parser.add_argument("root", nargs="?", default=os.getenv("BLENDER_MANUAL", ROOT),
+                        help="tree to search (default: $BLENDER_MANUAL, else this repo)")
+    parser.add_argument("--glob", default="*.rst,*.po,*.py", help="comma-separated globs")
+    parser.add_argument("--patterns", nargs="+", help="explicit patterns instead of sampled ones")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--multi", type=int, default=8, help="size of the multi-pattern set")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per backend, best one kept")
+    parser.add_argument("--bm-limit", type=int, default=2_000_000,
+                        help="bytes scanned by boyer_moore before extrapolating (0 = all)")
+    args = parser.parse_args()
+
+    blobs = load_corpus(args.root, [g.strip() for g in args.glob.split(",")])
+    total_mb = sum(len(b) for b in blobs) / 1e6
+    print(f"{len(blobs)} files, {total_mb:.1f} MB from {args.root}")
+    if not blobs:
+        return
+
+    if args.patterns:
+        patterns = [p.encode("utf-8") for p in args.patterns]
+    else:
+        patterns = sample_patterns(blobs, args.lengths)
+    cases = [(f"{len(p):>3} B {p[:24].decode('utf-8', 'replace')!r}", (p,)) for p in patterns]
+    cases.append((f"{args.multi} patterns", tuple(sample_patterns(blobs, [6, 9, 12] * args.multi)[:args.multi])))
+
+    names = list(MATCHER_BACKENDS)
+    print(f"{'case':<36}" + "".join(f"{n + ' (ms)':>18}" for n in names) + f"{'fastest':>13}{'selected':>13}")
+    for label, pats in cases:
+        times = {}
+        counts = set()
+        for name in names:
+            limit = args.bm_limit if name == "boyer_moore" else 0
+            repeat = 1 if name == "boyer_moore" else args.repeat
+            elapsed, hits = time_backend(name, pats, blobs, limit, repeat)
+            times[name] = elapsed
+            if hits is not None:
+                counts.add(hits)
+        assert len(counts) == 1, f"backends disagree on {label}: {counts}"
+        fastest = min(times, key=times.get)
+        print(f"{label:<36}" + "".join(f"{times[n] * 1000:>18.1f}" for n in names)
+              + f"{fastest:>13}{select_backend(pats):>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# bench/bench_version_persist.py
+"""
+Write amplification of saving one record, old delete-and-reinsert vs.
+sync_versions() diffing, for two edits:
+  append  - a new translation is added (the suggestion-pane case)
+  rotate  - the oldest version is dropped and a new one appended
+
+    python -m bench.bench_version_persist --versions 1 10 100
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from pref.tran_history.translation_db import TranslationDB, sync_versions
+
+ROUNDS = 200
+
+
+def legacy_persist(c, unique_id: int, texts: List[str]) -> None:
+    """The previous DatabasePORecord._persist_versions body."""
+    c.execute("DELETE FROM tran_text WHERE unique_id = ?", (unique_id,))
+    for idx, t in enumerate(texts, start=1):
+        c.execute(
+            "INSERT INTO tran_text(unique_id, version_id, tran_text) VALUES(?, ?, ?)",
+            (unique_id, idx, t)
+        )
+
+
+SCENARIOS = {
+    "append": lambda texts, r: texts + [f"Bản dịch mới {r}"],
+    "rotate": lambda texts, r: texts[1:] + [f"Bản dịch mới {r}"],
+}
+
+
+def run(db: TranslationDB, persist, n_versions: int, edit):
+    """Seed a record with n versions, then edit+save ROUNDS times (reseeding each round)."""
+    conn = db.conn
+    with conn:
+        conn.execute("DELETE FROM tran_text")
+        conn.execute("DELETE FROM english_text")
+        conn.execute("INSERT INTO english_text(unique_id, en_text) VALUES(1, 'Source')")
+    seed = [f"Bản dịch {i}" for i in range(n_versions)]
+    changes, elapsed = 0, 0.0
+    for r in range(ROUNDS):
+        with conn:
+            sync_versions(conn.cursor(), 1, seed)
+        texts = edit(seed, r)
+        changes_before = conn.total_changes
+        start = time.perf_counter()
+        with conn:
+            persist(conn.cursor(), 1, texts)
+        elapsed += time.perf_counter() - start
+        changes += conn.total_changes - changes_before
+    return changes / ROUNDS, elapsed / ROUNDS * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="version persistence benchmark")
+    parser.add_argument("--versions", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    print(f"{'edit':>6} {'versions':>8} {'old rows/save':>14} {'new rows/save':>14} {'old ms':>8} {'new ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        db = TranslationDB(os.path.join(tmp, "bench.db"))
+        for name, edit in SCENARIOS.items():
+            for n in args.versions:
+                old_rows, old_ms = run(db, legacy_persist, n, edit)
+                new_rows, new_ms = run(db, sync_versions, n, edit)
+                print(f"{name:>6} {n:>8} {old_rows:>14.1f} {new_rows:>14.1f} {old_ms:>8.3f} {new_ms:>8.3f}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,13 @@ from PySide6.QtCore import (QSettings, Qt)
 from PySide6.QtGui import (QFont, QKeyEvent, QKeySequence, QAction)
 from PySide6.QtWidgets import (QTableWidget, QHeaderView)
 from typing import (Optional, Any, List, Dict, Tuple, Pattern)
-from pref.tran_history.translation_db import (TranslationDB)
+from pref.tran_history.translation_db import (db)
 from pref.kbd.keyboard_settings import (TABLE_ACTIONS)
 from po_editor.tab_record import (TabRecord)
 import re
 
 # ─── Database & Logging ───────────────────────────────────────────────────────
-db = TranslationDB()
+# `db` is the shared, lazily-opened TranslationDB re-exported from translation_db.
 
 
 # ─── Table Columns ────────────────────────────────────────────────────────────
@@ -40,7 +40,10 @@ from main_utils.actions_factory import get_actions
 from po_editor.po_editor_main_menu import POEditorMainMenu
 
 from lg import logger
-from gv import main_gv
+from gv import main_gv, db
+from pref.tran_history.tran_db_writer import writer as history_writer
+from search.file_catalog import close_catalogs
+from search.search_executor import search_executor, shutdown_search_executor
 
 
 class MainWindow(QMainWindow):
@@ -102,19 +105,25 @@ class MainWindow(QMainWindow):
                     window         = self,
                     find_widget    = search_panel.toggle_widget,
                     editor_manager = self.editor_manager,
-                    get_root_path  = lambda: main_gv.current_dir
+                    get_root_path  = lambda: main_gv.current_dir,
+                    results_model  = search_panel.results_model,
+                    get_po_fields  = search_panel.po_fields,
                 )
                 fp = search_panel.toggle_widget
                 fp.toggle_btn.toggled.connect(search_actions["on_toggle"])
                 fp.find_edit.returnPressed.connect(search_actions["on_find"])
+                fp.find_edit.textEdited.connect(search_actions["on_query_edited"])
+                search_panel.results_view.activated.connect(search_actions["on_result_activated"])
                 fp.btn_prev_found.clicked.connect(search_actions["on_prev_found"])
                 fp.btn_next_found.clicked.connect(search_actions["on_next_found"])
                 fp.btn_close.clicked.connect(search_actions["on_close"])
                 fp.replace_edit.returnPressed.connect(search_actions["on_replace_current"])
                 fp.btn_replace_current.clicked.connect(search_actions["on_replace_current"])
                 fp.btn_replace_all.clicked.connect(search_actions["on_replace_all"])
+                fp.btn_undo_replace.clicked.connect(search_actions["on_undo_replace"])
                 search_panel.include_edit.flag_use_settings.toggled.connect(search_actions['on_toggle'])
                 search_panel.exclude_edit.flag_search_opened.toggled.connect(search_actions['on_toggle'])
+                self.search_actions = search_actions
                 panel = search_panel
             else:
                 panel = QWidget()
@@ -202,5 +211,12 @@ if __name__ == "__main__":
 
     actions = get_actions(main_gv)
     QTimer.singleShot(20, actions['on_load_recent_files'])
+    # start the Find workers once the window is up, so the first search is warm
+    QTimer.singleShot(500, lambda: search_executor().warm_up(["toolbars.search.fast_search"]))
+    app.aboutToQuit.connect(history_writer.stop)
+    app.aboutToQuit.connect(db.close)
+    app.aboutToQuit.connect(close_catalogs)
+    app.aboutToQuit.connect(window.search_actions["on_quit"])
+    app.aboutToQuit.connect(shutdown_search_executor)
 
     sys.exit(app.exec())
@@ -27,6 +27,9 @@ from sugg.translate       import TranslateTask, suggestor
 from main_utils.popup_mnu import get_popup_menu
 from pref.preferences     import PreferencesDialog
 from main_utils.import_worker import on_import_po
+from main_utils.po_lazy_file  import load_po
+from main_utils.po_catalog_cache import schedule_snapshot
+from main_utils.po_table_proxy   import POTableProxyModel
 
 
 def get_actions(gv: MainGlobalVar):
@@ -71,16 +74,17 @@ def get_actions(gv: MainGlobalVar):
                 gv.open_tabs.setCurrentWidget(tab.widget)
                 return
 
-        # 2) Try to load the .po
+        # 2) Try to load the .po (large files are indexed now, entries parsed as shown)
         try:
-            po_file = polib.pofile(path)
+            po_file = load_po(path, cache=True)
         except Exception as e:
             QMessageBox.critical(gv.window, "Error", f"Failed to open {path}:\n{e}")
             return
 
         # 3) Instantiate your editor widget (which itself sets up tables, etc.)
+        #    on the catalog just loaded, so the file isn't parsed a second time
         from po_editor.po_editor_widget import POEditorWidget
-        editor = POEditorWidget(path)
+        editor = POEditorWidget(path, po_file=po_file)
         name = os.path.basename(path)
 
         # 4) Now make the TabRecord once, with the freshly loaded po_file
@@ -145,6 +149,7 @@ def get_actions(gv: MainGlobalVar):
             return on_save_file_as()
         try:
             rec.po_file.save(rec.file_path)
+            schedule_snapshot(rec.file_path)  # next open reads the saved catalog from the cache
             gv.window.statusBar().showMessage(f"Saved {rec.file_name}", 2000)
             rec.dirty = False
         except Exception as e:
@@ -177,10 +182,19 @@ def get_actions(gv: MainGlobalVar):
 
 
     # ─── TABLE SELECTION ────────────────────────────────────────
+    def _table_proxy(rec):
+        """The sorting proxy between the tab's table and its model, if it has one."""
+        model = rec.table.model() if rec.table is not None else None
+        return model if isinstance(model, POTableProxyModel) else None
+
     def on_table_selection(row, col):
         rec = _current_rec()
         if not rec:
             return
+        # `row` is a table row; current_row is the catalog index behind it
+        proxy = _table_proxy(rec)
+        if proxy is not None:
+            row = proxy.source_row(row)
         rec.current_row = row
         rec.current_entry = rec.po_file[row]
 
@@ -209,9 +223,8 @@ def get_actions(gv: MainGlobalVar):
             return
         text = rec.translation_edit.toPlainText()
         rec.po_file[rec.current_row].msgstr = text
-        rec.table.blockSignals(True)
-        rec.table.setItem(rec.current_row, 1, QTableWidgetItem(text))
-        rec.table.blockSignals(False)
+        # the view and its filter bitmaps pick the edit up from the model
+        rec.table_model.refresh_row(rec.current_row)
         safe_emit_signal(suggestor.clearSignal)
         safe_emit_signal(suggestor.addSignal, "new_translation")
 
@@ -222,6 +235,7 @@ def get_actions(gv: MainGlobalVar):
         if not rec or rec.current_row is None:
             return
         rec.po_file[rec.current_row].comment = rec.comments_edit.toPlainText()
+        rec.table_model.refresh_row(rec.current_row)
 
 
     # ─── TRANSLATE SUGGESTION ──────────────────────────────────
@@ -282,37 +296,38 @@ def get_actions(gv: MainGlobalVar):
 
     # ─── SORTING ───────────────────────────────────────────────
     def on_sort_untranslated():
-        _sort_and_reload(lambda e: bool(e.msgstr))
+        _sort_table('untranslated')
 
     def on_sort_fuzzy():
-        _sort_and_reload(lambda e: not e.fuzzy)
+        _sort_table('fuzzy')
 
     def on_sort_by_linenum():
-        _sort_and_reload(lambda e: e.linenum or 0)
+        _sort_table('linenum')
 
     def on_sort_by_id():
-        _sort_and_reload(lambda e: e.msgid.lower())
+        _sort_table('msgid')
 
     def on_sort_by_string():
-        _sort_and_reload(lambda e: e.msgstr.lower())
+        _sort_table('msgstr')
 
 
-    def _sort_and_reload(keyfunc):
+    def _sort_table(key):
+        """Sort the table view by a po_table_proxy.SORT_KEYS key; the catalog keeps its order."""
         rec = _current_rec()
         if not rec:
             return
-        # remember current entry
-        prev_entry = rec.po_file[rec.current_row] if rec.current_row is not None else None
-        # sort
-        rec.po_file.sort(key=keyfunc)
-        # reload
-        _load_entries()
-        # restore selection
-        if prev_entry in rec.po_file:
-            new_idx = rec.po_file.index(prev_entry)
-            rec.current_row = new_idx
-            rec.table.selectRow(new_idx)
-            on_table_selection(new_idx, 0)
+        proxy = _table_proxy(rec)
+        if proxy is None:
+            # only PO editor tables sit behind the sorting proxy
+            logger.warning("Can't sort %s: its table has no sorting proxy", rec.file_name)
+            gv.window.statusBar().showMessage(f"{rec.file_name} can't be sorted", 2000)
+            return
+        # the proxy carries the selection along; keep the current entry in view
+        proxy.sort_by(key)
+        if rec.current_row is not None:
+            row = proxy.proxy_row(rec.current_row)
+            if row >= 0:
+                rec.table.scrollTo(proxy.index(row, 0))
 
 
     # ─── TRANSLATION HISTORY ───────────────────────────────────
@@ -415,7 +430,9 @@ def get_actions(gv: MainGlobalVar):
         )
         if ans != QMessageBox.Yes:
             return
-        for ix in sorted((r.row() for r in sel), reverse=True):
+        proxy = _table_proxy(rec)
+        rows = [proxy.source_row(r.row()) if proxy is not None else r.row() for r in sel]
+        for ix in sorted(rows, reverse=True):
             rec.po_file.pop(ix)
         _load_entries()
 
@@ -426,11 +443,7 @@ def get_actions(gv: MainGlobalVar):
             return
         new_txt = rec.translation_edit.toPlainText()
         rec.po_file[rec.current_row].msgstr = new_txt
-        rec.table_model.setData(
-            rec.table_model.index(rec.current_row, 1),
-            new_txt,
-            Qt.EditRole
-        )
+        rec.table_model.refresh_row(rec.current_row)
         gv.window.statusBar().showMessage("Translation saved", 2000)
 
     # ─── TABLE DATA CHANGED ───────────────────────────────────
@@ -453,11 +466,23 @@ def get_actions(gv: MainGlobalVar):
     def on_load_recent_files():
         # Load the MRU list from disk
         files = QSettings("POEditor", "Settings").value("recentFiles", [])
+        if isinstance(files, str):  # QSettings returns a one-item list as a plain string
+            files = [files]
+        files = [p for p in files or [] if os.path.isfile(p)]
         if not files:
             return
         gv.recent_files = files
-        for path in files:
-            _do_load_file(path)
+        manager = getattr(gv.window, 'editor_manager', None)
+        if manager is None:
+            for path in files:
+                _do_load_file(path)
+            return
+        # placeholder tabs now; catalogs load in the background, the last active one first,
+        # and each editor is built when its tab is first shown
+        active = getattr(gv, 'current_file', None)
+        if active not in files:
+            active = files[0]
+        manager.add_pending_tabs(files, active)
 
     return {
         'on_open_file':               on_open_file,
@@ -1,10 +1,13 @@
 # main_utils/main_editor_tab_manager.py
 
 import os
+from typing import Iterable, Optional
+
 from PySide6.QtWidgets import QFileDialog
 from po_editor.po_editor_main_gui import POEditorWindow
 
 from main_utils.main_editor_tab import EditorTab
+from main_utils.po_tab_loader import SHOWN_PRIORITY, CatalogLoader, PlaceholderTab
 
 class EditorTabManager:
     def __init__(self, tab_widget):
@@ -12,8 +15,14 @@ class EditorTabManager:
         self.tab_widget.setTabsClosable(True)
         self.tab_widget.setMovable(True)
         self.tab_widget.tabCloseRequested.connect(self._on_close)
+        self.tab_widget.currentChanged.connect(self._on_current_changed)
         self.tabs = []
 
+        # catalogs of placeholder tabs are opened in the background
+        self.loader = CatalogLoader(self.tab_widget)
+        self.loader.loaded.connect(self._on_loaded)
+        self.loader.failed.connect(self._on_failed)
+
     def open_po_file(self, parent=None):
         path, _ = QFileDialog.getOpenFileName(
             parent,
@@ -33,7 +42,82 @@ class EditorTabManager:
         self.tabs.append(EditorTab(widget, path))
         self.tab_widget.setCurrentIndex(idx)
 
+    def add_pending_tabs(self, paths: Iterable[str], active: Optional[str] = None):
+        """
+        Add a placeholder tab per .po file right away and open the catalogs
+        in the background, `active` first and then in the given order. Each
+        editor is built when its tab is first shown.
+        """
+        open_paths = {os.path.abspath(t.path) for t in self.tabs}
+        paths = [p for p in dict.fromkeys(paths) if os.path.abspath(p) not in open_paths]
+        if not paths:
+            return
+        if active not in paths:
+            active = paths[0]
+
+        # no currentChanged while adding: only `active` is being shown
+        blocked = self.tab_widget.blockSignals(True)
+        for path in paths:
+            placeholder = PlaceholderTab(path)
+            idx = self.tab_widget.addTab(placeholder, os.path.basename(path))
+            self.tab_widget.setTabToolTip(idx, path)
+            self.tabs.append(EditorTab(placeholder, path))
+        self.tab_widget.blockSignals(blocked)
+
+        # started in priority order: the first ones run before the pool is full
+        ordered = [active] + [p for p in paths if p != active]
+        for rank, path in enumerate(ordered):
+            self.loader.load(path, len(ordered) - rank)
+        self.tab_widget.setCurrentIndex(self.tab_widget.indexOf(self._placeholder(active)))
+
+    def _placeholder(self, path: str) -> Optional[PlaceholderTab]:
+        for tab in self.tabs:
+            if isinstance(tab.widget, PlaceholderTab) and tab.path == path:
+                return tab.widget
+        return None
+
+    def _on_current_changed(self, index):
+        widget = self.tab_widget.widget(index)
+        if not isinstance(widget, PlaceholderTab):
+            return
+        if widget.po_file is not None:
+            self._hydrate(widget)
+        elif widget.error is None:
+            self.loader.load(widget.path, SHOWN_PRIORITY)
+
+    def _on_loaded(self, path, po_file):
+        placeholder = self._placeholder(path)
+        if placeholder is None:  # closed meanwhile
+            return
+        placeholder.set_loaded(po_file)
+        if self.tab_widget.currentWidget() is placeholder:
+            self._hydrate(placeholder)
+
+    def _on_failed(self, path, message):
+        placeholder = self._placeholder(path)
+        if placeholder is not None:
+            placeholder.set_failed(message)
+
+    def _hydrate(self, placeholder: PlaceholderTab):
+        """Replace a placeholder by the editor of its loaded catalog."""
+        from po_editor.po_editor_widget import POEditorWidget
+        editor = POEditorWidget(placeholder.path, po_file=placeholder.po_file)
+        idx = self.tab_widget.indexOf(placeholder)
+        label = self.tab_widget.tabText(idx)
+        blocked = self.tab_widget.blockSignals(True)
+        self.tab_widget.removeTab(idx)
+        self.tab_widget.insertTab(idx, editor, label)
+        self.tab_widget.setTabToolTip(idx, placeholder.path)
+        self.tab_widget.setCurrentIndex(idx)
+        self.tab_widget.blockSignals(blocked)
+        for tab in self.tabs:
+            if tab.widget is placeholder:
+                tab.widget = editor
+        placeholder.deleteLater()
+
     def _on_close(self, index):
         widget = self.tab_widget.widget(index)
+        if isinstance(widget, PlaceholderTab):
+            self.loader.cancel(widget.path)
         self.tabs = [t for t in self.tabs if t.widget is not widget]
         self.tab_widget.removeTab(index)
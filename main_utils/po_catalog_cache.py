@@ -0,0 +1,128 @@
+# main_utils/po_catalog_cache.py
+"""
+Parsed-catalog cache, so large .po files reopen without being parsed.
+
+A snapshot holds what polib parsed from a catalog: its header and
+metadata and, per entry, msgid/msgctxt/msgstr (and plurals), flags,
+comments, occurrences, previous msgids, obsolete and linenum, as tuples
+marshal-ed a page (PAGE_SIZE entries) at a time behind a fixed-size
+header. The header stamps the snapshot with the file's size, mtime and a
+BLAKE2 hash of its content:
+
+- same size and mtime: the snapshot is used as is;
+- same size, other mtime (touched, checked out again): the content hash
+  decides, and a match re-stamps the snapshot;
+- anything else: the snapshot is stale and the file is parsed again.
+
+load_snapshot() maps a snapshot and returns a CachedPOFile, which only
+decodes a page, and builds its POEntry objects, when one of its rows is
+shown (see po_lazy_file). Writing one needs a full parse, so
+schedule_snapshot() runs write_snapshot() in a search worker process; the
+writer and the snapshot format live in search.po_snapshot, which the
+worker imports without main_utils and its GUI. Snapshots live in
+CACHE_DIR, one per catalog path; beyond MAX_CACHE_BYTES the least
+recently used are removed.
+"""
+import marshal
+import mmap
+import os
+import struct
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+
+from main_utils.po_lazy_file import LAZY_MIN_BYTES, PAGE_SIZE, PagedPOFile
+from search.po_snapshot import CACHE_VERSION, HEADER, MAGIC, digest, row_entry, snapshot_file, write_snapshot
+from search.search_executor import search_executor
+
+_scheduled = set()  # paths with a snapshot being written
+
+
+class CachedPOFile(PagedPOFile):
+    """A PagedPOFile built from the marshal-ed entry pages of a mapped snapshot."""
+
+    def __init__(self, buf: mmap.mmap, page_bounds: List[int], page_size: int, count: int, **kwargs):
+        super().__init__(count, **kwargs)
+        self._buf = buf
+        self._page_bounds = page_bounds  # snapshot page i is buf[page_bounds[i]:page_bounds[i + 1]]
+        self._page_size = page_size
+
+    def _rows(self, first: int, last: int) -> list:
+        p0, p1 = first // self._page_size, -(-last // self._page_size)
+        rows = []
+        for p in range(p0, p1):
+            rows.extend(marshal.loads(self._buf[self._page_bounds[p]:self._page_bounds[p + 1]]))
+        skip = first - p0 * self._page_size
+        return rows[skip:skip + last - first]
+
+    def _build_page(self, first, last):
+        return [row_entry(row) for row in self._rows(first, last)]
+
+    def _build_all(self):
+        return self._build_page(0, len(self))
+
+    def _release(self):
+        super()._release()
+        self._buf.close()
+        self._buf = None
+
+
+def load_snapshot(path: str, wrapwidth: int = 78) -> Optional[CachedPOFile]:
+    """The catalog at `path` from its snapshot, or None if there's none or it's stale."""
+    cache = snapshot_file(path)
+    try:
+        st = os.stat(path)
+        with open(cache, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # ValueError: empty file
+        return None
+    try:
+        po = _open_snapshot(path, cache, buf, st, wrapwidth)
+    except (EOFError, ValueError, TypeError, struct.error):
+        po = None
+    if po is None:
+        buf.close()
+    return po
+
+
+def _open_snapshot(path, cache, buf, st, wrapwidth) -> Optional[CachedPOFile]:
+    magic, version, marshal_version, size, mtime_ns, source_digest, info_len = HEADER.unpack_from(buf)
+    if (magic, version, marshal_version) != (MAGIC, CACHE_VERSION, marshal.version) or size != st.st_size:
+        return None
+    if mtime_ns != st.st_mtime_ns:
+        try:
+            with open(path, 'rb') as f:
+                if digest(f.read()) != source_digest:
+                    return None
+            with open(cache, 'r+b') as f:
+                f.write(HEADER.pack(MAGIC, CACHE_VERSION, marshal.version, size, st.st_mtime_ns,
+                                    source_digest, info_len))
+        except OSError:
+            return None
+    start = HEADER.size + info_len
+    encoding, header, metadata, metadata_is_fuzzy, count, page_size, page_ends = \
+        marshal.loads(buf[HEADER.size:start])
+    try:
+        os.utime(cache)  # most recently used, for eviction
+    except OSError:
+        pass
+    po = CachedPOFile(buf, [start] + [start + end for end in page_ends], page_size, count,
+                      fpath=path, encoding=encoding, wrapwidth=wrapwidth)
+    po.header = header
+    po.metadata = metadata
+    po.metadata_is_fuzzy = metadata_is_fuzzy
+    if not count:
+        po.materialise()
+    return po
+
+
+def schedule_snapshot(path: str):
+    """Write the snapshot of a large catalog in the background (search worker pool)."""
+    path = os.path.abspath(path)
+    try:
+        if path in _scheduled or os.path.getsize(path) < LAZY_MIN_BYTES:
+            return
+        future = search_executor().submit(write_snapshot, path, PAGE_SIZE)
+    except (OSError, RuntimeError, BrokenProcessPool):  # RuntimeError: pool shut down
+        return
+    _scheduled.add(path)
+    future.add_done_callback(lambda _: _scheduled.discard(path))
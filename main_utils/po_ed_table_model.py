@@ -3,21 +3,39 @@ from typing import List, Optional
 from PySide6.QtCore    import Qt, QAbstractTableModel, QModelIndex
 from polib             import POEntry
 
+from main_utils.po_lazy_file   import PagedPOFile
+from main_utils.po_entry_store import CompactEntryStore, entry_row, entry_state
+
+# PySide6 resolves Qt enum attributes on every access (microseconds each);
+# data() runs for every painted cell, so it compares against these instead
+_DISPLAY_ROLE = Qt.DisplayRole
+_CHECK_STATE_ROLE = Qt.CheckStateRole
+_CHECKED, _UNCHECKED = Qt.Checked, Qt.Unchecked
+
 class POFileTableModel(QAbstractTableModel):
     """
     Table model for displaying PO entries with columns:
       0: msgid, 1: msgctxt, 2: msgstr, 3: fuzzy, 4: linenum
+
+    With `compact` (the default), a lazily loaded catalog is shown through a
+    CompactEntryStore, so painting rows doesn't build (and keep) a POEntry
+    per row; rows are only built in the catalog when edited.
     """
     def __init__(
         self,
         entries: Optional[List[POEntry]] = None,
         parent=None,
-        column_headers: List[str] = None
+        column_headers: List[str] = None,
+        compact: bool = True,
     ):
         super().__init__(parent)
-        self._entries = entries or []
+        self.compact = compact
+        self._entries = []
+        self._store = None
         self.column_headers = column_headers or []
         self.FUZZY_COL = 3
+        if entries:
+            self.setEntries(entries)
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         return len(self._entries)
@@ -29,28 +47,39 @@ class POFileTableModel(QAbstractTableModel):
         if not index.isValid():
             return None
 
-        entry = self._entries[index.row()]
-        col   = index.column()
+        col = index.column()
+        if role != _DISPLAY_ROLE and role != _CHECK_STATE_ROLE:
+            return None
+        # (msgid, msgctxt, msgstr, fuzzy, linenum)
+        row = self.row_cells(index.row())
 
         # 1) Qt will only draw a checkbox if you handle this role:
-        if role == Qt.CheckStateRole and col == self.FUZZY_COL:
-            return Qt.Checked if entry.fuzzy else Qt.Unchecked
+        if role == _CHECK_STATE_ROLE and col == self.FUZZY_COL:
+            return _CHECKED if row[3] else _UNCHECKED
 
         # 2) Your existing text for other columns:
-        if role == Qt.DisplayRole:
-            if col == 0:
-                return entry.msgid
-            elif col == 1:
-                return entry.msgctxt or ""
-            elif col == 2:
-                return entry.msgstr
-            elif col == self.FUZZY_COL:
-                # we don’t return anything here for the checkbox
-                return None
-            elif col == 4:
-                return entry.linenum
+        if role == _DISPLAY_ROLE:
+            if col in (0, 1, 2, 4):
+                return row[col]
+            # we don’t return anything for the checkbox column
         return None
 
+    def row_cells(self, row: int):
+        """(msgid, msgctxt, msgstr, fuzzy, linenum) of a row, without keeping its entry built."""
+        if self._store is not None:
+            return self._store.row(row)
+        return entry_row(self._entries[row])
+
+    def row_state(self, row: int):
+        """(translated, obsolete, has a comment) of a row, without keeping its entry built."""
+        if self._store is not None:
+            return self._store.state(row)
+        return entry_state(self._entries[row])
+
+    def refresh_row(self, row: int):
+        """Tell views (and filters) that the entry at `row` was edited in the catalog."""
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1), [])
+
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
         if role != Qt.DisplayRole or orientation != Qt.Horizontal:
             return None
@@ -89,6 +118,9 @@ class POFileTableModel(QAbstractTableModel):
     def setEntries(self, entries: List[POEntry]):
         self.beginResetModel()
         self._entries = entries
+        self._store = None
+        if self.compact and isinstance(entries, PagedPOFile) and entries.pending:
+            self._store = CompactEntryStore(entries)
         self.endResetModel()
 
     def entries(self) -> List[POEntry]:
@@ -0,0 +1,111 @@
+# main_utils/po_entry_store.py
+"""
+Compact, column-oriented copy of what the editor table shows.
+
+A POEntry carries a dict of attributes, flag and occurrence lists, a
+plurals dict and comment strings: far more than the five cells a table
+row paints, and hundreds of bytes per entry before any text. For a lazily
+loaded catalog (po_lazy_file.PagedPOFile) CompactEntryStore keeps only
+those cells, in columns:
+
+- msgid and msgstr: lists of the strings themselves;
+- msgctxt: array of indexes into a table of distinct contexts (0: none);
+- fuzzy: a bitset; linenum: an int array;
+- translated, obsolete and has-comment bitsets, for filtering.
+
+Columns are filled a page (PAGE_SIZE rows) at a time, the first time a
+row of the page is painted, from entries built for the purpose and then
+dropped (PagedPOFile.peek_page()). The catalog stays the document: an
+entry that is edited, selected or saved is built in it for good (e.g.
+po_file[row]) and from then on its row is read from that POEntry, so the
+store never needs writing back.
+"""
+from array import array
+from typing import List, Optional, Tuple
+
+import polib
+
+from main_utils import po_lazy_file
+from main_utils.po_lazy_file import PagedPOFile
+
+Row = Tuple[str, str, str, bool, int]  # msgid, msgctxt, msgstr, fuzzy, linenum
+State = Tuple[bool, bool, bool]         # translated, obsolete, has a comment
+
+
+def entry_row(entry: polib.POEntry) -> Row:
+    """The table cells of `entry`."""
+    return entry.msgid, entry.msgctxt or "", entry.msgstr, entry.fuzzy, entry.linenum
+
+
+def entry_state(entry: polib.POEntry) -> State:
+    """What the table filters on besides the cells; plural translations count as translated."""
+    translated = bool(entry.msgstr) or any(entry.msgstr_plural.values())
+    return translated, entry.obsolete, bool(entry.comment or entry.tcomment)
+
+
+class CompactEntryStore:
+    """Table cells of a PagedPOFile, read from built entries or from compact columns."""
+
+    def __init__(self, source: PagedPOFile):
+        self.source = source
+        n = len(source)
+        self._page_size = po_lazy_file.PAGE_SIZE
+        self._filled = bytearray(-(-n // self._page_size))
+        self._msgid: List[Optional[str]] = [None] * n
+        self._msgstr: List[Optional[str]] = [None] * n
+        self._ctxt = array('I', bytes(4 * n))
+        self._contexts: List[str] = [""]  # index 0: no context
+        self._context_ids = {"": 0}
+        self._fuzzy = bytearray(-(-n // 8))
+        self._linenum = array('q', bytes(8 * n))
+        self._translated = bytearray(-(-n // 8))
+        self._obsolete = bytearray(-(-n // 8))
+        self._commented = bytearray(-(-n // 8))
+
+    def __len__(self):
+        return len(self.source)
+
+    def row(self, index: int) -> Row:
+        entry = self.source.built(index)
+        if entry is not None:
+            return entry_row(entry)
+        page = index // self._page_size
+        if not self._filled[page]:
+            self._fill(page)
+        return (self._msgid[index], self._contexts[self._ctxt[index]], self._msgstr[index],
+                bool(self._fuzzy[index >> 3] >> (index & 7) & 1), self._linenum[index])
+
+    def state(self, index: int) -> State:
+        entry = self.source.built(index)
+        if entry is not None:
+            return entry_state(entry)
+        page = index // self._page_size
+        if not self._filled[page]:
+            self._fill(page)
+        byte, bit = index >> 3, index & 7
+        return (bool(self._translated[byte] >> bit & 1), bool(self._obsolete[byte] >> bit & 1),
+                bool(self._commented[byte] >> bit & 1))
+
+    def entry(self, index: int) -> polib.POEntry:
+        """The POEntry of row `index`, built in the catalog for good (e.g. to edit it)."""
+        return self.source[index]
+
+    def _fill(self, page: int):
+        first = page * self._page_size
+        for i, entry in enumerate(self.source.peek_page(page), first):
+            msgid, msgctxt, msgstr, fuzzy, linenum = entry_row(entry)
+            self._msgid[i] = msgid
+            self._msgstr[i] = msgstr
+            ctxt = self._context_ids.get(msgctxt)
+            if ctxt is None:
+                ctxt = self._context_ids[msgctxt] = len(self._contexts)
+                self._contexts.append(msgctxt)
+            self._ctxt[i] = ctxt
+            self._linenum[i] = linenum
+            byte, bit = i >> 3, 1 << (i & 7)
+            translated, obsolete, commented = entry_state(entry)
+            for flag, bits in ((fuzzy, self._fuzzy), (translated, self._translated),
+                               (obsolete, self._obsolete), (commented, self._commented)):
+                if flag:
+                    bits[byte] |= bit
+        self._filled[page] = 1
@@ -0,0 +1,156 @@
+# main_utils/po_filter.py
+"""
+Row filters for the PO table, from per-catalog bitmaps.
+
+FilterBitmaps keeps, for the catalog shown by a POFileTableModel, one
+bitmap per state in FILTER_STATES (a 0/1 byte per row) and one for the
+current text query. A filter is the OR of the selected states, AND the
+query; the bitmaps are combined as big integers, so (un)checking a
+state costs microseconds whatever the catalog size. Bitmaps are built
+on first use from the model's row cells (for a lazy catalog its compact
+store, not re-parsed POEntry objects), kept up to date row by row as the
+model reports edits, and rebuilt only when the model shows another
+catalog.
+
+Queries run over one string of all rows' msgid, msgstr and msgctxt
+joined by NULs, searched from row to row in C rather than cell by cell,
+and case-sensitively in a lower-cased copy of it (an IGNORECASE scan is
+several times slower); rows edited since it was built are tested on
+their own. Typing more of a query only tests the rows the shorter one
+matched.
+"""
+import re
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, compress
+from typing import Dict, Iterable, Optional, Set
+
+from main_utils.po_ed_table_model import POFileTableModel
+from search.query import SearchQuery
+
+FILTER_STATES = ('untranslated', 'fuzzy', 'obsolete', 'commented')
+# Below this many candidate rows a narrowed query tests them one by one
+NARROW_ROWS = 2000
+
+
+class FilterBitmaps:
+    """
+    Bitmaps of a POFileTableModel's catalog, and the row filter they give.
+
+    Set `states` and `text`, then mask() returns the 0/1 bytes of the rows
+    to show (or None: no filter), for POTableProxyModel.set_row_filter().
+    """
+
+    def __init__(self, model: POFileTableModel):
+        self.model = model
+        self.states = frozenset()
+        self.text = ""
+        self._entries = None       # catalog the bitmaps were built for
+        self._size = 0
+        self._bitmaps: Dict[str, bytearray] = {}
+        self._query_text: Optional[str] = None
+        self._query: Optional[bytearray] = None
+        self._haystack: Optional[str] = None   # every row's cells, NUL-separated
+        self._folded: Optional[str] = None     # _haystack.lower(), if that keeps every offset
+        self._row_starts = array('l')          # offset of each row in _haystack
+        self._stale: Set[int] = set()          # rows edited since _haystack was built
+        model.dataChanged.connect(self._on_data_changed)
+
+    def set_filter(self, states: Iterable[str] = (), text: str = ""):
+        unknown = set(states) - set(FILTER_STATES)
+        if unknown:
+            raise ValueError(f"Unknown filter: {', '.join(sorted(unknown))}")
+        self.states = frozenset(states)
+        self.text = text
+
+    @property
+    def active(self) -> bool:
+        return bool(self.states or self.text)
+
+    def mask(self) -> Optional[bytes]:
+        """Rows passing the filter, as a 0/1 byte per row; None if no filter is set."""
+        if not self.active:
+            return None
+        self._sync()
+        bits = None
+        if self.states:
+            bits = 0
+            for state in self.states:
+                bits |= int.from_bytes(self._bitmaps[state], 'little')
+        if self.text:
+            query = int.from_bytes(self._query_bitmap(self.text), 'little')
+            bits = query if bits is None else bits & query
+        return bits.to_bytes(self._size, 'little')
+
+    # ─── bitmaps ──────────────────────────────────────────────
+    def _sync(self):
+        entries = self.model.entries()
+        if entries is self._entries and len(entries) == self._size:
+            return
+        self._entries = entries
+        self._size = n = self.model.rowCount()
+        self._bitmaps = {state: bytearray(n) for state in FILTER_STATES}
+        self._query_text = self._query = None
+        self._haystack = None
+        for row in range(n):
+            self._set_states(row)
+
+    def _set_states(self, row: int):
+        fuzzy = self.model.row_cells(row)[3]
+        translated, obsolete, commented = self.model.row_state(row)
+        bitmaps = self._bitmaps
+        bitmaps['untranslated'][row] = not translated
+        bitmaps['fuzzy'][row] = fuzzy
+        bitmaps['obsolete'][row] = obsolete
+        bitmaps['commented'][row] = commented
+
+    def _matches(self, pattern, row: int) -> bool:
+        msgid, msgctxt, msgstr, _, _ = self.model.row_cells(row)
+        return any(pattern.search(text) for text in (msgid, msgstr, msgctxt) if text)
+
+    def _query_bitmap(self, text: str) -> bytearray:
+        if text == self._query_text:
+            return self._query
+        pattern = SearchQuery((text,), ignore_case=True).pattern
+        n = self._size
+        bitmap = bytearray(n)
+        if (self._query_text and self._query_text.casefold() in text.casefold()
+                and self._query.count(1) <= NARROW_ROWS):
+            # a longer query only matches rows the shorter one did
+            for row in compress(range(n), self._query):
+                bitmap[row] = self._matches(pattern, row)
+        else:
+            self._search_haystack(text, pattern, bitmap)
+        self._query_text, self._query = text, bitmap
+        return bitmap
+
+    def _search_haystack(self, text: str, pattern, bitmap: bytearray):
+        if self._haystack is None:
+            cells = [self.model.row_cells(row) for row in range(self._size)]
+            texts = ["\0".join((msgid, msgstr, msgctxt)) + "\0" for msgid, msgctxt, msgstr, _, _ in cells]
+            self._row_starts = array('l', accumulate((len(t) for t in texts), initial=0))
+            self._haystack = "".join(texts)
+            folded = self._haystack.lower()
+            self._folded = folded if len(folded) == len(self._haystack) else None
+            self._stale.clear()
+        haystack, scan, starts = self._haystack, pattern, self._row_starts
+        if self._folded is not None:
+            haystack, scan = self._folded, re.compile(re.escape(text.lower()))
+        m = scan.search(haystack)
+        while m:
+            row = bisect_right(starts, m.start()) - 1
+            bitmap[row] = 1
+            m = scan.search(haystack, starts[row + 1])  # on to the next row
+        for row in self._stale:
+            bitmap[row] = self._matches(pattern, row)
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        if self._entries is None or self._entries is not self.model.entries():
+            return
+        pattern = SearchQuery((self._query_text,), ignore_case=True).pattern if self._query_text else None
+        for row in range(top_left.row(), min(bottom_right.row() + 1, self._size)):
+            self._set_states(row)
+            if self._haystack is not None:
+                self._stale.add(row)
+            if pattern is not None:
+                self._query[row] = self._matches(pattern, row)
@@ -0,0 +1,224 @@
+# main_utils/po_lazy_file.py
+"""
+Lazily parsed .po files.
+
+polib.pofile() builds every POEntry before returning, so a 100k-entry
+catalog takes seconds before the first row can be shown. load_po() instead
+indexes the file in one pass over its bytes (regex scans for the `msgid`
+lines and the blank lines between entries, all in C) and returns a
+LazyPOFile: a POFile whose length is known at once and whose entries are
+parsed with polib on first access, PAGE_SIZE at a time. With cache=True a
+current parsed-catalog snapshot is used instead (see po_catalog_cache).
+
+Anything that needs the whole file (iteration, sorting, saving, inserting
+or removing entries, ...) parses the rest first, so a LazyPOFile behaves
+exactly like the result of polib.pofile(). Files too small to benefit, or
+laid out in a way the index can't split (entries not separated by blank
+lines), are parsed with polib.pofile() directly.
+"""
+import os
+from typing import List, Optional
+
+import polib
+
+from search.po_index import detect_encoding, index_entries
+
+# Entries parsed together when one of them is first accessed
+PAGE_SIZE = 256
+# Smaller files are parsed eagerly; the index wouldn't save anything noticeable
+LAZY_MIN_BYTES = 256 * 1024
+
+_PENDING = object()  # list slot of an entry not parsed yet
+_EMPTY_HEADER = 'msgid ""\nmsgstr ""\n\n'  # parsed ahead of a page of entries
+
+
+class PagedPOFile(polib.POFile):
+    """
+    A POFile whose entries are built on first access, PAGE_SIZE at a time.
+
+    Only indexing is lazy; every other list operation builds the remaining
+    entries first, after which this is a plain POFile. Subclasses implement
+    _build_page() and _build_all() from whatever they were loaded from.
+    """
+
+    def __init__(self, count: int, **kwargs):
+        super().__init__(**kwargs)
+        self._lazy = True
+        list.extend(self, [_PENDING] * count)
+
+    @property
+    def pending(self) -> int:
+        """Entries not built yet."""
+        if not self._lazy:
+            return 0
+        return sum(1 for e in list.__iter__(self) if e is _PENDING)
+
+    def _build_page(self, first: int, last: int) -> Optional[List[polib.POEntry]]:
+        """Entries first..last-1, or None if they can't be built on their own."""
+        raise NotImplementedError
+
+    def _build_all(self) -> List[polib.POEntry]:
+        raise NotImplementedError
+
+    def _release(self):
+        """Drop what the entries were built from."""
+        self._lazy = False
+
+    def _load_page(self, page: int):
+        first = page * PAGE_SIZE
+        last = min(first + PAGE_SIZE, len(self))
+        entries = self._build_page(first, last)
+        if entries is None:
+            entries = self._build_all()
+            self._release()
+            list.__init__(self, entries)
+            return
+        for i, entry in enumerate(entries, first):
+            if list.__getitem__(self, i) is _PENDING:
+                list.__setitem__(self, i, entry)
+
+    def built(self, index: int) -> Optional[polib.POEntry]:
+        """Entry `index` if it has been built, else None (without building it)."""
+        entry = list.__getitem__(self, index)
+        return None if entry is _PENDING else entry
+
+    def peek_page(self, page: int) -> List[polib.POEntry]:
+        """
+        The entries of PAGE_SIZE page `page`, building the missing ones
+        without keeping them (they are rebuilt if accessed later).
+        """
+        first = page * PAGE_SIZE
+        last = min(first + PAGE_SIZE, len(self))
+        if not self._lazy:
+            return list.__getitem__(self, slice(first, last))
+        entries = self._build_page(first, last)
+        if entries is None:
+            self._load_page(page)  # fell back to building everything
+            return list.__getitem__(self, slice(first, last))
+        for i in range(first, last):
+            entry = list.__getitem__(self, i)
+            if entry is not _PENDING:
+                entries[i - first] = entry
+        return entries
+
+    def materialise(self):
+        """Build every remaining entry."""
+        for page in range(-(-len(self) // PAGE_SIZE)):
+            if not self._lazy:  # fell back to building everything at once
+                return
+            last = min((page + 1) * PAGE_SIZE, len(self)) - 1
+            if list.__getitem__(self, last) is _PENDING:
+                self._load_page(page)
+        if self._lazy:
+            self._release()
+
+    def __getitem__(self, index):
+        if not self._lazy:
+            return list.__getitem__(self, index)
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if 0 <= index < len(self) and list.__getitem__(self, index) is _PENDING:
+            self._load_page(index // PAGE_SIZE)
+        return list.__getitem__(self, index)
+
+
+class LazyPOFile(PagedPOFile):
+    """A PagedPOFile parsed from the file's bytes, by the offsets of index_entries()."""
+
+    def __init__(self, data: bytes, bounds: List[int], first_lines: List[int], **kwargs):
+        super().__init__(len(bounds) - 1, **kwargs)
+        self._data = data
+        self._bounds = bounds            # entry i is data[bounds[i]:bounds[i + 1]]
+        self._first_lines = first_lines  # line entry i starts on
+
+    def _build_page(self, first, last):
+        text = self._data[self._bounds[first]:self._bounds[last]].decode(self.encoding, 'replace')
+        # behind an empty header, or polib takes the comment of the chunk's first entry for one
+        chunk = polib.pofile(_EMPTY_HEADER + text, encoding=self.encoding, wrapwidth=self.wrapwidth)
+        if len(chunk) != last - first:
+            # e.g. an entry with an empty msgid, which polib reads as metadata
+            return None
+        entries = list(chunk)
+        for i, entry in enumerate(entries, first):
+            # polib numbers lines within the chunk
+            entry.linenum = self._first_lines[i]
+        return entries
+
+    def _build_all(self):
+        po = polib.pofile(self._data.decode(self.encoding, 'replace'),
+                          encoding=self.encoding, wrapwidth=self.wrapwidth)
+        return list(po)
+
+    def _release(self):
+        super()._release()
+        self._data = None
+
+
+def _materialising(name: str):
+    method = getattr(polib.POFile, name)
+
+    def wrapper(self, *args, **kwargs):
+        self.materialise()
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in ('__iter__', '__reversed__', '__setitem__', '__delitem__', '__iadd__',
+              'append', 'insert', 'extend', 'remove', 'pop', 'sort', 'reverse',
+              'index', 'count', 'copy', 'clear'):
+    setattr(PagedPOFile, _name, _materialising(_name))
+
+
+def load_po(path: str, lazy: Optional[bool] = None, wrapwidth: int = 78,
+            cache: bool = False) -> polib.POFile:
+    """
+    Open a .po file: a LazyPOFile for large files (or if `lazy`), else
+    polib.pofile(). Raises like polib.pofile() for unreadable files.
+
+    With `cache`, a large file is loaded from its parsed-catalog snapshot
+    if that is current, and otherwise one is written in the background for
+    next time (see po_catalog_cache).
+    """
+    if lazy is None:
+        lazy = os.path.getsize(path) >= LAZY_MIN_BYTES
+    if not lazy:
+        return polib.pofile(path, wrapwidth=wrapwidth)
+    if cache:
+        from main_utils.po_catalog_cache import load_snapshot, schedule_snapshot  # imports this module
+        po = load_snapshot(path, wrapwidth)
+        if po is not None:
+            return po
+        schedule_snapshot(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    bounds = index_entries(data)
+    if bounds is None:
+        return polib.pofile(path, wrapwidth=wrapwidth)
+
+    encoding = detect_encoding(data, bounds[1])
+
+    first_lines, line, prev = [], 1, 0
+    for start in bounds[:-1]:
+        line += data.count(b'\n', prev, start)
+        first_lines.append(line)
+        prev = start
+
+    # the first entry is usually the header, which polib keeps as metadata
+    head = polib.pofile(data[:bounds[1]].decode(encoding, 'replace'),
+                        encoding=encoding, wrapwidth=wrapwidth)
+    if len(head) == 0:
+        bounds, first_lines = bounds[1:], first_lines[1:]
+    po = LazyPOFile(data, bounds, first_lines, fpath=path, encoding=encoding, wrapwidth=wrapwidth)
+    po.header = head.header
+    po.metadata = head.metadata
+    po.metadata_is_fuzzy = head.metadata_is_fuzzy
+    if len(head) == 1:
+        list.__setitem__(po, 0, head[0])
+    if not len(po):
+        po.materialise()
+    return po
@@ -0,0 +1,96 @@
+# main_utils/po_tab_loader.py
+"""
+Background loading of .po files for tabs that aren't built yet.
+
+At startup every file of the MRU list gets a PlaceholderTab at once (a
+label, nothing parsed), and a CatalogLoader opens the catalogs with
+load_po() on its own thread pool, most important first: the tab that
+was active last time, then the rest in MRU order. Showing a placeholder
+whose catalog is still queued moves it to the front of the queue. The
+editor widget itself is only built when its tab is first shown (see
+EditorTabManager), so startup doesn't depend on how many files were open.
+"""
+import os
+from typing import Dict, Optional
+
+import polib
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+from main_utils.po_lazy_file import load_po
+
+# QThreadPool priority of a catalog whose tab is being shown
+SHOWN_PRIORITY = 1 << 16
+
+
+class PlaceholderTab(QWidget):
+    """Stands in for an editor until its tab is shown and its catalog loaded."""
+
+    def __init__(self, path: str, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.po_file: Optional[polib.POFile] = None
+        self.error: Optional[str] = None
+        self.label = QLabel(f"Loading {os.path.basename(path)}…", self)
+        self.label.setAlignment(Qt.AlignCenter)
+        lay = QVBoxLayout(self)
+        lay.addWidget(self.label)
+
+    def set_loaded(self, po_file: polib.POFile):
+        self.po_file = po_file
+
+    def set_failed(self, message: str):
+        self.error = message
+        self.label.setText(f"Failed to open {self.path}:\n{message}")
+
+
+class CatalogLoader(QObject):
+    """Opens catalogs with load_po() off the GUI thread, highest priority first."""
+    loaded = Signal(str, object)   # path, POFile
+    failed = Signal(str, str)      # path, error message
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount()))
+        self._queued: Dict[str, "_LoadTask"] = {}
+        self.loaded.connect(self._done)
+        self.failed.connect(self._done)
+
+    def load(self, path: str, priority: int = 0):
+        """Queue `path`; a path already queued only has its priority raised."""
+        task = self._queued.get(path)
+        if task is not None:
+            if priority > task.priority and self.pool.tryTake(task):
+                task.priority = priority
+                self.pool.start(task, priority)
+            return
+        task = _LoadTask(self, path, priority)
+        self._queued[path] = task
+        self.pool.start(task, priority)
+
+    def cancel(self, path: str):
+        """Drop `path` from the queue if it hasn't started loading."""
+        task = self._queued.get(path)
+        if task is not None and self.pool.tryTake(task):
+            del self._queued[path]
+
+    def _done(self, path: str, _result):
+        self._queued.pop(path, None)
+
+
+class _LoadTask(QRunnable):
+    def __init__(self, loader: CatalogLoader, path: str, priority: int):
+        super().__init__()
+        self.setAutoDelete(False)  # kept in CatalogLoader._queued for tryTake()
+        self.loader = loader
+        self.path = path
+        self.priority = priority
+
+    def run(self):
+        try:
+            po_file = load_po(self.path, cache=True)
+        except Exception as e:
+            self.loader.failed.emit(self.path, str(e))
+        else:
+            self.loader.loaded.emit(self.path, po_file)
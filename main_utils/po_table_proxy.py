@@ -0,0 +1,203 @@
+# main_utils/po_table_proxy.py
+"""
+Sorting and filtering proxy for the PO table.
+
+POTableProxyModel sits between POFileTableModel and the table view and
+shows the source rows through a permutation array, so sorting never
+reorders the catalog (and with it the saved file). Sort keys are computed
+once per sort key and cached per source row, as is the resulting order:
+sorting again by a key already used, or reversing, only swaps arrays.
+A row filter (see po_filter) gives a 0/1 byte per source row; rows with
+0 are left out of the permutation.
+
+Source rows are the stable row ids: the selection (any persistent index)
+is carried across a sort by its source row, and callers translate with
+source_row()/proxy_row() instead of searching the catalog.
+"""
+from array import array
+from typing import Callable, Dict, Optional
+
+from PySide6.QtCore import QAbstractProxyModel, QModelIndex, QObject, Qt
+
+from main_utils.po_entry_store import Row
+
+RowFilter = Callable[[], Optional[bytes]]  # a 0/1 byte per source row, or None for all rows
+
+# Sort keys over a table row (msgid, msgctxt, msgstr, fuzzy, linenum)
+SORT_KEYS: Dict[str, Callable[[Row], object]] = {
+    'msgid':        lambda r: r[0].lower(),
+    'msgctxt':      lambda r: r[1].lower(),
+    'msgstr':       lambda r: r[2].lower(),
+    'untranslated': lambda r: bool(r[2]),
+    'fuzzy':        lambda r: not r[3],
+    'linenum':      lambda r: r[4] or 0,
+}
+# Sort key of each table column, for header clicks
+COLUMN_SORT_KEYS = ('msgid', 'msgctxt', 'msgstr', 'fuzzy', 'linenum')
+
+
+class POTableProxyModel(QAbstractProxyModel):
+    """Shows a POFileTableModel's rows in sorted order, without touching the catalog."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys: Dict[str, list] = {}             # sort key -> key of each source row
+        self._orders: Dict[str, array] = {}          # sort key -> source rows in ascending order
+        self._sort_key: Optional[str] = None
+        self._descending = False
+        self._row_filter: Optional[RowFilter] = None
+        self._rows = array('l')                      # proxy row -> source row
+        self._proxy_rows = array('l')                # source row -> proxy row, -1 if filtered out
+
+    # ─── source model ─────────────────────────────────────────
+    def setSourceModel(self, model):
+        old = self.sourceModel()
+        if old is not None:
+            old.modelReset.disconnect(self._on_source_reset)
+            old.dataChanged.disconnect(self._on_source_data_changed)
+            old.layoutChanged.disconnect(self._on_source_reset)
+        self.beginResetModel()
+        super().setSourceModel(model)
+        model.modelReset.connect(self._on_source_reset)
+        model.dataChanged.connect(self._on_source_data_changed)
+        model.layoutChanged.connect(self._on_source_reset)
+        self._invalidate()
+        self.endResetModel()
+
+    def _on_source_reset(self):
+        self.beginResetModel()
+        self._invalidate()
+        self.endResetModel()
+
+    def _invalidate(self):
+        """Drop the cached keys and order; the current sort is applied again."""
+        self._keys.clear()
+        self._orders.clear()
+        self._set_rows(self._sorted_rows())
+
+    def _on_source_data_changed(self, top_left: QModelIndex, bottom_right: QModelIndex, roles=()):
+        # keep the rows where they are (re-sort explicitly), but refresh their keys
+        source = self.sourceModel()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            cells = source.row_cells(row)
+            for name, keys in self._keys.items():
+                keys[row] = SORT_KEYS[name](cells)
+        self._orders.clear()
+        proxy_rows = [self._proxy_rows[r] for r in range(top_left.row(), bottom_right.row() + 1)
+                      if self._proxy_rows[r] >= 0]
+        if proxy_rows:
+            first, last = min(proxy_rows), max(proxy_rows)
+            self.dataChanged.emit(self.index(first, top_left.column()),
+                                  self.index(last, bottom_right.column()), roles)
+
+    # ─── sorting ──────────────────────────────────────────────
+    def sort_by(self, key: Optional[str], descending: bool = False):
+        """Sort by a SORT_KEYS name; None restores the catalog order."""
+        if key is not None and key not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {key}")
+        self._sort_key, self._descending = key, descending
+        self._relayout()
+
+    def set_row_filter(self, row_filter: Optional[RowFilter]):
+        """Show only the rows `row_filter()` accepts (asked again on every refilter)."""
+        self._row_filter = row_filter
+        self._relayout()
+
+    def refilter(self):
+        """Apply the row filter again, e.g. after its settings changed."""
+        self._relayout()
+
+    def _relayout(self):
+        # a layout change, not a reset: persistent indexes (the selection) follow their source rows
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        sources = [self._rows[i.row()] for i in persistent]
+        self._set_rows(self._sorted_rows())
+        self.changePersistentIndexList(
+            persistent,
+            [self.index(self._proxy_rows[s], i.column()) for s, i in zip(sources, persistent)],
+        )
+        self.layoutChanged.emit()
+
+    def _sorted_rows(self) -> array:
+        if self._sort_key is None:
+            n = self.sourceModel().rowCount() if self.sourceModel() is not None else 0
+            return array('l', range(n))
+        return self._order(self._sort_key, self._descending)
+
+    def sort(self, column: int, order=Qt.AscendingOrder):
+        if 0 <= column < len(COLUMN_SORT_KEYS):
+            self.sort_by(COLUMN_SORT_KEYS[column], order == Qt.DescendingOrder)
+
+    def _order(self, key: str, descending: bool) -> array:
+        order = self._orders.get(key)
+        if order is None:
+            keys = self._keys.get(key)
+            if keys is None:
+                source, func = self.sourceModel(), SORT_KEYS[key]
+                keys = self._keys[key] = [func(source.row_cells(r)) for r in range(source.rowCount())]
+            order = self._orders[key] = array('l', sorted(range(len(keys)), key=keys.__getitem__))
+        if descending:
+            order = order[::-1]
+        return order
+
+    def _set_rows(self, rows: array):
+        """Show the source rows `rows` (all of them, in display order), less those filtered out."""
+        n = len(rows)
+        mask = self._row_filter() if self._row_filter is not None else None
+        if mask is not None and len(mask) == n:
+            rows = array('l', [r for r in rows if mask[r]])
+        self._rows = rows
+        proxy_rows = array('l', [-1]) * n
+        for proxy_row, source_row in enumerate(rows):
+            proxy_rows[source_row] = proxy_row
+        self._proxy_rows = proxy_rows
+
+    # ─── row ids ──────────────────────────────────────────────
+    def source_row(self, proxy_row: int) -> int:
+        """Catalog index of a table row."""
+        return self._rows[proxy_row]
+
+    def proxy_row(self, source_row: int) -> int:
+        """Table row of a catalog index, or -1."""
+        if 0 <= source_row < len(self._proxy_rows):
+            return self._proxy_rows[source_row]
+        return -1
+
+    # ─── QAbstractProxyModel ──────────────────────────────────
+    def mapToSource(self, proxy_index: QModelIndex) -> QModelIndex:
+        if not proxy_index.isValid() or self.sourceModel() is None:
+            return QModelIndex()
+        return self.sourceModel().index(self._rows[proxy_index.row()], proxy_index.column())
+
+    def mapFromSource(self, source_index: QModelIndex) -> QModelIndex:
+        if not source_index.isValid():
+            return QModelIndex()
+        return self.index(self.proxy_row(source_index.row()), source_index.column())
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < len(self._rows)) or not (0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = None):
+        if index is None:  # QObject.parent()
+            return QObject.parent(self)
+        return QModelIndex()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        source = self.sourceModel()
+        return 0 if parent.isValid() or source is None else source.columnCount()
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        source = self.sourceModel()
+        return source.data(source.index(self._rows[index.row()], index.column()), role)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole):
+        source = self.sourceModel()
+        return None if source is None else source.headerData(section, orientation, role)
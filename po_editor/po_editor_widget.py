@@ -12,6 +12,9 @@ from PySide6.QtGui     import QKeySequence, QAction
 from PySide6.QtCore    import Qt, QSettings
 
 from main_utils.po_ed_table_model import POFileTableModel
+from main_utils.po_lazy_file      import load_po
+from main_utils.po_table_proxy    import POTableProxyModel
+from po_editor.po_filter_bar      import POFilterBar
 from main_utils.table_widgets     import SelectableTable
 from pref.tran_history.tran_db_record import DatabasePORecord
 from pref.tran_history.versions.tran_edit_version_tbl_model import VersionTableModel
@@ -27,7 +30,7 @@ class POEditorWidget(QWidget):
     Can be placed in a QTabWidget.
     """
 
-    def __init__(self, po_path: str, parent=None):
+    def __init__(self, po_path: str, parent=None, po_file=None):
         super().__init__(parent)
         self.po_path = po_path
 
@@ -39,16 +42,19 @@ class POEditorWidget(QWidget):
         acts = get_actions(gv=main_gv)
         self._connect_actions(acts)
 
-        # 3) Load the file
-        self.load_file(po_path)
+        # 3) Load the file (or show the catalog the caller already loaded)
+        self.load_file(po_path, po_file)
 
     def _build_ui(self):
         # ─── table model & view ────────────────────────────
         self.table_model = POFileTableModel(
             column_headers=[hdr for hdr, _ in MAIN_TABLE_COLUMNS]
         )
+        # the view shows the catalog through a sorting proxy; the catalog keeps its order
+        self.table_proxy = POTableProxyModel(self)
+        self.table_proxy.setSourceModel(self.table_model)
         self.table = SelectableTable()
-        self.table.setModel(self.table_model)
+        self.table.setModel(self.table_proxy)
         self.table.setSelectionBehavior(QTableWidget.SelectRows)
         self.table.setSelectionMode(QTableView.SingleSelection)
         # resize modes
@@ -84,8 +90,16 @@ class POEditorWidget(QWidget):
         left_bottom.setStretchFactor(0, 1)
         left_bottom.setStretchFactor(1, 1)
 
+        # live filter above the table
+        self.filter_bar = POFilterBar(self.table_model, self.table_proxy, self)
+        table_panel = QWidget()
+        tp_lay = QVBoxLayout(table_panel)
+        tp_lay.setContentsMargins(0,0,0,0)
+        tp_lay.addWidget(self.filter_bar)
+        tp_lay.addWidget(self.table)
+
         left_splitter = QSplitter(Qt.Vertical)
-        left_splitter.addWidget(self.table)
+        left_splitter.addWidget(table_panel)
         left_splitter.addWidget(left_bottom)
         left_splitter.setStretchFactor(0, 3)
         left_splitter.setStretchFactor(1, 1)
@@ -152,14 +166,15 @@ class POEditorWidget(QWidget):
         acts['on_table_selection'](row, 0)
         # and repopulate your suggestion controller, etc.
 
-    def load_file(self, path: str):
-        """Load a .po file into this widget’s model & UI."""
-        from polib import pofile
-        try:
-            po = pofile(path)
-        except Exception as e:
-            # show error…
-            return
+    def load_file(self, path: str, po_file=None):
+        """Load a .po file (or its already parsed `po_file`) into this widget’s model & UI."""
+        po = po_file
+        if po is None:
+            try:
+                po = load_po(path, cache=True)
+            except Exception as e:
+                # show error…
+                return
         main_gv.current_file = path
         self.table_model.setEntries(po)
         self.source_edit.clear()
@@ -0,0 +1,71 @@
+# po_editor/po_filter_bar.py
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QHBoxLayout, QLabel, QLineEdit, QToolButton, QWidget
+
+from main_utils.po_ed_table_model import POFileTableModel
+from main_utils.po_filter import FilterBitmaps
+from main_utils.po_table_proxy import POTableProxyModel
+
+# Filter buttons: (state, label, tooltip)
+FILTER_BUTTONS = [
+    ('untranslated', "Untranslated", "Show entries without a translation"),
+    ('fuzzy',        "Fuzzy",        "Show entries that need work"),
+    ('obsolete',     "Obsolete",     "Show obsolete (#~) entries"),
+    ('commented',    "Commented",    "Show entries with a comment"),
+]
+# Typing pauses this long (ms) before the table is filtered
+TEXT_DELAY_MS = 150
+
+
+class POFilterBar(QWidget):
+    """
+    Live filter for a PO table: checked states are OR-ed, the text (msgid,
+    msgstr or context, ignoring case) must also match. The view is filtered
+    by its POTableProxyModel; the catalog is left as it is.
+    """
+    def __init__(self, model: POFileTableModel, proxy: POTableProxyModel, parent=None):
+        super().__init__(parent)
+        self.bitmaps = FilterBitmaps(model)
+        self.proxy = proxy
+        self.model = model
+
+        lay = QHBoxLayout(self)
+        lay.setContentsMargins(0, 0, 0, 0)
+        self.buttons = {}
+        for state, label, tooltip in FILTER_BUTTONS:
+            btn = QToolButton(self)
+            btn.setText(label)
+            btn.setToolTip(tooltip)
+            btn.setCheckable(True)
+            btn.toggled.connect(self._apply)
+            lay.addWidget(btn)
+            self.buttons[state] = btn
+
+        self.text_edit = QLineEdit(self)
+        self.text_edit.setPlaceholderText("Filter…")
+        self.text_edit.setClearButtonEnabled(True)
+        lay.addWidget(self.text_edit, 1)
+        self.lbl_count = QLabel(self)
+        lay.addWidget(self.lbl_count)
+
+        self._text_timer = QTimer(self)
+        self._text_timer.setSingleShot(True)
+        self._text_timer.setInterval(TEXT_DELAY_MS)
+        self._text_timer.timeout.connect(self._apply)
+        self.text_edit.textChanged.connect(self._text_timer.start)
+
+        proxy.set_row_filter(self.bitmaps.mask)
+        proxy.modelReset.connect(self._update_count)
+        self._update_count()
+
+    def _apply(self):
+        self._text_timer.stop()
+        states = [state for state, btn in self.buttons.items() if btn.isChecked()]
+        self.bitmaps.set_filter(states, self.text_edit.text())
+        self.proxy.refilter()
+        self._update_count()
+
+    def _update_count(self):
+        shown, total = self.proxy.rowCount(), self.model.rowCount()
+        self.lbl_count.setText(f"{shown} of {total}" if self.bitmaps.active else f"{total} entries")
@@ -9,7 +9,9 @@ class ComboBoxDelegate(QStyledItemDelegate):
     def createEditor(self, parent, option, index: QModelIndex):
         logger.info("createEditor called")  # Debugging
         editor = QComboBox(parent)
-        record = index.model()._data[index.row()]  # Access the row's DatabasePORecord
+        record = index.model().record(index.row())  # Decodes the row's DatabasePORecord if needed
+        if record is None:
+            return editor
         # Populate the combo box with msgstr versions
         for version_id, msgstr in record.msgstr_versions:
             editor.addItem(f"{version_id} ▶ {msgstr}", version_id)
@@ -17,15 +19,17 @@ class ComboBoxDelegate(QStyledItemDelegate):
 
     def setEditorData(self, editor, index: QModelIndex):
         logger.info("setEditorData called")  # Debugging
-        record = index.model()._data[index.row()]
-        if record.msgstr_versions:
+        record = index.model().record(index.row())
+        if record is not None and record.msgstr_versions:
             current_version = record.msgstr_versions[0][0]  # Default to the first version
             editor.setCurrentText(f"{current_version} ▶ {record.msgstr_versions[0][1]}")
 
     def setModelData(self, editor, model, index: QModelIndex):
         logger.info("setModelData called")  # Debugging
         selected_version = editor.currentData()  # Get the selected version ID from the QComboBox
-        record = index.model()._data[index.row()]
+        record = index.model().record(index.row())
+        if record is None:
+            return
 
         # Check if the selected version already exists in msgstr_versions
         for version_id, msgstr in record.msgstr_versions:
@@ -1,23 +1,107 @@
+from array import array
+from collections import OrderedDict
+from typing import Optional
+
 from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex
 
+from pref.tran_history.tran_db_record import DatabasePORecord
+
+# unique_ids pulled from the DB per fetchMore() call
+FETCH_BATCH = 1000
+# rows decoded (msgid + version list) together when one of them is first shown
+DECODE_BLOCK = 64
+# decoded records kept in memory, least recently used dropped first
+RECORD_CACHE_SIZE = 2048
+
+
 class HistoryTableModel(QAbstractTableModel):
-    def __init__(self, data=None, columns=None):
+    def __init__(self, db=None, columns=None, fetch_batch: int = FETCH_BATCH,
+                 cache_size: int = RECORD_CACHE_SIZE):
         """
-        Initialize the model with a list of DatabasePORecord objects.
+        Lazy view over the translation DB, in unique_id order.
 
-        :param data: List of DatabasePORecord instances
+        Only the unique_ids of the rows fetched so far are held (8 bytes a
+        row); the view grows them with canFetchMore/fetchMore as it scrolls.
+        A row's msgid and version list are read when it is first displayed
+        or edited, a DECODE_BLOCK of neighbours at a time, and kept in an
+        LRU of `cache_size` records.
+
+        :param db: TranslationDB to read from
         :param columns: List of tuples defining column headers and behaviors
         """
         super().__init__()
-        self._data = data if data else []
+        self._db = db
         self._columns = columns or []
-
-    def rowCount(self, parent=None):
-        return len(self._data)
-
-    def columnCount(self, parent=None):
+        self._fetch_batch = fetch_batch
+        self._cache_size = cache_size
+        self._ids = array('q')
+        self._at_end = db is None
+        self._cache: "OrderedDict[int, DatabasePORecord]" = OrderedDict()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._ids)
+
+    def columnCount(self, parent=QModelIndex()):
         return len(self._columns)
 
+    # ─── Lazy loading ────────────────────────────────────────────────────
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._at_end
+
+    def fetchMore(self, parent=QModelIndex()):
+        self._fetch(self._fetch_batch)
+
+    def fetchUpTo(self, row: int) -> bool:
+        """Fetch ids until `row` exists, in one query. False if there are fewer rows."""
+        missing = row + 1 - len(self._ids)
+        if missing > 0 and not self._at_end:
+            self._fetch(max(missing, self._fetch_batch))
+        return row < len(self._ids)
+
+    def _fetch(self, count: int):
+        after_id = self._ids[-1] if self._ids else None
+        ids = self._db.entry_ids(after_id=after_id, limit=count)
+        if len(ids) < count:
+            self._at_end = True
+        if ids:
+            first = len(self._ids)
+            self.beginInsertRows(QModelIndex(), first, first + len(ids) - 1)
+            self._ids.extend(ids)
+            self.endInsertRows()
+
+    def record(self, row: int) -> Optional[DatabasePORecord]:
+        """Decoded record of `row` (None if it was deleted from the DB meanwhile)."""
+        if not 0 <= row < len(self._ids):
+            return None
+        uid = self._ids[row]
+        rec = self._cache.get(uid)
+        if rec is None:
+            self._decode_block(row)
+            rec = self._cache.get(uid)
+        else:
+            self._cache.move_to_end(uid)
+        return rec
+
+    def _decode_block(self, row: int):
+        start = row - row % DECODE_BLOCK
+        end = min(start + DECODE_BLOCK, len(self._ids)) - 1
+        for rec in self._db.records_between(self._ids[start], self._ids[end]):
+            self._cache[rec.unique_id] = rec
+            self._cache.move_to_end(rec.unique_id)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    def reload(self):
+        """Drop every fetched row and decoded record; the view refetches from the top."""
+        self.beginResetModel()
+        self._ids = array('q')
+        self._cache.clear()
+        self._at_end = self._db is None
+        self.endResetModel()
+
+    # ─── Qt model API ────────────────────────────────────────────────────
     def flags(self, index: QModelIndex):
         flags = super().flags(index)
         if index.column() == 2:  # For column 2 (msgstr)
@@ -28,26 +112,24 @@ class HistoryTableModel(QAbstractTableModel):
         """
         Return the data for a specific item in the model, depending on the role.
         """
-        if index.isValid():
-            record = self._data[index.row()]
-            column = index.column()
-
-            if role == Qt.DisplayRole:
-                # Display appropriate data based on the column
-                if column == 0:  # ID
-                    return record.unique_id
-                elif column == 1:  # msgid
-                    return record.msgid
-                elif column == 2:  # msgstr
-                    try:
-                        return f"{record.msgstr_versions[0][0]}, {record.msgstr_versions[0][1]}"
-                    except Exception as e:
-                        pass
-            elif role == Qt.ToolTipRole:
-                # Optionally, you can add tooltips for extra information (e.g., for msgstr versions)
-                if column == 2 and record.msgstr_versions:
-                    return "\n".join([f"Version {v[0]}: {v[1]}" for v in record.msgstr_versions])
-
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        column = index.column()
+        if role == Qt.DisplayRole and column == 0:  # ID, known without decoding
+            return self._ids[index.row()]
+
+        record = self.record(index.row())
+        if record is None:
+            return None
+        if role == Qt.DisplayRole:
+            # Display appropriate data based on the column
+            if column == 1:  # msgid
+                return record.msgid
+            elif column == 2 and record.msgstr_versions:  # msgstr
+                return f"{record.msgstr_versions[0][0]}, {record.msgstr_versions[0][1]}"
+        elif column == 2 and record.msgstr_versions:
+            # Tooltip lists every version of the msgstr
+            return "\n".join([f"Version {v[0]}: {v[1]}" for v in record.msgstr_versions])
         return None
 
     def setData(self, index, value, role=Qt.EditRole):
@@ -55,10 +137,10 @@ class HistoryTableModel(QAbstractTableModel):
         Update data in the model. If the column is msgstr, update the corresponding DatabasePORecord.
         """
         if index.isValid() and role == Qt.EditRole:
-            record = self._data[index.row()]
+            record = self.record(index.row())
             column = index.column()
 
-            if column == 2:  # msgstr
+            if record is not None and column == 2:  # msgstr
                 record.update_translation_version(value)  # Update translation version in the DatabasePORecord
                 self.dataChanged.emit(index, index)  # Notify that the data has changed
                 return True
@@ -75,41 +157,5 @@ class HistoryTableModel(QAbstractTableModel):
                 return str(section + 1)
         return None
 
-    def insertRow(self, row, record):
-        """
-        Insert a new DatabasePORecord into the model at the specified row index.
-        """
-        self.beginInsertRows(Qt.QModelIndex(), row, row)
-        self._data.insert(row, record)
-        self.endInsertRows()
-
-    def removeRow(self, row):
-        """
-        Remove a DatabasePORecord from the model at the specified row index.
-        """
-        self.beginRemoveRows(Qt.QModelIndex(), row, row)
-        self._data.pop(row)
-        self.endRemoveRows()
-
-    def refreshData(self, data):
-        """
-        Refresh the model data with a new list of DatabasePORecord instances.
-        """
-        self.beginResetModel()
-        self._data = data  # Replace old data with new records
-        self.endResetModel()
-
-    def getData(self):
-        return self._data
-
     def getColumns(self):
         return self._columns
-
-    # def setHeaderData(self, table_view):
-    #     """ Set header behavior like ResizeToContents or Stretch from TABLE_COLUMNS """
-    #     header = table_view.horizontalHeader()
-    #     for col, (_, header_behavior) in enumerate(self._columns):
-    #         if header_behavior == QHeaderView.ResizeToContents:
-    #             header.setSectionResizeMode(col, QHeaderView.ResizeToContents)
-    #         elif header_behavior == QHeaderView.Stretch:
-    #             header.setSectionResizeMode(col, QHeaderView.Stretch)
@@ -0,0 +1,72 @@
+# pref/tran_history/tran_db_connection.py
+"""
+Per-thread SQLite connections for the translation history DB.
+
+Every thread gets its own connection, opened once and reused, so a long
+import on a worker thread never shares a handle (or its open transaction)
+with suggestion lookups on the GUI thread. The DB runs in WAL mode, which
+lets those readers proceed while the writer commits.
+"""
+import sqlite3
+import threading
+from typing import Callable, Dict, Optional, Tuple
+from lg import logger
+
+# (pragma, value) applied to every new connection; journal_mode is persistent
+# in the file, the rest are per-connection.
+CONNECTION_PRAGMAS: Tuple[Tuple[str, object], ...] = (
+    ("journal_mode", "WAL"),
+    ("synchronous", "NORMAL"),        # WAL + NORMAL: durable on checkpoint, no fsync per commit
+    ("busy_timeout", 5000),           # ms to wait on a locked DB instead of failing
+    ("cache_size", -64000),           # KiB (negative = size, not pages) → 64 MB
+    ("mmap_size", 268435456),         # 256 MB memory-mapped reads
+    ("temp_store", "MEMORY"),
+)
+
+
+class ConnectionPool:
+    """
+    Hands out one sqlite3.Connection per thread for a single DB file.
+
+    `on_open` runs on each new connection (e.g. to register SQL functions).
+    Connections of threads that have exited are closed lazily.
+    """
+    def __init__(self, db_path: str, on_open: Optional[Callable[[sqlite3.Connection], None]] = None):
+        self.db_path = db_path
+        self._on_open = on_open
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[threading.Thread, sqlite3.Connection] = {}
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._reap_dead_threads()
+                self._connections[threading.current_thread()] = conn
+        return conn
+
+    def _open(self) -> sqlite3.Connection:
+        # check_same_thread is off only so close_all() can run from any thread;
+        # each connection is still used by the thread that opened it.
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma, value in CONNECTION_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        if self._on_open:
+            self._on_open(conn)
+        logger.info(f"Opened translation DB connection for thread {threading.current_thread().name}")
+        return conn
+
+    def _reap_dead_threads(self) -> None:
+        for thread in [t for t in self._connections if not t.is_alive()]:
+            self._connections.pop(thread).close()
+
+    def close_all(self) -> None:
+        """Close every pooled connection (call on app exit)."""
+        with self._lock:
+            for conn in self._connections.values():
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
@@ -0,0 +1,159 @@
+# pref/tran_history/tran_db_migrations.py
+"""
+Versioned schema migrations for the translation history DB.
+
+The applied version lives in `PRAGMA user_version`. Each migration runs in
+its own transaction together with the version bump, so an interrupted
+upgrade resumes from the last completed step on the next open.
+"""
+import sqlite3
+from typing import Callable, List, Tuple
+from lg import logger
+
+
+def _dedupe_english_text(c: sqlite3.Cursor) -> None:
+    """
+    Merge duplicate (en_text, context) sources into the lowest unique_id,
+    then make the pair UNIQUE. NULL and '' contexts count as the same key.
+    Translations held only by a duplicate are appended to the kept record
+    as new versions, in (duplicate id, version) order.
+    """
+    c.execute("DROP TABLE IF EXISTS temp.dup_map")
+    c.execute("""
+        CREATE TEMP TABLE dup_map AS
+        SELECT e.unique_id AS old_id, k.keep_id
+          FROM english_text AS e
+          JOIN (SELECT en_text, IFNULL(context, '') AS ctx, MIN(unique_id) AS keep_id
+                  FROM english_text
+                 GROUP BY en_text, IFNULL(context, '')
+                HAVING COUNT(*) > 1) AS k
+            ON e.en_text = k.en_text AND IFNULL(e.context, '') = k.ctx
+         WHERE e.unique_id <> k.keep_id
+    """)
+    c.execute("SELECT COUNT(*) FROM temp.dup_map")
+    dup_count = c.fetchone()[0]
+    if dup_count:
+        c.execute("""
+            INSERT INTO tran_text(unique_id, version_id, tran_text, changed_at)
+            SELECT keep_id,
+                   base + ROW_NUMBER() OVER (PARTITION BY keep_id ORDER BY first_old, first_ver),
+                   tran_text, changed_at
+              FROM (SELECT d.keep_id, t.tran_text,
+                           MIN(d.old_id) AS first_old, MIN(t.version_id) AS first_ver,
+                           MIN(t.changed_at) AS changed_at,
+                           (SELECT COALESCE(MAX(k.version_id), 0) FROM tran_text AS k
+                             WHERE k.unique_id = d.keep_id) AS base
+                      FROM temp.dup_map AS d
+                      JOIN tran_text AS t ON t.unique_id = d.old_id
+                     WHERE NOT EXISTS (SELECT 1 FROM tran_text AS k
+                                        WHERE k.unique_id = d.keep_id
+                                          AND k.tran_text = t.tran_text)
+                     GROUP BY d.keep_id, t.tran_text)
+        """)
+        c.execute("DELETE FROM tran_text WHERE unique_id IN (SELECT old_id FROM temp.dup_map)")
+        c.execute("DELETE FROM english_text WHERE unique_id IN (SELECT old_id FROM temp.dup_map)")
+        logger.info(f"Merged {dup_count} duplicate english_text rows")
+    c.execute("DROP TABLE temp.dup_map")
+    c.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS english_text_key"
+        " ON english_text(en_text, IFNULL(context, ''))"
+    )
+
+
+def _add_tran_history_index(c: sqlite3.Cursor) -> None:
+    """
+    Covering index for version lists: history loads and MAX(version_id)
+    lookups are answered from the index without touching tran_text rows.
+    """
+    c.execute(
+        "CREATE INDEX IF NOT EXISTS tran_text_history"
+        " ON tran_text(unique_id, version_id, tran_text)"
+    )
+
+
+# FTS5 tables mirroring the text columns; rowids are the source rows' ids.
+FTS_TABLES = (
+    # (fts table, content table, content rowid, text column)
+    ("english_fts", "english_text", "unique_id", "en_text"),
+    ("tran_fts",    "tran_text",    "id",        "tran_text"),
+)
+
+
+def _fts_tokenizer() -> str:
+    """trigram gives substring matching (SQLite >= 3.34); else word tokens."""
+    return "trigram" if sqlite3.sqlite_version_info >= (3, 34, 0) else "unicode61"
+
+
+def _add_fulltext_index(c: sqlite3.Cursor) -> None:
+    """
+    External-content FTS5 indexes over msgid and translation texts, kept in
+    sync by triggers. Skipped (search falls back to LIKE) if the SQLite
+    build has no FTS5.
+    """
+    tokenizer = _fts_tokenizer()
+    for fts, table, rowid, column in FTS_TABLES:
+        try:
+            c.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+                f"{column}, content='{table}', content_rowid='{rowid}', tokenize='{tokenizer}')"
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Full-text search unavailable ({e}); history search will scan")
+            return
+        c.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN
+              INSERT INTO {fts}(rowid, {column}) VALUES (new.{rowid}, new.{column});
+            END""")
+        c.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN
+              INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.{rowid}, old.{column});
+            END""")
+        c.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE OF {column} ON {table} BEGIN
+              INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.{rowid}, old.{column});
+              INSERT INTO {fts}(rowid, {column}) VALUES (new.{rowid}, new.{column});
+            END""")
+        c.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+# (target user_version, migration) in ascending order; append only.
+MIGRATIONS: List[Tuple[int, Callable[[sqlite3.Cursor], None]]] = [
+    (1, _dedupe_english_text),
+    (2, _add_tran_history_index),
+    (3, _add_fulltext_index),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Apply every migration newer than the DB's user_version.
+    Returns the resulting schema version.
+    """
+    current = get_schema_version(conn)
+    if current > SCHEMA_VERSION:
+        logger.warning(f"Translation DB schema v{current} is newer than this build (v{SCHEMA_VERSION})")
+        return current
+
+    for version, step in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.commit()
+        c = conn.cursor()
+        c.execute("BEGIN")
+        try:
+            step(c)
+            c.execute(f"PRAGMA user_version = {int(version)}")
+        except Exception:
+            conn.rollback()
+            logger.exception(f"Translation DB migration to v{version} failed")
+            raise
+        conn.commit()
+        logger.info(f"Translation DB migrated to schema v{version}")
+        current = version
+    return current
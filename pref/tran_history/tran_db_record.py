@@ -4,11 +4,9 @@ import hashlib
 import difflib
 import re
 import os
-import sqlite3
 from typing import List, Optional, Tuple
 from polib import POEntry, POFile, pofile
 from lg import logger
-from db_const import DB_PATH
 
 class DatabasePORecord:
     """
@@ -148,27 +146,22 @@ class DatabasePORecord:
 
     def _persist_versions(self, texts: List[str]) -> None:
         """
-        Wipe all tran_text rows for this unique_id and reinsert `texts`.
+        Bring the tran_text rows for this unique_id in line with `texts`,
+        writing only the inserted, removed and renumbered versions.
         """
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("DELETE FROM tran_text WHERE unique_id = ?", (self.unique_id,))
-        for idx, t in enumerate(texts, start=1):
-            c.execute(
-                "INSERT INTO tran_text(unique_id, version_id, tran_text) VALUES(?, ?, ?)",
-                (self.unique_id, idx, t)
-            )
-        conn.commit(); conn.close()
-        logger.info(f"Persisted {len(texts)} versions for record {self.unique_id}")
+        from .translation_db import db, sync_versions
+        with db.conn:
+            added, removed, moved = sync_versions(db.conn.cursor(), self.unique_id, texts)
+        logger.info(
+            f"Persisted versions for record {self.unique_id}: "
+            f"+{added} -{removed} ~{moved}"
+        )
 
-    def update_record_with_changes(self, fuzzy_threshold: Optional[float] = None) -> bool:
+    def normalize_versions(self, fuzzy_threshold: Optional[float] = None) -> List[str]:
         """
-        Apply in-memory changes to the DB:
-          1. Filter and dedupe versions (exact + optional fuzzy).
-          2. If record is new, insert source+versions; otherwise overwrite all.
-        Returns True if a new english_text row was created.
+        Filter and dedupe versions in memory (exact + optional fuzzy) and
+        renumber them from 1. Returns the kept texts.
         """
-        is_new = self.unique_id is None
         # 1) Filter
         filtered = self._filter_versions(self.msgstr_versions)
         # 2) Exact dedupe
@@ -178,6 +171,17 @@ class DatabasePORecord:
             unique = self._fuzzy_dedupe(unique, fuzzy_threshold)
         # 4) Renumber in-memory
         self.msgstr_versions = [(i, t) for i, t in enumerate(unique, start=1)]
+        return unique
+
+    def update_record_with_changes(self, fuzzy_threshold: Optional[float] = None) -> bool:
+        """
+        Apply in-memory changes to the DB:
+          1. Filter and dedupe versions (exact + optional fuzzy).
+          2. If record is new, insert source+versions; otherwise overwrite all.
+        Returns True if a new english_text row was created.
+        """
+        is_new = self.unique_id is None
+        unique = self.normalize_versions(fuzzy_threshold)
 
         if is_new:
             self.insert_to_db()
@@ -189,6 +193,15 @@ class DatabasePORecord:
 
         return is_new
 
+    def snapshot(self) -> "DatabasePORecord":
+        """Detached copy, safe to hand to another thread."""
+        return DatabasePORecord(
+            unique_id=self.unique_id,
+            msgid=self.msgid,
+            msgctxt=self.msgctxt,
+            msgstr_versions=list(self.msgstr_versions)
+        )
+
     # ─── In-Memory CRUD for msgstr_versions ────────────────────────────────
     def add_version_mem(self, translation: str) -> None:
         """
@@ -198,13 +211,13 @@ class DatabasePORecord:
         if not is_valid:
             return False
 
-        temp_dict = dict(self.msgstr_versions)
-        temp_txt_list = list(set(temp_dict.values()))
+        # keep existing order (and so existing version ids) stable
+        temp_txt_list = list(dict.fromkeys(txt for _, txt in self.msgstr_versions))
         is_new = (translation not in temp_txt_list)
         if is_new:
             temp_txt_list.append(translation)
 
-        new_msgstr = [(i, txt) for (i, txt) in enumerate(temp_txt_list)]
+        new_msgstr = [(i, txt) for (i, txt) in enumerate(temp_txt_list, start=1)]
         is_changed = (self.msgstr_versions != new_msgstr)
         if is_changed:
             self.msgstr_versions = new_msgstr
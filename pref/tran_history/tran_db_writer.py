@@ -0,0 +1,145 @@
+# pref/tran_history/tran_db_writer.py
+"""
+Write-behind queue for translation history saves.
+
+The GUI thread submits the versions it added to (or removed from) a
+record and returns immediately; a background thread collects them for a
+short window, merging the edits per (msgid, msgctxt), and writes each
+batch in one transaction through its own pooled connection. Only the
+edits are written, never a whole version list, so versions stored by
+someone else in the meantime survive.
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from PySide6.QtCore import QObject, Signal
+from pref.tran_history.tran_db_record import DatabasePORecord
+from pref.tran_history.translation_db import VersionChanges, db
+from lg import logger
+
+RecordKey = Tuple[str, Optional[str]]
+
+# Seconds the writer waits after the first queued save, so quick successive
+# edits (e.g. holding PageDown) coalesce into one transaction.
+COALESCE_WINDOW = 0.25
+
+
+def record_key(msgid: str, msgctxt: Optional[str]) -> RecordKey:
+    return (msgid, msgctxt or None)
+
+
+class TranslationWriter(QObject):
+    committed = Signal(list)   # List[DatabasePORecord] as written, unique_id filled in
+    failed    = Signal(str)
+
+    def __init__(self, db, coalesce_window: float = COALESCE_WINDOW, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.coalesce_window = coalesce_window
+        self._cond = threading.Condition()
+        self._pending: Dict[RecordKey, VersionChanges] = {}
+        self._in_flight: Dict[RecordKey, VersionChanges] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._flush_requested = False
+
+    # ─── GUI-thread API ──────────────────────────────────────────────────
+    def submit(self, record: DatabasePORecord, added: Sequence[str] = (),
+               removed: Sequence[str] = ()) -> None:
+        """
+        Queue versions added to and removed from `record` for saving
+        (non-blocking); the record as it is now is what lookup() returns.
+        """
+        key = record_key(record.msgid, record.msgctxt)
+        with self._cond:
+            # re-insert so the dict keeps the order of the latest edit
+            change = self._pending.pop(key, None) or VersionChanges(record)
+            change.record = record.snapshot()
+            for text in removed:
+                if text in change.added:
+                    change.added.remove(text)
+                if text not in change.removed:
+                    change.removed.append(text)
+            for text in added:
+                if text in change.removed:
+                    change.removed.remove(text)
+                if text not in change.added:
+                    change.added.append(text)
+            self._pending[key] = change
+            self._ensure_thread()
+            self._cond.notify()
+
+    def lookup(self, msgid: str, msgctxt: Optional[str]) -> Optional[DatabasePORecord]:
+        """
+        Latest not-yet-committed snapshot for this source, if any, so readers
+        don't see the stale DB state in between submit() and commit.
+        """
+        key = record_key(msgid, msgctxt)
+        with self._cond:
+            change = self._pending.get(key) or self._in_flight.get(key)
+            return change.record.snapshot() if change else None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is committed. False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            while self._pending or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self) -> None:
+        """Commit what is queued and end the writer thread (call on app exit)."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        with self._cond:
+            self._thread = None
+            self._stopping = False
+
+    # ─── Writer thread ───────────────────────────────────────────────────
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="TranslationWriter", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                # coalescing window; flush()/stop() cut it short
+                deadline = time.monotonic() + self.coalesce_window
+                while not (self._stopping or self._flush_requested):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                self._flush_requested = False
+                self._in_flight, self._pending = self._pending, {}
+                batch: List[VersionChanges] = list(self._in_flight.values())
+
+            try:
+                records = self.db.write_changes(batch)
+                logger.info(f"Translation writer committed {len(records)} records")
+                self.committed.emit(records)
+            except Exception as e:
+                logger.exception("Translation writer failed")
+                self.failed.emit(str(e))
+            finally:
+                with self._cond:
+                    self._in_flight = {}
+                    self._cond.notify_all()
+
+
+# Process-wide writer for the shared translation DB
+writer = TranslationWriter(db)
@@ -8,7 +8,7 @@ HL_COLOR = "#bec8b7"
 
 class SearchNavBar(QDockWidget):
     """
-    A custom navigation bar that displays a list of found record indices.
+    A custom navigation bar that lists the found records, one label each.
     Clicking on an item will emit a signal to jump to that record.
     It is dockable in the main window.
     """
@@ -23,7 +23,7 @@ class SearchNavBar(QDockWidget):
     def __init__(self, title="Search Results", parent=None):
         super().__init__(title, parent)
 
-        self.found_indices = []  # List of indices for found records
+        self.found_labels = []  # One label per found record, best match first
         self.total_rows = 0  # Total number of rows in the dataset
 
         # Create the layout for the widget
@@ -50,30 +50,28 @@ class SearchNavBar(QDockWidget):
         self.total_rows = total_rows
         # No need to redraw here as the list is updated on found records change
 
-    def setFoundRecords(self, found_indices: list[int]):
-        """Set the indices of found records and update the list."""
-        self.found_indices = found_indices
-        self.updateList()  # Update the list with found indices
+    def setFoundRecords(self, found_labels: list[str]):
+        """Set the labels of found records and update the list."""
+        self.found_labels = found_labels
+        self.updateList()  # Update the list with found records
 
     def updateList(self):
-        """Update the QListWidget with the found record indices."""
+        """Update the QListWidget with the found records."""
         self.list_widget.clear()  # Clear previous items
 
-        for idx in self.found_indices:
-            item = QListWidgetItem(f"Row {idx+1}")
+        for label in self.found_labels:
+            item = QListWidgetItem(label)
+            item.setToolTip(label)
             # Highlight the found record items with a different color
             item.setBackground(QColor(HL_COLOR))
             self.list_widget.addItem(item)
 
     def on_item_clicked(self, item: QListWidgetItem):
         """Called when a user clicks an item in the list, to jump to the record."""
-        item_txt = item.text()
-        int_value = int(item_txt.split()[1])-1 # subtract 1 to match the original
+        # Index of the record among the found ones
+        global_index = self.list_widget.row(item)
 
-        # Get the index from found_indices, ensure it maps correctly to the page
-        global_index = self.found_indices.index(int_value)
-
-        # Emit the signal with the correct global index
+        # Emit the signal with the found-record index
         self.record_selected.emit(global_index)  # Emit the signal with the selected index
         logger.info(f'selected {global_index}')
 
@@ -1,26 +1,222 @@
 # pref/translation_db.py
 import os
 import sqlite3
-from typing import List, Optional, Tuple
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from polib import POEntry, POFile, pofile
 from local_logging import benchmark
 from db_const import DB_PATH, DB_DIR
 from pref.tran_history.tran_db_record import DatabasePORecord
+from pref.tran_history.tran_db_migrations import migrate
+from pref.tran_history.tran_db_connection import ConnectionPool
 from lg import logger
 
+# Rows pulled per round-trip when streaming records out of the join below
+BULK_FETCH_SIZE = 5000
+
+# All records with their kept versions in one ordered pass. Blank translations and
+# translations identical to the msgid (case-insensitive, whitespace-stripped) are
+# dropped inside the LEFT JOIN, so records without any kept version still come back.
+RECORDS_SQL = """
+SELECT e.unique_id, e.en_text, e.context, t.version_id, t.tran_text
+  FROM english_text AS e
+  LEFT JOIN tran_text AS t
+    ON t.unique_id = e.unique_id
+   AND norm_text(t.tran_text) <> ''
+   AND norm_text(t.tran_text) <> norm_text(e.en_text)
+ {where}
+ ORDER BY e.unique_id, t.version_id
+"""
+
+# Appends a version after the record's highest one; a text it already has is skipped
+APPEND_VERSION_SQL = """
+INSERT OR IGNORE INTO tran_text(unique_id, version_id, tran_text)
+SELECT :unique_id, COALESCE(MAX(version_id), 0) + 1, :text
+  FROM tran_text
+ WHERE unique_id = :unique_id
+"""
+
+# ─── Search ──────────────────────────────────────────────────────────────────
+SEARCH_SCOPES = ("all", "msgid", "msgstr")
+
+# trigram FTS can only match queries of at least this many characters
+FTS_MIN_QUERY_LEN = 3
+
+# Per-scope hit queries: (unique_id, field, version_id, src_rowid, rank).
+# Snippets are not computed here but only for the returned page.
+FTS_HITS_SQL: Dict[str, str] = {
+    "msgid": """
+        SELECT english_fts.rowid AS unique_id, 'msgid' AS field, NULL AS version_id,
+               english_fts.rowid AS src_rowid, bm25(english_fts) AS rank
+          FROM english_fts
+         WHERE english_fts MATCH :query""",
+    "msgstr": """
+        SELECT t.unique_id AS unique_id, 'msgstr' AS field, t.version_id AS version_id,
+               t.id AS src_rowid, bm25(tran_fts) AS rank
+          FROM tran_fts JOIN tran_text AS t ON t.id = tran_fts.rowid
+         WHERE tran_fts MATCH :query""",
+}
+
+# Fallback without FTS5 or for too-short queries: unranked substring scan
+LIKE_HITS_SQL: Dict[str, str] = {
+    "msgid": """
+        SELECT e.unique_id AS unique_id, 'msgid' AS field, NULL AS version_id,
+               e.unique_id AS src_rowid, 0.0 AS rank
+          FROM english_text AS e
+         WHERE e.en_text LIKE :like ESCAPE '\\'""",
+    "msgstr": """
+        SELECT t.unique_id AS unique_id, 'msgstr' AS field, t.version_id AS version_id,
+               t.id AS src_rowid, 0.0 AS rank
+          FROM tran_text AS t
+         WHERE t.tran_text LIKE :like ESCAPE '\\'""",
+}
+
+# Best hit per record, ranked; {hits} is a UNION ALL of the scope queries
+SEARCH_SQL = """
+SELECT h.unique_id, e.en_text, e.context, h.field, h.version_id, h.src_rowid, h.rank
+  FROM (SELECT hits.*, ROW_NUMBER() OVER (PARTITION BY hits.unique_id ORDER BY hits.rank) AS rn
+          FROM ({hits}) AS hits) AS h
+  JOIN english_text AS e ON e.unique_id = h.unique_id
+ WHERE h.rn = 1
+ ORDER BY h.rank, h.unique_id
+ LIMIT :limit OFFSET :offset
+"""
+
+# Snippets for a page of hits: field -> (fts query, plain-text query)
+SNIPPET_SQL: Dict[str, Tuple[str, str]] = {
+    "msgid": (
+        "SELECT rowid, snippet(english_fts, 0, :mark_open, :mark_close, '…', :snippet_tokens)"
+        " FROM english_fts WHERE english_fts MATCH :query AND rowid IN ({ids})",
+        "SELECT unique_id, en_text FROM english_text WHERE unique_id IN ({ids})",
+    ),
+    "msgstr": (
+        "SELECT rowid, snippet(tran_fts, 0, :mark_open, :mark_close, '…', :snippet_tokens)"
+        " FROM tran_fts WHERE tran_fts MATCH :query AND rowid IN ({ids})",
+        "SELECT id, tran_text FROM tran_text WHERE id IN ({ids})",
+    ),
+}
+
+
+@dataclass
+class TranSearchHit:
+    """One record matching TranslationDB.search(); `snippet` carries the marks."""
+    unique_id: int
+    msgid: str
+    msgctxt: Optional[str]
+    field: str                  # "msgid" or "msgstr"
+    version_id: Optional[int]   # matching version for msgstr hits
+    snippet: str
+    rank: float
+
+
+@dataclass
+class VersionChanges:
+    """Versions added to and removed from one record, by text (see TranslationDB.write_changes)."""
+    record: DatabasePORecord
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+def _norm_text(text: Optional[str]) -> Optional[str]:
+    """SQL helper: Python's strip().lower(), so filtering matches the in-memory rules."""
+    return text.strip().lower() if text is not None else None
+
+
+def _register_functions(conn: sqlite3.Connection) -> None:
+    conn.create_function("norm_text", 1, _norm_text, deterministic=True)
+
+
+def sync_versions(c: sqlite3.Cursor, unique_id: int, texts: List[str]) -> Tuple[int, int, int]:
+    """
+    Make the tran_text rows of `unique_id` equal `texts`, numbered from 1, by
+    touching only what differs from the stored state:
+    - rows whose text is gone are deleted,
+    - kept rows whose position moved get a new version_id (row and
+      changed_at survive),
+    - texts not stored yet are inserted.
+    Runs inside the caller's transaction. Returns (inserted, removed, renumbered).
+    """
+    wanted = {t: ver for ver, t in enumerate(dict.fromkeys(texts), start=1)}
+    c.execute("SELECT id, version_id, tran_text FROM tran_text WHERE unique_id = ?", (unique_id,))
+    stored = {txt: (row_id, ver) for row_id, ver, txt in c.fetchall()}
+
+    removed = [(row_id,) for txt, (row_id, _) in stored.items() if txt not in wanted]
+    moves = [
+        (ver, wanted[txt], row_id) for txt, (row_id, ver) in stored.items()
+        if txt in wanted and wanted[txt] != ver
+    ]
+    added = [(unique_id, ver, txt) for txt, ver in wanted.items() if txt not in stored]
+
+    if removed:
+        c.executemany("DELETE FROM tran_text WHERE id = ?", removed)
+    if moves:
+        # UNIQUE(unique_id, version_id) must hold after every single UPDATE.
+        # Shifts in one direction (the usual case after a delete) are applied
+        # in an order where each target slot is already free; anything else
+        # is parked on negative versions first.
+        if all(new < old for old, new, _ in moves):
+            moves.sort(key=lambda m: m[1])
+        elif all(new > old for old, new, _ in moves):
+            moves.sort(key=lambda m: m[1], reverse=True)
+        else:
+            c.executemany("UPDATE tran_text SET version_id = -version_id WHERE id = ?",
+                          [(row_id,) for _, _, row_id in moves])
+        c.executemany("UPDATE tran_text SET version_id = ? WHERE id = ?",
+                      [(new, row_id) for _, new, row_id in moves])
+    if added:
+        c.executemany(
+            "INSERT INTO tran_text(unique_id, version_id, tran_text) VALUES(?, ?, ?)",
+            added
+        )
+    return len(added), len(removed), len(moves)
+
+
 class TranslationDB:
     """
     Encapsulates all SQLite logic for translation history storage.
-    Queries always fetch all matching rows before indexing, and handle `context` = None
-    by generating separate queries for NULL vs. non-NULL context.
+    Sources are keyed on (en_text, IFNULL(context, '')): a missing and an empty
+    msgctxt are the same key, and lookups use that expression so they hit the
+    english_text_key index (see tran_db_migrations).
     """
-    def __init__(self):
-        os.makedirs(DB_DIR, exist_ok=True)
-        self.conn = sqlite3.connect(DB_PATH)
-        self._ensure_schema()
+    def __init__(self, db_path: str = DB_PATH):
+        # No disk I/O here: the DB directory, file and schema are created by
+        # open(), which runs on the first query.
+        self.db_path = db_path
+        self.pool = ConnectionPool(db_path, on_open=_register_functions)
+        self._open_lock = threading.Lock()
+        self._is_open = False
+        # count_entries() cache; the generation guards against a count read
+        # before a concurrent write being stored after its invalidation
+        self._count_lock = threading.Lock()
+        self._entry_count: Optional[int] = None
+        self._count_generation = 0
 
-    def _ensure_schema(self):
-        c = self.conn.cursor()
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The calling thread's pooled connection (opens the DB on first use)."""
+        if not self._is_open:
+            self.open()
+        return self.pool.connection()
+
+    def open(self):
+        """Create the DB file if needed and bring its schema up to date. Idempotent."""
+        with self._open_lock:
+            if self._is_open:
+                return
+            os.makedirs(os.path.dirname(self.db_path) or DB_DIR, exist_ok=True)
+            self._ensure_schema(self.pool.connection())
+            self._is_open = True
+            logger.info(f"Translation DB opened: {self.db_path}")
+
+    def close(self):
+        """Close the connections of every thread; the next query reopens."""
+        with self._open_lock:
+            self.pool.close_all()
+            self._is_open = False
+
+    def _ensure_schema(self, conn: sqlite3.Connection):
+        c = conn.cursor()
         c.execute("""
         CREATE TABLE IF NOT EXISTS english_text (
           unique_id   INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -38,7 +234,8 @@ class TranslationDB:
           UNIQUE(unique_id, version_id),
           UNIQUE(unique_id, tran_text)
         )""")
-        self.conn.commit()
+        conn.commit()
+        migrate(conn)
 
     def clear_database(self):
         """
@@ -49,24 +246,18 @@ class TranslationDB:
         c.execute("DELETE FROM tran_text")
         c.execute("DELETE FROM english_text")
         self.conn.commit()
+        self._invalidate_count()
         c.execute("PRAGMA foreign_keys = ON")
         logger.info("Database has been cleared.")
 
     # --- Internal Helpers ---
     def _fetch_english(self, msgid: str, context: Optional[str]) -> List[Tuple[int, str, Optional[str]]]:
         c = self.conn.cursor()
-        if context is None:
-            c.execute(
-                "SELECT unique_id, en_text, context FROM english_text"
-                " WHERE en_text = ? AND context IS NULL",
-                (msgid,)
-            )
-        else:
-            c.execute(
-                "SELECT unique_id, en_text, context FROM english_text"
-                " WHERE en_text = ? AND context = ?",
-                (msgid, context)
-            )
+        c.execute(
+            "SELECT unique_id, en_text, context FROM english_text"
+            " WHERE en_text = ? AND IFNULL(context, '') = ?",
+            (msgid, context or "")
+        )
         return c.fetchall()
 
     def _fetch_translations(self, unique_id: int) -> List[Tuple[int, str]]:
@@ -78,23 +269,82 @@ class TranslationDB:
         )
         return c.fetchall()
 
+    def _iter_records(self, where: str = "", params: tuple = ()) -> Iterator[DatabasePORecord]:
+        """
+        Stream DatabasePORecord objects out of RECORDS_SQL, grouping the
+        joined version rows by unique_id in a single pass over the cursor.
+        """
+        c = self.conn.cursor()
+        c.execute(RECORDS_SQL.format(where=where), params)
+        record: Optional[DatabasePORecord] = None
+        while True:
+            rows = c.fetchmany(BULK_FETCH_SIZE)
+            if not rows:
+                break
+            for uid, en, ctx, ver, txt in rows:
+                if record is None or record.unique_id != uid:
+                    if record is not None:
+                        yield record
+                    record = DatabasePORecord(unique_id=uid, msgid=en, msgctxt=ctx)
+                if ver is not None:
+                    record.msgstr_versions.append((ver, txt))
+        if record is not None:
+            yield record
+
+    def _load_record(self, unique_id: int) -> Optional[DatabasePORecord]:
+        return next(self._iter_records("WHERE e.unique_id = ?", (unique_id,)), None)
+
     # --- Public API ---
     def list_entries(self) -> List[DatabasePORecord]:
         """List all records."""
+        return list(self._iter_records())
+
+    # --- Paging (keyset on unique_id) ---
+    def count_entries(self) -> int:
+        """Number of records; cached until a write adds or removes one."""
+        with self._count_lock:
+            if self._entry_count is not None:
+                return self._entry_count
+            generation = self._count_generation
         c = self.conn.cursor()
-        c.execute("SELECT unique_id, en_text, context FROM english_text ORDER BY unique_id")
-        rows = c.fetchall()
-        records: List[DatabasePORecord] = []
-        for uid, en, ctx in rows:
-            record = DatabasePORecord(unique_id=uid, msgid=en, msgctxt=ctx)
-            # filter out empty or identical-to-msgid translations
-            mid_lower = en.strip().lower()
-            record.msgstr_versions = [
-                (ver, txt) for ver, txt in self._fetch_translations(uid)
-                if txt.strip() and txt.strip().lower() != mid_lower
-            ]
-            records.append(record)
-        return records
+        c.execute("SELECT COUNT(*) FROM english_text")
+        count = c.fetchone()[0]
+        with self._count_lock:
+            if generation == self._count_generation:
+                self._entry_count = count
+        return count
+
+    def _invalidate_count(self):
+        """Call after committing a write that adds or removes english_text rows."""
+        with self._count_lock:
+            self._entry_count = None
+            self._count_generation += 1
+
+    def entry_ids(self, after_id: Optional[int] = None, limit: int = -1) -> List[int]:
+        """The next `limit` unique_ids after `after_id` (all if limit < 0), ascending."""
+        c = self.conn.cursor()
+        c.execute(
+            "SELECT unique_id FROM english_text WHERE unique_id > ? ORDER BY unique_id LIMIT ?",
+            (-1 if after_id is None else after_id, limit)
+        )
+        return [uid for uid, in c.fetchall()]
+
+    def records_between(self, first_id: int, last_id: int) -> List[DatabasePORecord]:
+        """Records with first_id <= unique_id <= last_id, versions included."""
+        return list(self._iter_records("WHERE e.unique_id BETWEEN ? AND ?", (first_id, last_id)))
+
+    def entry_position(self, unique_id: int) -> Optional[int]:
+        """
+        0-based position of a record in unique_id order, or None if there's
+        no such record; counts the primary keys below it, without a window
+        over the whole table.
+        """
+        c = self.conn.cursor()
+        c.execute("SELECT 1 FROM english_text WHERE unique_id = ?", (unique_id,))
+        if c.fetchone() is None:
+            return None
+        c.execute("SELECT COUNT(*) FROM english_text WHERE unique_id < ?", (unique_id,))
+        return c.fetchone()[0]
 
     def get_entry(self, msgid: str, context: Optional[str] = None) -> DatabasePORecord:
         """Retrieve or raise if missing."""
@@ -102,14 +352,7 @@ class TranslationDB:
         if not rows:
             raise ValueError(f"No entry for msgid={msgid!r}, context={context!r}")
         unique_id, en_text, ctx = rows[0]
-        record = DatabasePORecord(unique_id=unique_id, msgid=en_text, msgctxt=ctx)
-        # filter translations
-        mid_lower = en_text.strip().lower()
-        record.msgstr_versions = [
-            (ver, txt) for ver, txt in self._fetch_translations(unique_id)
-            if txt.strip() and txt.strip().lower() != mid_lower
-        ]
-        return record
+        return self._load_record(unique_id)
 
     def add_entry(self, msgid: str, context: Optional[str] = None, initial: Optional[str] = None) -> DatabasePORecord:
         """Insert new english_text and optional first translation."""
@@ -119,6 +362,7 @@ class TranslationDB:
             (msgid, context)
         )
         self.conn.commit()
+        self._invalidate_count()
         uid = c.lastrowid
         if initial is not None:
             self.add_version(uid, initial)
@@ -162,27 +406,14 @@ class TranslationDB:
         """
         Load a record by its unique_id (skipping the msgid/context lookup).
         """
-        c = self.conn.cursor()
-        c.execute(
-            "SELECT en_text, context FROM english_text WHERE unique_id = ?",
-            (unique_id,)
-        )
-        msgid, ctx = c.fetchone()
-        rec = DatabasePORecord(unique_id=unique_id, msgid=msgid, msgctxt=ctx)
-        # copy & filter translations:
-        mid = msgid.strip().lower()
-        rec.msgstr_versions = [
-            (ver, txt)
-            for ver, txt in self._fetch_translations(unique_id)
-            if txt.strip() and txt.strip().lower() != mid
-        ]
-        return rec
+        return self._load_record(unique_id)
 
     def delete_entry(self, unique_id: int):
         c = self.conn.cursor()
         c.execute("DELETE FROM tran_text WHERE unique_id = ?", (unique_id,))
         c.execute("DELETE FROM english_text WHERE unique_id = ?", (unique_id,))
         self.conn.commit()
+        self._invalidate_count()
 
     def delete_version(self, unique_id: int, version_id: int):
         c = self.conn.cursor()
@@ -208,18 +439,9 @@ class TranslationDB:
             (entry.msgid, entry.msgctxt)
         )
         self.conn.commit()
+        self._invalidate_count()
         # 2) Fetch its unique_id
-        if entry.msgctxt is None:
-            c.execute(
-                "SELECT unique_id FROM english_text WHERE en_text = ? AND context IS NULL",
-                (entry.msgid,)
-            )
-        else:
-            c.execute(
-                "SELECT unique_id FROM english_text WHERE en_text = ? AND context = ?",
-                (entry.msgid, entry.msgctxt)
-            )
-        unique_id = c.fetchone()[0]
+        unique_id = self._fetch_english(entry.msgid, entry.msgctxt)[0][0]
         # 3) Compute next version
         c.execute(
             "SELECT COALESCE(MAX(version_id), 0) FROM tran_text WHERE unique_id = ?",
@@ -277,39 +499,209 @@ class TranslationDB:
 
         return record
 
+    def write_changes(self, changes: List[VersionChanges]) -> List[DatabasePORecord]:
+        """
+        Apply the version edits of many records in one transaction: removed
+        texts are deleted, added ones appended unless already stored. Only
+        the edited versions are written, so versions stored meanwhile (e.g.
+        by an import) are kept. Records without a unique_id get their
+        english_text row created (or found) first; their unique_id is filled
+        in on the passed objects. Returns the records.
+        """
+        c = self.conn.cursor()
+        with self.conn:
+            for change in changes:
+                rec = change.record
+                if rec.unique_id is None:
+                    c.execute(
+                        "INSERT OR IGNORE INTO english_text(en_text, context) VALUES(?, ?)",
+                        (rec.msgid, rec.msgctxt)
+                    )
+                    rec.unique_id = self._fetch_english(rec.msgid, rec.msgctxt)[0][0]
+                c.executemany(
+                    "DELETE FROM tran_text WHERE unique_id = ? AND tran_text = ?",
+                    [(rec.unique_id, text) for text in change.removed]
+                )
+                c.executemany(
+                    APPEND_VERSION_SQL,
+                    [{"unique_id": rec.unique_id, "text": text} for text in change.added]
+                )
+        self._invalidate_count()
+        return [change.record for change in changes]
+
+    def import_po_entries(self, entries: Iterable[POEntry]) -> int:
+        """
+        Batch-import POEntries in one transaction, set-based:
+        1) Stage (msgid, msgctxt, msgstr) in a temp table (last duplicate wins).
+        2) Resolve unique_ids for the staged sources only, with one join.
+        3) Insert english_text rows for the sources still unresolved and resolve
+           them through a rowid range scan over the freshly added rows.
+        4) Drop blank msgstr and translations the record already holds.
+        5) Number the survivors from one grouped MAX(version_id) query and insert.
+        Returns the number of new translation versions written.
+        """
+        batch = {}
+        for e in entries:
+            batch[(e.msgid, e.msgctxt or None)] = e.msgstr or ""
+        if not batch:
+            return 0
+
+        c = self.conn.cursor()
+        with self.conn:
+            c.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS import_batch("
+                " en_text TEXT NOT NULL, context TEXT, tran_text TEXT NOT NULL)"
+            )
+            c.execute("CREATE INDEX IF NOT EXISTS temp.import_batch_key ON import_batch(en_text, context)")
+            c.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS import_ids("
+                " batch_id INTEGER PRIMARY KEY, unique_id INTEGER NOT NULL)"
+            )
+            c.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS import_tran("
+                " unique_id INTEGER PRIMARY KEY, tran_text TEXT NOT NULL)"
+            )
+            for table in ("import_batch", "import_ids", "import_tran"):
+                c.execute(f"DELETE FROM temp.{table}")
+            c.executemany(
+                "INSERT INTO temp.import_batch(en_text, context, tran_text) VALUES(?,?,?)",
+                ((msgid, ctx, txt) for (msgid, ctx), txt in batch.items())
+            )
+
+            # 2) map the sources this batch touches (lowest id wins on duplicates)
+            resolve_sql = """
+                INSERT INTO temp.import_ids(batch_id, unique_id)
+                SELECT b.rowid, MIN(e.unique_id)
+                  FROM english_text AS e
+                  JOIN temp.import_batch AS b
+                    ON b.en_text = e.en_text AND IFNULL(b.context, '') = IFNULL(e.context, '')
+                 WHERE e.unique_id > ?
+                   AND b.rowid NOT IN (SELECT batch_id FROM temp.import_ids)
+                 GROUP BY b.rowid
+            """
+            c.execute(resolve_sql, (0,))
+
+            # 3) add unknown sources, then resolve only the rows just inserted
+            c.execute("SELECT COALESCE(MAX(unique_id), 0) FROM english_text")
+            last_uid = c.fetchone()[0]
+            c.execute("""
+                INSERT INTO english_text(en_text, context)
+                SELECT b.en_text, b.context FROM temp.import_batch AS b
+                 WHERE b.rowid NOT IN (SELECT batch_id FROM temp.import_ids)
+                 ORDER BY b.rowid
+            """)
+            if c.rowcount:
+                c.execute(resolve_sql, (last_uid,))
+
+            # 4) candidate versions, minus blank / already-known translations
+            c.execute("""
+                INSERT INTO temp.import_tran(unique_id, tran_text)
+                SELECT i.unique_id, b.tran_text
+                  FROM temp.import_ids AS i
+                  JOIN temp.import_batch AS b ON b.rowid = i.batch_id
+                 WHERE norm_text(b.tran_text) <> ''
+                   AND NOT EXISTS (SELECT 1 FROM tran_text AS t
+                                    WHERE t.unique_id = i.unique_id
+                                      AND t.tran_text = b.tran_text)
+            """)
+
+            # 5) next version per record from one grouped query
+            c.execute("""
+                INSERT INTO tran_text(unique_id, version_id, tran_text)
+                SELECT i.unique_id, COALESCE(m.last_version, 0) + 1, i.tran_text
+                  FROM temp.import_tran AS i
+                  LEFT JOIN (SELECT t.unique_id, MAX(t.version_id) AS last_version
+                               FROM tran_text AS t
+                              WHERE t.unique_id IN (SELECT unique_id FROM temp.import_tran)
+                              GROUP BY t.unique_id) AS m
+                    ON m.unique_id = i.unique_id
+            """)
+            inserted = c.rowcount
+        self._invalidate_count()
+        logger.info(f"Imported {len(batch)} entries, {inserted} new translation versions")
+        return inserted
+
     @benchmark
-    def import_po_fast(self, path: str):
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("PRAGMA journal_mode = MEMORY;")
-        c.execute("PRAGMA synchronous = OFF;")
-        po_list = pofile(path)
+    def import_po_fast(self, path: str) -> int:
+        return self.import_po_entries(pofile(path))
 
-        # bulk english_text
-        lives = [(e.msgid, e.msgctxt) for e in po_list]
-        conn.execute("BEGIN;")
-        c.executemany(
-            "INSERT OR IGNORE INTO english_text(en_text,context) VALUES(?,?);",
-            lives
-        )
+    # --- Search ---
+    def _has_fts(self) -> bool:
+        c = self.conn.cursor()
+        c.execute("SELECT 1 FROM sqlite_master WHERE name = 'english_fts'")
+        return c.fetchone() is not None
 
-        # fetch map
-        c.execute("SELECT unique_id,en_text,context FROM english_text;")
-        id_map = {(en, ct): uid for uid, en, ct in c.fetchall()}
+    def _search_hits_sql(self, text: str, scope: str) -> Tuple[str, dict]:
+        if scope not in SEARCH_SCOPES:
+            raise ValueError(f"Unknown search scope {scope!r}; expected one of {SEARCH_SCOPES}")
+        fields = ("msgid", "msgstr") if scope == "all" else (scope,)
+        if len(text) >= FTS_MIN_QUERY_LEN and self._has_fts():
+            # a quoted phrase: trigram tokens turn it into a substring match
+            params = {"query": '"' + text.replace('"', '""') + '"'}
+            parts = [FTS_HITS_SQL[f] for f in fields]
+        else:
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params = {"like": f"%{escaped}%"}
+            parts = [LIKE_HITS_SQL[f] for f in fields]
+        return "\n UNION ALL \n".join(parts), params
 
-        # build translations
-        trans = []
-        for e in po_list:
-            uid = id_map[(e.msgid, e.msgctxt)]
-            c.execute("SELECT MAX(version_id) FROM tran_text WHERE unique_id=?;", (uid,))
-            last = c.fetchone()[0] or 0
-            trans.append((uid, last + 1, e.msgstr))
+    def _snippets(self, field: str, rowids: List[int], text: str, params: dict,
+                  mark_open: str, mark_close: str) -> Dict[int, str]:
+        ids = ",".join(str(int(r)) for r in rowids)
+        fts_sql, plain_sql = SNIPPET_SQL[field]
+        c = self.conn.cursor()
+        if "query" in params:
+            c.execute(fts_sql.format(ids=ids), params)
+            return dict(c.fetchall())
+        # LIKE fallback: mark the first case-insensitive occurrence ourselves
+        c.execute(plain_sql.format(ids=ids))
+        needle = text.lower()
+        out = {}
+        for rowid, txt in c.fetchall():
+            pos = txt.lower().find(needle)
+            if pos >= 0:
+                end = pos + len(needle)
+                txt = f"{txt[:pos]}{mark_open}{txt[pos:end]}{mark_close}{txt[end:]}"
+            out[rowid] = txt
+        return out
 
-        c.executemany(
-            "INSERT INTO tran_text(unique_id,version_id,tran_text) VALUES(?,?,?);",
-            trans
-        )
-        conn.commit()
+    def search(self, text: str, scope: str = "all", limit: int = 50, offset: int = 0,
+               mark_open: str = "<b>", mark_close: str = "</b>",
+               snippet_tokens: int = 32) -> List[TranSearchHit]:
+        """
+        Ranked substring search over msgids ("msgid"), translation versions
+        ("msgstr") or both ("all"), one hit per record. Matches in `snippet`
+        are wrapped in mark_open/mark_close. Page with limit/offset.
+        """
+        text = text.strip()
+        if not text:
+            return []
+        hits_sql, params = self._search_hits_sql(text, scope)
+        c = self.conn.cursor()
+        c.execute(SEARCH_SQL.format(hits=hits_sql), dict(params, limit=limit, offset=offset))
+        rows = c.fetchall()
+
+        # snippets only for this page, one query per field
+        params.update(mark_open=mark_open, mark_close=mark_close, snippet_tokens=snippet_tokens)
+        snippets = {
+            field: self._snippets(field, [r[5] for r in rows if r[3] == field],
+                                  text, params, mark_open, mark_close)
+            for field in {r[3] for r in rows}
+        }
+        return [
+            TranSearchHit(uid, msgid, ctx, field, ver, snippets[field].get(src_rowid, ""), rank)
+            for uid, msgid, ctx, field, ver, src_rowid, rank in rows
+        ]
+
+    def count_search(self, text: str, scope: str = "all") -> int:
+        """Number of records search() can return for `text`."""
+        text = text.strip()
+        if not text:
+            return 0
+        hits_sql, params = self._search_hits_sql(text, scope)
+        c = self.conn.cursor()
+        c.execute(f"SELECT COUNT(DISTINCT unique_id) FROM ({hits_sql})", params)
+        return c.fetchone()[0]
 
     def export_po(self, out_path: str):
         po = POFile()
@@ -321,4 +713,5 @@ class TranslationDB:
             po.append(POEntry(msgid=rec.msgid, msgstr=txt))
         po.save(out_path)
 
+# Process-wide instance; opens lazily on first query, closed on app exit.
 db = TranslationDB()
@@ -8,7 +8,7 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QEvent, QPoint, QSettings, QModelIndex
 from PySide6.QtGui import QKeySequence, QShortcut
 
-from .translation_db import TranslationDB
+from .translation_db import TranSearchHit, db
 from .tran_search_nav_bar import SearchNavBar
 from pref.tran_history.versions.tran_entry_edit_dlg import _EntryDialog
 from subcmp.line_rep_imp import ReplacementLineEdit
@@ -18,6 +18,10 @@ from pref.tran_history.db_msgtr_combo import ComboBoxDelegate
 from pref.tran_history.tran_db_record import DatabasePORecord
 # How many entries to show per page
 ENTRIES_PER_PAGE = 22
+# Search hits fetched at a time, best first; the next page is fetched on reaching the end
+SEARCH_PAGE_SIZE = 50
+# Marks around the match in the snippets listed by the navigation bar
+SNIPPET_MARKS = ("«", "»")
 
 DEFAULT_EXPORT_PATH = os.path.join(os.getcwd(), "translation_db.po")
 
@@ -78,13 +82,13 @@ class TranslationHistoryDialog(QWidget):
         self.btn_search_next: QPushButton = None
         self.btn_search_prev: QPushButton = None
 
-        self.db = TranslationDB()
-        self.db_record_list: List[DatabasePORecord] = self.db.list_entries()
+        self.db = db
         self.current_unique_id: Optional[int] = None
         self._drag_start_pos = QPoint()
 
         # ─── paging state ────────────────────────────────────────────────
-        self.complete_history_entry_list: List[Tuple[int, str]] = []
+        # the table fetches rows from the DB as it scrolls (HistoryTableModel);
+        # a "page" is ENTRIES_PER_PAGE rows, used for the pager buttons only
         self._highlight_indices_on_page: List[int] = []
         self.current_page_number = 0
         self.total_number_of_pages = 1
@@ -93,8 +97,10 @@ class TranslationHistoryDialog(QWidget):
         # ─── build UI ───────────────────────────────────────────────────
         main_layout = QVBoxLayout(self)
 
-        # search state
-        self._search_indices: List[int] = []
+        # search state: the fetched pages of ranked hits, and the one shown
+        self._search_text = ""
+        self._search_hits: List[TranSearchHit] = []
+        self._search_total = 0
         self._current_search = -1
 
         # ─── SEARCH ROW BUILT FROM SPEC ──────────────────────────
@@ -146,7 +152,7 @@ class TranslationHistoryDialog(QWidget):
         tbl_row = QHBoxLayout()
 
         # Create the model with data and columns
-        self.history_model = HistoryTableModel(self.db_record_list, TABLE_COLUMNS)
+        self.history_model = HistoryTableModel(self.db, TABLE_COLUMNS)
 
         # Create the table view and set the model
         self.history_table = QTableView()
@@ -154,6 +160,7 @@ class TranslationHistoryDialog(QWidget):
 
         self.history_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.history_table.setDragEnabled(True)
+        self.history_table.verticalScrollBar().valueChanged.connect(self._on_table_scrolled)
         tbl_row.addWidget(self.history_table)
 
         # ── Create a QSplitter to allow resizing of the navbar and history table ──
@@ -235,25 +242,30 @@ class TranslationHistoryDialog(QWidget):
 
     def _go_to_page(self, page_index: int):
         ni = max(0, min(self.total_number_of_pages-1, page_index))
-        if ni != self.current_page_number:
-            self.current_page_number = ni
-            self._refresh_history_entries()
+        row = ni * ENTRIES_PER_PAGE
+        if self.history_model.fetchUpTo(row):
+            self.history_table.scrollTo(self.history_model.index(row, 0), QTableView.PositionAtTop)
+        self.current_page_number = ni
+        self._update_page_label()
+
+    def _on_table_scrolled(self, _value):
+        top_row = max(0, self.history_table.rowAt(0))
+        self.current_page_number = top_row // ENTRIES_PER_PAGE
+        self._update_page_label()
+
+    def _update_page_label(self):
+        self.page_info_label.setText(f"Page {self.current_page_number + 1} of {self.total_number_of_pages}")
 
     def _refresh_history_entries(self):
         self._highlight_indices_on_page = []
 
-        if not self.complete_history_entry_list:
-            self.complete_history_entry_list = self.db.list_entries()
-
-        total = len(self.complete_history_entry_list)
+        total = self.db.count_entries()
         self.total_number_of_pages = max(1, (total + ENTRIES_PER_PAGE - 1) // ENTRIES_PER_PAGE)
+        self.current_page_number = min(self.current_page_number, self.total_number_of_pages - 1)
         self.navbar.setTotal(total)
 
-        start = self.current_page_number * ENTRIES_PER_PAGE
-        page = self.complete_history_entry_list[start:start + ENTRIES_PER_PAGE]
-
-        # Pass the list of DatabasePORecord objects to the model
-        self.history_model.refreshData(page)
+        # Rows are fetched lazily by the model; just bring the current page into view
+        self._go_to_page(self.current_page_number)
 
         # Resize columns for better layout
         self.history_table.setColumnWidth(0, 80)  # ID column fixed width (8-9 digits wide)
@@ -266,11 +278,10 @@ class TranslationHistoryDialog(QWidget):
         self.history_table.setEditTriggers(QTableView.AllEditTriggers)
 
         # Update labels & highlights
-        self.results_label.setText(f"{len(self._search_indices)} found")
-        self.navbar.setFoundRecords(self._search_indices)
-        self.page_info_label.setText(f"Page {self.current_page_number + 1} of {self.total_number_of_pages}")
+        self._update_search_results()
+        self._update_page_label()
         if self._highlight_indices_on_page and self._current_search != -1:
-            self._highlight_current_search(self._search_indices[self._current_search])
+            self._highlight_current_search()
 
     def _on_import(self, path=None):
         must_get_path = (path == None)
@@ -280,7 +291,7 @@ class TranslationHistoryDialog(QWidget):
         is_valid_path = path and os.path.exists(path)
         if is_valid_path:
             self.db.import_po_fast(path)
-            self.complete_history_entry_list.clear()
+            self.history_model.reload()
             self.current_page_number = 0
             self._refresh_history_entries()
 
@@ -301,52 +312,64 @@ class TranslationHistoryDialog(QWidget):
     # ─── SEARCH METHODS ───────────────────────────────────────────────────────
     def _on_search_commence(self):
         text = self.search_box.text().strip().lower()
-        self._search_indices.clear()
+        self._search_hits = []
+        self._search_total = 0
         self._current_search = -1
+        self._search_text = text
         if not text:
             self._clear_search()
             return
 
-        # scan all entries
-        if not self.complete_history_entry_list:
-            self.complete_history_entry_list = self.db.list_entries()
-
-        for idx, (uid, msgid) in enumerate(self.complete_history_entry_list):
-            if text in msgid.lower():
-                self._search_indices.append(idx)
-            else:
-                latest = self.db.get_latest_version(uid)
-                mstr = (self.db.get_msgstr(uid, latest) or "").lower()
-                if text in mstr:
-                    self._search_indices.append(idx)
+        # FTS-backed, ranked search: only the first page of hits is fetched
+        self._search_total = self.db.count_search(text)
+        self._fetch_search_page()
+        self._update_search_results()
 
-        is_found = bool(self._search_indices)
+        is_found = bool(self._search_hits)
         if is_found:
             self._current_search = 0
             self._go_to_search_result()
         self.btn_search_next.setEnabled(is_found)
         self.btn_search_prev.setEnabled(is_found)
 
+    def _fetch_search_page(self) -> bool:
+        """Append the next page of hits; False if every hit is fetched already."""
+        if len(self._search_hits) >= self._search_total:
+            return False
+        mark_open, mark_close = SNIPPET_MARKS
+        hits = self.db.search(self._search_text, limit=SEARCH_PAGE_SIZE, offset=len(self._search_hits),
+                              mark_open=mark_open, mark_close=mark_close)
+        self._search_hits.extend(hits)
+        return bool(hits)
+
+    def _update_search_results(self):
+        self.results_label.setText(f"{self._search_total} found")
+        self.navbar.setFoundRecords([
+            f"{hit.unique_id}: {' '.join(hit.snippet.split())}" for hit in self._search_hits
+        ])
+
     def on_search_text_changed(self):
         """Handle text change in the search box."""
         # Enable the "Find" button when there's text in the search box, disable otherwise
         flag = bool(self.search_box.text().strip())
         self.btn_find.setEnabled(flag)
 
-    def on_record_selected(self, global_row_index):
+    def on_record_selected(self, hit_index):
         """Handle the record selection and jump to the corresponding record."""
-        # Calculate the page number from the global row index
-        self._current_search = global_row_index
+        # The navbar lists the fetched hits in order
+        self._current_search = hit_index
         self._go_to_search_result()
 
     def _go_to_search_result(self):
         # Make sure that _current_search is within bounds
-        is_valid = (self._current_search != -1) or self._search_indices
+        is_valid = 0 <= self._current_search < len(self._search_hits)
         if not is_valid:
             return  # No search result selected or available
 
-        # Get the global index from _search_indices
-        global_row_index = self._search_indices[self._current_search]
+        # Table row of the hit's record (gone if deleted since the search)
+        global_row_index = self.db.entry_position(self._search_hits[self._current_search].unique_id)
+        if global_row_index is None:
+            return
 
         # Jump to the page containing this global row index
         page_index = global_row_index // ENTRIES_PER_PAGE
@@ -356,26 +379,34 @@ class TranslationHistoryDialog(QWidget):
         self._highlight_current_search(global_row_index)  # Highlight the row in the table
 
     def _select_previous_result(self):
-        if not self._search_indices: return
+        if not self._search_hits: return
         self._current_search = max(0, self._current_search - 1)
         self._go_to_search_result()
 
     def _select_next_result(self):
-        if not self._search_indices: return
-        self._current_search = min(len(self._search_indices)-1, self._current_search + 1)
+        if not self._search_hits: return
+        if self._current_search + 1 >= len(self._search_hits) and self._fetch_search_page():
+            self._update_search_results()
+        self._current_search = min(len(self._search_hits)-1, self._current_search + 1)
         self._go_to_search_result()
 
     def _highlight_current_search(self, global_row_index=None):
         """Highlight the current search result in the table."""
         if global_row_index is None:
-            global_row_index = self._search_indices[self._current_search]
+            global_row_index = self.db.entry_position(self._search_hits[self._current_search].unique_id)
+            if global_row_index is None:
+                return
 
-        # Ensure the row index matches the correct position in the table
-        row = global_row_index % ENTRIES_PER_PAGE
-        self.history_table.selectRow(row)
+        # Rows are global positions in the lazily fetched table
+        if self.history_model.fetchUpTo(global_row_index):
+            self.history_table.selectRow(global_row_index)
+            self.history_table.scrollTo(self.history_model.index(global_row_index, 0))
 
     def _clear_search(self):
-        self._search_indices.clear()
+        self._search_hits = []
+        self._search_total = 0
+        self._current_search = -1
+        self._update_search_results()
         self.history_table.clearSelection()
         self.btn_search_next.setEnabled(False)
         self.btn_search_prev.setEnabled(False)
@@ -386,7 +417,9 @@ class TranslationHistoryDialog(QWidget):
         row = index.row()
 
         # Now access the record using the row index
-        record = self.history_model._data[row]
+        record = self.history_model.record(row)
+        if record is None:
+            return
 
         # Do something with the record, e.g., store the unique_id
         self.current_unique_id = record.unique_id
@@ -400,15 +433,14 @@ class TranslationHistoryDialog(QWidget):
         """
         Clear the model, the database, and reset the UI state.
         """
-        # 1) Clear the in-memory model
-        self.history_model._data.clear()
-
-        # 2) Clear the DB
+        # 1) Clear the DB
         self.db.clear_database()
 
+        # 2) Drop the model's fetched rows
+        self.history_model.reload()
+
         # 3) Reset paging & table
         self.current_page_number = 0
-        self.complete_history_entry_list.clear()  # so _refresh fetches from DB
         self._refresh_history_entries()
 
         # 4) Clear any active search
@@ -418,28 +450,29 @@ class TranslationHistoryDialog(QWidget):
         if self.current_unique_id is None:
             return  # No entry selected, do nothing
 
-        # Find the selected record by its unique_id from db_record_list
-        selected_record = next((record for record in self.db_record_list if record.unique_id == self.current_unique_id),
-                               None)
+        # Look the selected record up by its unique_id
+        selected_record = self.db.get_entry_by_id(self.current_unique_id)
         if not selected_record:
             return  # Handle case where no matching record is found (although it should always exist)
 
         dlg = _EntryDialog(self,
                            self.db,
-                           self.db_record_list,  # Pass the entire list
+                           [selected_record],
                            selected_record,  # Pass the selected record
                            self.current_unique_id,
                            is_new=new)
 
         if dlg.exec() == QDialog.Accepted:
-            # After editing, update the model with the new data
-            self.history_model.refreshData(self.db_record_list)  # Update the table model with the new data
+            # After editing, refetch the rows in view from the DB
+            self.history_model.reload()
+            self._refresh_history_entries()
 
     def _on_delete_entry(self):
         has_selected_record = self.current_unique_id is not None
         if has_selected_record:
             self.db.delete_entry(self.current_unique_id)
-            self.complete_history_entry_list.clear()
+            self.current_unique_id = None
+            self.history_model.reload()
             self._refresh_history_entries()
 
     # ─── DRAG & DROP ────────────────────────────────────────────────────────
@@ -31,17 +31,16 @@ def edit_version(record: DatabasePORecord, version_id: int, new_translation: str
 
 def save_versions(record: DatabasePORecord, connection) -> None:
     """
-    Persist all versions of the record to the database.
-    """
-    cursor = connection.cursor()
-    cursor.execute("DELETE FROM tran_text WHERE unique_id = ?", (record.unique_id,))
-    for version_id, text in record.msgstr_versions:
-        cursor.execute(
-            "INSERT INTO tran_text(unique_id, version_id, tran_text) VALUES (?, ?, ?)",
-            (record.unique_id, version_id, text)
-        )
-    connection.commit()
-    logger.info(f"Saved {len(record.msgstr_versions)} versions for record {record.unique_id}")
+    Persist all versions of the record to the database (changed rows only).
+    """
+    from pref.tran_history.translation_db import sync_versions
+    texts = [text for _, text in record.msgstr_versions]
+    with connection:
+        added, removed, moved = sync_versions(connection.cursor(), record.unique_id, texts)
+    logger.info(
+        f"Saved {len(texts)} versions for record {record.unique_id}: "
+        f"+{added} -{removed} ~{moved}"
+    )
 
 def cancel_edit() -> None:
     """
@@ -0,0 +1,36 @@
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtWidgets import QFileSystemModel
+
+import main_utils  # noqa: F401  (gv needs it imported first)
+from search import file_catalog
+from toolbars.explorer.toolbar_explorer_model import POFilesProxyModel
+
+
+def _names(proxy, parent):
+    return sorted(proxy.index(r, 0, parent).data() for r in range(proxy.rowCount(parent)))
+
+
+def test_po_filter_follows_the_catalogue(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_catalog, "CATALOG_DIR", tmp_path / "catalogs")
+    root = tmp_path / "po"
+    for rel in ("vi/a.po", "vi/notes.txt", "docs/readme.txt", "b.po", "c.txt"):
+        (root / rel).parent.mkdir(parents=True, exist_ok=True)
+        (root / rel).write_text("", encoding="utf-8")
+
+    fs_model = QFileSystemModel()
+    loop = QEventLoop()
+    fs_model.directoryLoaded.connect(lambda path: loop.quit())
+    QTimer.singleShot(5000, loop.quit)
+    root_index = fs_model.setRootPath(str(root))
+    loop.exec()
+
+    proxy = POFilesProxyModel()
+    proxy.setSourceModel(fs_model)
+    parent = proxy.mapFromSource(root_index)
+    assert _names(proxy, parent) == ["b.po", "c.txt", "docs", "vi"]  # off until enabled
+
+    catalog = file_catalog.FileCatalog(str(root))
+    catalog.load()
+    proxy.set_listing(str(root), catalog.files(["*.po"], under=str(root)))
+    proxy.set_enabled(True)
+    assert _names(proxy, parent) == ["b.po", "vi"]
@@ -10,3 +10,370 @@ def test_find_all_files(tmp_path):
     file1.write_text("hello")
     files = find_all_files(str(root), None)
     assert str(file1) in files
+
+
+def test_matcher_backends_agree():
+    from search.matchers import MATCHER_BACKENDS, make_matcher
+    text = "cat catalog category cat".encode("utf-8")
+    for name in MATCHER_BACKENDS:
+        assert make_matcher((b"cat",), name).search(text) == [(0, 3), (4, 3), (12, 3), (21, 3)]
+        # leftmost-longest across patterns, no overlaps
+        assert make_matcher((b"cat", b"catalog", b"tego"), name).search(text) == \
+            [(0, 3), (4, 7), (12, 3), (21, 3)]
+
+
+def test_literal_search_multi_keyword(tmp_path):
+    from search.fast_search import literal_search_in_file
+    f = tmp_path / "a.po"
+    f.write_text('msgid "Render"\nmsgstr "Kết xuất"\n', encoding="utf-8")
+    results = literal_search_in_file(str(f), ["Render", "xuất"], context=0)
+    assert [(r.line, r.preview) for r in results] == [(1, "Render"), (2, "xuất")]
+
+
+def test_line_index_matches_naive_scan(tmp_path):
+    from search.line_index import LineIndex, line_index_for
+    data = b"first\n\nthird line\nlast"
+    naive = []
+    for pos in range(len(data)):
+        line = data.count(b"\n", 0, pos) + 1
+        naive.append((line, pos - (data.rfind(b"\n", 0, pos) + 1)))
+    index = LineIndex.from_buffer(data)
+    assert index.line_count == 4
+    assert index.line_cols(range(len(data))) == naive
+    assert index.line_cols([19, 0, 7]) == [naive[19], naive[0], naive[7]]
+
+    f = tmp_path / "a.txt"
+    f.write_bytes(data)
+    assert line_index_for(data, str(f)) is line_index_for(data, str(f))
+
+
+def test_regex_trigram_query():
+    from search.trigram_index import regex_query
+    assert regex_query(r"Render\s+engine") == [["Render", "engine"]]
+    # sre_parse factors the common prefix out: colo(?:ur|r)
+    assert regex_query(r"(?:colour|color) ramp") == [["colo", "ur", " ramp"], ["colo", "r", " ramp"]]
+    assert regex_query(r"a.*b") == [["a", "b"]]
+    assert regex_query(r"\w+") == [[]]
+
+
+def test_trigram_index_narrows_and_resyncs(tmp_path):
+    import os
+    from search.trigram_index import TrigramIndex, literal_query, regex_query
+    a, b = tmp_path / "a.po", tmp_path / "b.po"
+    a.write_text('msgid "Render Engine"\n', encoding="utf-8")
+    b.write_text('msgid "Bake"\nmsgstr "Nướng"\n', encoding="utf-8")
+    files = [str(a), str(b)]
+    index = TrigramIndex(str(tmp_path / "grams.db"))
+    assert index.sync(files) == 2 and index.sync(files) == 0
+
+    assert index.candidates(literal_query(["render engine"]), files) == [str(a)]
+    assert index.candidates(literal_query(["Nướng", "Engine"]), files) == files
+    assert index.candidates(regex_query(r"Bake|Cycles"), files) == [str(b)]
+    assert index.candidates(literal_query(["ab"]), files) == files  # too short to narrow
+
+    b.write_text('msgid "Render"\n', encoding="utf-8")
+    os.utime(b, ns=(1, 1))
+    assert index.sync(files) == 1
+    assert index.candidates(literal_query(["Nướng"]), files) == []
+    assert index.candidates(literal_query(["Render"]), files) == files
+    index.close()
+
+
+def test_file_catalog_validates_and_restores(tmp_path):
+    from search.file_catalog import FileCatalog
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    (root / ".git").mkdir()
+    (root / ".git" / "x.po").write_text("")
+    (root / "a.po").write_text("a")
+    (root / "sub" / "b.po").write_text("b")
+    (root / "sub" / "c.txt").write_text("c")
+    cache = tmp_path / "catalog.pkl"
+
+    catalog = FileCatalog(str(root), cache_path=cache)
+    assert sorted(catalog.files(["*.po"])) == [str(root / "a.po"), str(root / "sub" / "b.po")]
+    assert sorted(catalog.files(None, under=str(root / "sub"))) == [str(root / "sub" / "b.po"), str(root / "sub" / "c.txt")]
+    assert catalog.stat(str(root / "a.po"))[1] == 1
+
+    (root / "sub" / "b.po").unlink()
+    (root / "new").mkdir()
+    (root / "new" / "d.po").write_text("d")
+    catalog.refresh(force=True)
+    assert sorted(catalog.files(["*.po"])) == [str(root / "a.po"), str(root / "new" / "d.po")]
+
+    # a new process restores the saved catalogue and only re-lists changed dirs
+    (root / "a.po").unlink()
+    restored = FileCatalog(str(root), cache_path=cache)
+    assert restored.files(["*.po"]) == [str(root / "new" / "d.po")]
+
+
+def test_file_catalog_follows_events(tmp_path):
+    import time
+    import pytest
+    from search import file_catalog
+    if file_catalog.Observer is None:
+        pytest.skip("watchdog not installed")
+    root = tmp_path / "root"
+    root.mkdir()
+    catalog = file_catalog.FileCatalog(str(root), cache_path=tmp_path / "catalog.pkl")
+    catalog.load()
+    if not catalog.watch():
+        pytest.skip("no filesystem events here")
+    try:
+        (root / "sub").mkdir()
+        (root / "sub" / "a.po").write_text("abc")
+        deadline = time.monotonic() + 5
+        while catalog.files(["*.po"]) != [str(root / "sub" / "a.po")] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert catalog.files(["*.po"]) == [str(root / "sub" / "a.po")]
+        assert catalog.stat(str(root / "sub" / "a.po"))[1] == 3
+    finally:
+        catalog.close()
+
+
+def _echo_twice(item, tag):
+    return [(tag, item), (tag, item)] if item % 2 else None
+
+
+def test_search_executor_chunks_and_cancels():
+    from search.search_executor import CancelToken, SearchExecutor
+    executor = SearchExecutor(max_workers=2)
+    try:
+        chunks = list(executor.map_chunks(_echo_twice, list(range(10)), "x", chunk_size=3))
+        assert sorted(count for count, _ in chunks) == [1, 3, 3, 3]
+        assert sorted(r for _, res in chunks for r in res) == [("x", i) for i in (1, 1, 3, 3, 5, 5, 7, 7, 9, 9)]
+
+        token = CancelToken()
+        token.cancel()
+        assert list(executor.map_chunks(_echo_twice, list(range(10)), "x", token=token)) == []
+    finally:
+        executor.shutdown()
+
+
+def test_search_session_streams_results(tmp_path, monkeypatch):
+    from PySide6.QtCore import QEventLoop, QTimer
+    from search import file_catalog
+    from toolbars.search.fast_search import SearchRequest
+    from toolbars.search.toolbar_search_session import SearchResultModel, SearchSession
+    monkeypatch.setattr(file_catalog, "CATALOG_DIR", tmp_path / "catalogs")
+    root = tmp_path / "po"
+    root.mkdir()
+    for i in range(5):
+        (root / f"f{i}.po").write_text('msgid "Render"\nmsgstr "Render"\n', encoding="utf-8")
+
+    model = SearchResultModel()
+    progress, outcome = [], []
+    session = SearchSession(SearchRequest(str(root), "Render", glob="*.po", use_index=False))
+    session.resultsReady.connect(model.append_results)
+    session.progress.connect(lambda done, total: progress.append((done, total)))
+    loop = QEventLoop()
+    session.finished.connect(lambda cancelled: (outcome.append(cancelled), loop.quit()))
+    QTimer.singleShot(20000, loop.quit)
+    session.start()
+    loop.exec()
+
+    assert outcome == [False]
+    assert model.rowCount() == 10
+    assert progress[-1] == (5, 5)
+    assert sorted((r.line, r.column) for r in model.results())[:2] == [(1, 7), (1, 7)]
+
+
+def test_po_search_scopes_and_wrapped_strings(tmp_path):
+    import re
+    from search.po_search import search_po_file
+    from search.trigram_index import literal_query, po_query
+    f = tmp_path / "a.po"
+    f.write_text(
+        'msgid ""\n'
+        'msgstr ""\n'
+        '"Project-Id-Version: Render 1.0\\n"\n'
+        '\n'
+        '#. Render settings\n'
+        '#: render.rst:10\n'
+        'msgctxt "Operator"\n'
+        'msgid "Render "\n'
+        '"Engine"\n'
+        'msgstr "Kết xuất"\n',
+        encoding="utf-8",
+    )
+    pattern = re.compile("render engine", re.IGNORECASE)
+    hits = search_po_file(str(f), pattern, ["msgid"])
+    # the match spans the continuation line; the header and #: reference don't count
+    assert [(h.entry_index, h.field, h.span, h.line) for h in hits] == [(0, "msgid", (0, 13), 5)]
+    assert [h.field for h in search_po_file(str(f), re.compile("Render"))] == ["msgid", "comment"]
+    assert search_po_file(str(f), re.compile("Render"), ["msgstr", "msgctxt"]) == []
+    assert po_query(literal_query(["Render Engine"])) == [["Render", "Engine"]]
+
+
+def test_search_query_flags(tmp_path):
+    import unicodedata
+    from search.fast_search import search_in_file
+    from search.query import SearchQuery, preserve_case, query_matches
+    text = "Đường đi\nđường\n" + unicodedata.normalize("NFD", "Kết") + "xuất Kết\n"
+    data = text.encode("utf-8")
+
+    # case folding of non-ASCII, reported as byte offsets
+    q = SearchQuery(("đường",), ignore_case=True)
+    assert [data[p:p + n].decode() for p, n in query_matches(data, q)] == ["Đường", "đường"]
+    # a decomposed letter's combining mark is part of the word
+    assert query_matches(data, SearchQuery(("xuất",), whole_word=True)) == []
+    assert len(query_matches(data, SearchQuery(("Kết",), whole_word=True))) == 1
+    # real regular expressions, anchored per line
+    f = tmp_path / "a.txt"
+    f.write_bytes(data)
+    results = search_in_file(str(f), SearchQuery((r"^đ\w+$",), regex=True), context=0)
+    assert [(r.line, r.column, r.preview) for r in results] == [(2, 0, "đường")]
+    try:
+        SearchQuery(("(",), regex=True).pattern
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid regex accepted")
+
+    assert [preserve_case(m, "render") for m in ("KẾT", "Kết", "kết", "kẾt")] == \
+        ["RENDER", "Render", "render", "render"]
+
+
+def test_po_replace_plan_apply_undo(tmp_path):
+    import polib
+    from search.po_replace import (
+        ReplaceConflict, ReplaceSpec, apply_replacements, plan_replacement, undo_replacements,
+    )
+    from search.query import SearchQuery
+    original = (
+        'msgid ""\nmsgstr ""\n"Content-Type: text/plain; charset=UTF-8\\n"\n\n'
+        'msgid "Render"\nmsgstr "Kết xuất \\"kết\\""\n\n'
+        'msgid "Render engine"\nmsgstr "Kết xuất"\n'
+    )
+    a, b = tmp_path / "a.po", tmp_path / "b.po"
+    a.write_text(original, encoding="utf-8")
+    b.write_text(original, encoding="utf-8")
+    spec = ReplaceSpec(SearchQuery(("kết",), ignore_case=True), "dựng", preserve_case=True)
+
+    edits = plan_replacement(str(a), spec) + plan_replacement(str(b), spec)
+    assert [e.count for e in edits] == [3, 3]
+    assert '+msgstr "Dựng xuất \\"dựng\\""' in edits[0].diff
+    assert a.read_text(encoding="utf-8") == original  # nothing written before applying
+
+    undo = apply_replacements(edits)
+    po = polib.pofile(str(a))
+    assert [e.msgstr for e in po] == ['Dựng xuất "dựng"', "Dựng xuất"]
+    assert [e.msgid for e in po] == ["Render", "Render engine"]  # msgid isn't in scope
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".replace-tmp")]
+    # backups are kept beside their files, so restoring them is a rename on one file system
+    assert [os.path.dirname(backup) for _, backup, _ in undo.files] == [str(tmp_path)] * 2
+
+    # b is edited afterwards: undo restores a only
+    b.write_text(original + "\n", encoding="utf-8")
+    restored, skipped, failed = undo_replacements(undo)
+    assert (restored, skipped, failed) == ([str(a)], [str(b)], [])
+    assert a.read_text(encoding="utf-8") == original
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".replace-bak")]
+
+    # a stale plan is refused as a whole
+    edits = plan_replacement(str(a), spec) + plan_replacement(str(b), spec)
+    b.write_text(original, encoding="utf-8")
+    os.utime(b, ns=(0, 0))
+    try:
+        apply_replacements(edits)
+    except ReplaceConflict as e:
+        assert e.paths == [str(b)]
+    else:
+        raise AssertionError("stale plan applied")
+    assert a.read_text(encoding="utf-8") == original
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".replace-tmp")]
+
+    # a single match, as located by search_po_file
+    one = ReplaceSpec(spec.query, "dựng", target=(1, "msgstr", 0, 3))
+    [edit] = plan_replacement(str(a), one)
+    apply_replacements([edit])
+    assert [e.msgstr for e in polib.pofile(str(a))] == ['Kết xuất "kết"', "dựng xuất"]
+
+
+def test_po_replace_reports_failed_rollback(tmp_path, monkeypatch):
+    from search import po_replace
+    from search.po_replace import ReplaceRollbackError, ReplaceSpec, apply_replacements, plan_replacement
+    from search.query import SearchQuery
+    original = 'msgid "Render"\nmsgstr "Kết xuất"\n'
+    paths = [tmp_path / f"{name}.po" for name in "abc"]
+    for path in paths:
+        path.write_text(original, encoding="utf-8")
+    spec = ReplaceSpec(SearchQuery(("kết",), ignore_case=True), "dựng")
+    edits = [edit for path in paths for edit in plan_replacement(str(path), spec)]
+
+    replace = os.replace
+
+    def failing_replace(src, dst):
+        # c can't be written, and a's backup can't be put back
+        if dst == str(paths[2]) or src.endswith(".replace-bak") and dst == str(paths[0]):
+            raise OSError("disk full")
+        replace(src, dst)
+
+    monkeypatch.setattr(po_replace.os, "replace", failing_replace)
+    try:
+        apply_replacements(edits)
+    except ReplaceRollbackError as e:
+        [(path, backup)] = e.failed
+        assert path == str(paths[0])
+        assert open(backup, encoding="utf-8").read() == original
+    else:
+        raise AssertionError("failed rollback not reported")
+    assert paths[1].read_text(encoding="utf-8") == original
+    assert paths[2].read_text(encoding="utf-8") == original
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".replace-tmp")]
+
+
+def test_po_replace_rewrites_only_the_changed_entries(tmp_path):
+    from search.po_replace import ReplaceSpec, apply_replacements, plan_replacement
+    from search.query import SearchQuery
+    # laid out unlike polib would write it: a header comment, a msgstr split short
+    header = (
+        '# Vietnamese translation.\n#\nmsgid ""\nmsgstr ""\n'
+        '"Content-Type: text/plain; charset=UTF-8\\n"\n\n'
+    )
+    untouched = '#: a.c:1\nmsgid "Open"\nmsgstr ""\n"Mở "\n"tệp"\n\n'
+    entry = '#: a.c:2\nmsgid "Render"\nmsgstr ""\n"Kết "\n"xuất"\n\n'
+    original = header + untouched + entry + untouched.replace("a.c:1", "a.c:3")
+    f = tmp_path / "a.po"
+    f.write_text(original, encoding="utf-8")
+
+    [edit] = plan_replacement(str(f), ReplaceSpec(SearchQuery(("kết",), ignore_case=True), "Dựng"))
+    apply_replacements([edit])
+    new_entry = '#: a.c:2\nmsgid "Render"\nmsgstr "Dựng xuất"\n\n'
+    assert f.read_text(encoding="utf-8") == original.replace(entry, new_entry)
+
+
+def test_replace_backups_are_removed_on_quit(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    from PySide6.QtCore import QCoreApplication, QElapsedTimer
+    import main_utils  # noqa: F401  (gv needs it imported first)
+    from search import file_catalog, trigram_index
+    from toolbars.search.toolbar_search_replace_actions import get_search_actions
+    from toolbars.search.toolbar_search_replace_main import FindReplaceMain
+    monkeypatch.setattr(file_catalog, "CATALOG_DIR", tmp_path / "catalogs")
+    monkeypatch.setattr(trigram_index, "INDEX_DB", tmp_path / "trigrams.db")
+    root = tmp_path / "po"
+    root.mkdir()
+    f = root / "a.po"
+    f.write_text('msgid "Render"\nmsgstr "Kết xuất"\n', encoding="utf-8")
+
+    panel = FindReplaceMain()
+    actions = get_search_actions(
+        window=None, find_widget=panel.toggle_widget, editor_manager=SimpleNamespace(tabs=[]),
+        get_root_path=lambda: str(root), results_model=panel.results_model,
+        get_po_fields=lambda: ("msgstr",),
+    )
+    panel.toggle_widget.find_edit.setText("Kết")
+    panel.toggle_widget.replace_edit.setText("Dựng")
+    actions["on_find"]()
+    timer = QElapsedTimer()
+    timer.start()
+    while not panel.results_model.rowCount() and timer.elapsed() < 20000:
+        QCoreApplication.processEvents()
+    actions["on_replace_current"]()
+    assert f.read_text(encoding="utf-8") == 'msgid "Render"\nmsgstr "Dựng xuất"\n'
+    assert [p for p in os.listdir(root) if p.endswith(".replace-bak")]
+
+    # the undo isn't kept across sessions, so neither are its backups
+    actions["on_quit"]()
+    assert os.listdir(root) == ["a.po"]
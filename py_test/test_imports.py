@@ -10,6 +10,13 @@ modules = [
     'main_utils.main_editor_tab_manager',
     'main_utils.main_toolbar_manager',
     'main_utils.po_ed_table_model',
+    'main_utils.po_lazy_file',
+    'main_utils.po_catalog_cache',
+    'main_utils.po_entry_store',
+    'main_utils.po_filter',
+    'main_utils.po_table_proxy',
+    'po_editor.po_filter_bar',
+    'main_utils.po_tab_loader',
     'main_utils.popup_mnu',
     'main_utils.safe_emit',
     'main_utils.table_widgets',
@@ -24,6 +31,9 @@ modules = [
     'workspace.workspace_tab',
     'search.fast_search',
     'search.fast_search_open_ext_editor',
+    'search.line_index',
+    'search.matchers',
+    'search.trigram_index', 'search.file_catalog', 'search.search_executor', 'toolbars.search.toolbar_search_session', 'search.po_search', 'search.query', 'search.po_replace', 'search.po_index', 'search.po_snapshot', 'toolbars.search.toolbar_search_replace_preview',
 ]
 
 @pytest.mark.parametrize('mod', modules)
@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from main_utils.po_catalog_cache import CachedPOFile, load_snapshot
+from main_utils.po_lazy_file import PAGE_SIZE, load_po
+from search import po_snapshot
+from search.po_snapshot import evict, write_snapshot
+
+PO = (
+    '# Translation\n'
+    'msgid ""\n'
+    'msgstr ""\n'
+    '"Content-Type: text/plain; charset=UTF-8\\n"\n'
+    '\n'
+    '#. Render settings\n'
+    '#: render.c:10 render.c:20\n'
+    '#, fuzzy, c-format\n'
+    '#| msgid "Old render"\n'
+    'msgctxt "Operator"\n'
+    'msgid "Render"\n'
+    'msgstr "Kết xuất"\n'
+    '\n'
+    'msgid "file"\n'
+    'msgid_plural "files"\n'
+    'msgstr[0] "tệp"\n'
+    '\n'
+    '#~ msgid "gone"\n'
+    '#~ msgstr "mất"\n'
+)
+
+
+def test_snapshot_round_trip_and_staleness(tmp_path, monkeypatch):
+    monkeypatch.setattr(po_snapshot, "CACHE_DIR", tmp_path / "cache")
+    f = tmp_path / "vi.po"
+    f.write_text(PO, encoding="utf-8")
+    assert load_snapshot(str(f)) is None
+
+    assert write_snapshot(str(f), PAGE_SIZE) is not None
+    po = load_snapshot(str(f))
+    ref = load_po(str(f), lazy=False)
+    assert isinstance(po, CachedPOFile) and len(po) == 3 and po.pending == 3
+    assert po[0].previous_msgid == "Old render" and po[0].linenum == ref[0].linenum
+    assert po.metadata == ref.metadata
+    assert str(po) == str(ref)
+
+    # touched only: the content hash still matches
+    os.utime(f, ns=(1, 1))
+    assert load_snapshot(str(f)) is not None
+    # same size, other content: stale
+    f.write_text(PO.replace("tệp", "tập"), encoding="utf-8")
+    assert load_snapshot(str(f)) is None
+
+
+def test_evict_keeps_most_recently_used(tmp_path, monkeypatch):
+    cache = tmp_path / "cache"
+    monkeypatch.setattr(po_snapshot, "CACHE_DIR", cache)
+    paths = []
+    for i in range(3):
+        f = tmp_path / f"{i}.po"
+        f.write_text(PO, encoding="utf-8")
+        paths.append(write_snapshot(str(f), PAGE_SIZE))
+        os.utime(paths[-1], ns=(i * 10**9, i * 10**9))
+    os.utime(paths[0], ns=(5 * 10**9, 5 * 10**9))  # used last
+    evict(max_bytes=2 * os.path.getsize(paths[0]))
+    assert sorted(p.name for p in cache.iterdir()) == sorted([paths[0].name, paths[2].name])
+
+
+def test_snapshot_writer_imports_without_the_gui():
+    # spawned workers import the writer; main_utils would load the editor GUI with it
+    code = ("import sys, search.po_snapshot; "
+            "print(sorted(m for m in sys.modules if m.startswith(('PySide6', 'main_utils'))))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
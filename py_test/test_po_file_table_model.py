@@ -13,3 +13,42 @@ def test_model_loads_po():
     entries = model.entries()
     assert isinstance(entries, list)
     assert len(entries) == len(po)
+
+
+def test_compact_store_matches_entries(tmp_path, monkeypatch):
+    from PySide6.QtCore import Qt
+    from main_utils import po_lazy_file
+    from main_utils.po_lazy_file import load_po
+
+    monkeypatch.setattr(po_lazy_file, "PAGE_SIZE", 4)
+    body = "".join(
+        ('#, fuzzy\n' if i % 3 == 0 else '')
+        + (f'msgctxt "ctx{i % 2}"\n' if i % 4 else '')
+        + f'msgid "id {i}"\nmsgstr "str {i}"\n\n'
+        for i in range(10)
+    )
+    f = tmp_path / "a.po"
+    f.write_text('msgid ""\nmsgstr ""\n"Content-Type: text/plain; charset=UTF-8\\n"\n\n' + body,
+                 encoding="utf-8")
+    ref = pofile(str(f))
+    po = load_po(str(f), lazy=True)
+    model = POFileTableModel(column_headers=list("abcde"))
+    model.setEntries(po)
+
+    def cells(m):
+        return [[m.data(m.index(r, c)) for c in (0, 1, 2, 4)]
+                + [m.data(m.index(r, 3), Qt.CheckStateRole) == Qt.Checked]
+                for r in range(m.rowCount())]
+
+    expected = [[e.msgid, e.msgctxt or "", e.msgstr, e.linenum, e.fuzzy] for e in ref]
+    assert cells(model) == expected
+    # painting every row kept no entry in the catalog
+    assert po.pending == len(po)
+
+    # edits go to entries built in the catalog, and show in the table
+    assert model.setData(model.index(1, 3), Qt.Checked, Qt.CheckStateRole)
+    po[2].msgstr = "changed"
+    expected[1][4] = True
+    expected[2][2] = "changed"
+    assert cells(model) == expected
+    assert po.pending == len(po) - 4
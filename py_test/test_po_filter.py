@@ -0,0 +1,71 @@
+import polib
+
+from main_utils.po_ed_table_model import POFileTableModel
+from main_utils.po_filter import FilterBitmaps
+from main_utils.po_table_proxy import POTableProxyModel
+from po_editor.po_filter_bar import POFilterBar
+
+
+def _setup():
+    po = polib.POFile()
+    po.append(polib.POEntry(msgid="Open file", msgstr="Mở tệp"))
+    po.append(polib.POEntry(msgid="Close file", msgstr=""))
+    po.append(polib.POEntry(msgid="Save", msgstr="Lưu", flags=['fuzzy'], comment="menu"))
+    po.append(polib.POEntry(msgid="Quit", msgstr="", obsolete=True))
+    po.append(polib.POEntry(msgid="%d files", msgid_plural="%d files", msgstr_plural={0: "%d tệp"}))
+    model = POFileTableModel(column_headers=list("abcde"))
+    model.setEntries(po)
+    proxy = POTableProxyModel()
+    proxy.setSourceModel(model)
+    return po, model, proxy
+
+
+def _shown(proxy):
+    return [proxy.data(proxy.index(r, 0)) for r in range(proxy.rowCount())]
+
+
+def test_filter_bitmaps_drive_proxy():
+    po, model, proxy = _setup()
+    bitmaps = FilterBitmaps(model)
+    proxy.set_row_filter(bitmaps.mask)
+    assert len(_shown(proxy)) == 5
+
+    bitmaps.set_filter(['untranslated']); proxy.refilter()
+    assert _shown(proxy) == ["Close file", "Quit"]
+    bitmaps.set_filter(['untranslated', 'fuzzy']); proxy.refilter()
+    assert _shown(proxy) == ["Close file", "Save", "Quit"]
+    bitmaps.set_filter(['untranslated', 'fuzzy'], "FILE"); proxy.refilter()
+    assert _shown(proxy) == ["Close file"]
+    bitmaps.set_filter(['obsolete', 'commented']); proxy.refilter()
+    assert _shown(proxy) == ["Save", "Quit"]
+
+    # text matches the cells, translations too; a longer query narrows the previous matches
+    bitmaps.set_filter([], "t"); proxy.refilter()
+    assert _shown(proxy) == ["Open file", "Quit"]
+    bitmaps.set_filter([], "tệp"); proxy.refilter()
+    assert _shown(proxy) == ["Open file"]
+
+    # sorting keeps the filter; edits update the bitmaps row by row
+    bitmaps.set_filter(['untranslated']); proxy.refilter()
+    proxy.sort_by('msgid', descending=True)
+    assert _shown(proxy) == ["Quit", "Close file"]
+    po[1].msgstr = "Đóng tệp"
+    model.refresh_row(1)
+    assert _shown(proxy) == ["Quit", "Close file"]  # stays until filtered again
+    proxy.refilter()
+    assert _shown(proxy) == ["Quit"]
+
+    bitmaps.set_filter(); proxy.refilter()
+    assert len(_shown(proxy)) == 5
+
+
+def test_filter_bar_counts():
+    _, model, proxy = _setup()
+    bar = POFilterBar(model, proxy)
+    assert bar.lbl_count.text() == "5 entries"
+    bar.buttons['fuzzy'].setChecked(True)
+    assert _shown(proxy) == ["Save"]
+    assert bar.lbl_count.text() == "1 of 5"
+    bar.text_edit.setText("nothing")
+    bar._apply()  # what the typing timer does
+    assert proxy.rowCount() == 0
@@ -0,0 +1,80 @@
+import polib
+from main_utils import po_lazy_file
+from main_utils.po_lazy_file import LazyPOFile, load_po
+from main_utils.po_ed_table_model import POFileTableModel
+
+HEADER = (
+    '# Translation\n'
+    'msgid ""\n'
+    'msgstr ""\n'
+    '"Content-Type: text/plain; charset=UTF-8\\n"\n'
+    '\n'
+)
+
+
+def _entries(po):
+    return [(e.msgid, e.msgctxt, e.msgstr, e.msgstr_plural, e.flags, e.comment,
+             e.occurrences, e.obsolete, e.linenum) for e in po]
+
+
+def test_lazy_po_matches_polib(tmp_path, monkeypatch):
+    monkeypatch.setattr(po_lazy_file, "PAGE_SIZE", 4)
+    body = "".join(
+        f'#. note {i}\n#: file.c:{i}\n'
+        + ('#, fuzzy\n' if i % 3 == 0 else '')
+        + (f'msgctxt "ctx"\n' if i % 5 == 0 else '')
+        + f'msgid "Line {i} "\n"continued"\nmsgstr "Dòng {i}"\n\n'
+        for i in range(10)
+    )
+    body += '#. comment block on its own\n\nmsgid "one"\nmsgid_plural "many"\nmsgstr[0] "mọi"\n\n'
+    body += '#~ msgid "old"\n#~ msgstr "cũ"\n'
+    f = tmp_path / "a.po"
+    f.write_text(HEADER + body, encoding="utf-8")
+
+    po = load_po(str(f), lazy=True)
+    ref = polib.pofile(str(f))
+    assert isinstance(po, LazyPOFile)
+    assert len(po) == len(ref) == 12
+    assert po.pending == 12
+    # one page is parsed for a row; line numbers are those of the whole file
+    assert (po[5].msgid, po[5].linenum) == (ref[5].msgid, ref[5].linenum)
+    assert po.pending == 8
+    assert po.metadata == ref.metadata
+    assert _entries(po) == _entries(ref)
+    assert po.pending == 0
+    assert str(po) == str(ref)
+
+
+def test_lazy_po_falls_back_and_feeds_model(tmp_path):
+    # entries without a blank line between them can't be indexed
+    f = tmp_path / "packed.po"
+    f.write_text(HEADER + 'msgid "a"\nmsgstr "b"\nmsgid "c"\nmsgstr "d"\n', encoding="utf-8")
+    po = load_po(str(f), lazy=True)
+    assert not isinstance(po, LazyPOFile)
+    assert [e.msgid for e in po] == ["a", "c"]
+
+    g = tmp_path / "big.po"
+    g.write_text(HEADER + "".join(f'msgid "m{i}"\nmsgstr ""\n\n' for i in range(1000)), encoding="utf-8")
+    po = load_po(str(g), lazy=True)
+    model = POFileTableModel(column_headers=["id", "ctx", "str", "fuzzy", "line"])
+    model.setEntries(po)
+    assert model.rowCount() == 1000
+    assert model.data(model.index(999, 0)) == "m999"
+    # the table shows rows from its compact store: no entry was kept in the catalog
+    assert po.pending == 1000
+    assert po[999].msgid == "m999"
+    # only the last page was parsed for it
+    assert po.pending == 999 // po_lazy_file.PAGE_SIZE * po_lazy_file.PAGE_SIZE
+
+
+def test_lazy_po_keeps_comment_opening_a_page(tmp_path, monkeypatch):
+    monkeypatch.setattr(po_lazy_file, "PAGE_SIZE", 2)
+    body = "".join(f'# translator note {i}\nmsgid "m{i}"\nmsgstr "s{i}"\n\n' for i in range(5))
+    f = tmp_path / "c.po"
+    f.write_text(HEADER + body, encoding="utf-8")
+
+    po = load_po(str(f), lazy=True)
+    ref = polib.pofile(str(f))
+    assert isinstance(po, LazyPOFile)
+    assert [(e.tcomment, e.linenum) for e in po] == [(e.tcomment, e.linenum) for e in ref]
+    assert str(po) == str(ref)
@@ -0,0 +1,51 @@
+from PySide6.QtWidgets import QApplication, QLabel, QTabWidget
+
+import po_editor.po_editor_widget as po_editor_widget
+from main_utils.main_editor_tab_manager import EditorTabManager
+from main_utils.po_tab_loader import PlaceholderTab
+
+
+class FakeEditor(QLabel):
+    def __init__(self, path, parent=None, po_file=None):
+        super().__init__(path, parent)
+        self.po_file = po_file
+
+
+def _settle(manager):
+    manager.loader.pool.waitForDone()
+    QApplication.processEvents()
+
+
+def test_pending_tabs_build_editor_when_shown(tmp_path, monkeypatch):
+    monkeypatch.setattr(po_editor_widget, "POEditorWidget", FakeEditor)
+    paths = []
+    for name in ("a", "b", "c"):
+        f = tmp_path / f"{name}.po"
+        f.write_text(f'msgid "{name}"\nmsgstr "{name.upper()}"\n', encoding="utf-8")
+        paths.append(str(f))
+    paths.append(str(tmp_path / "missing.po"))
+
+    tabs = QTabWidget()
+    manager = EditorTabManager(tabs)
+    manager.add_pending_tabs(paths, active=paths[1])
+
+    # every tab is there at once, as a placeholder; the active one is shown
+    assert tabs.count() == 4
+    assert all(isinstance(tabs.widget(i), PlaceholderTab) for i in range(4))
+    assert tabs.currentIndex() == 1
+
+    _settle(manager)
+    # only the shown tab got an editor, on the catalog loaded in the background
+    assert isinstance(tabs.widget(1), FakeEditor)
+    assert tabs.widget(1).po_file[0].msgstr == "B"
+    assert isinstance(tabs.widget(0), PlaceholderTab) and tabs.widget(0).po_file is not None
+    assert tabs.widget(3).error
+
+    tabs.setCurrentIndex(0)
+    assert isinstance(tabs.widget(0), FakeEditor)
+    assert tabs.tabText(0) == "a.po" and tabs.currentIndex() == 0
+    assert [t.widget for t in manager.tabs][:2] == [tabs.widget(0), tabs.widget(1)]
+
+    # already open: not added again
+    manager.add_pending_tabs(paths[:2])
+    assert tabs.count() == 4
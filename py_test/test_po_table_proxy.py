@@ -0,0 +1,58 @@
+import polib
+from PySide6.QtCore import QItemSelectionModel, Qt
+
+from main_utils.po_ed_table_model import POFileTableModel
+from main_utils.po_table_proxy import POTableProxyModel
+
+
+def _po(rows):
+    po = polib.POFile()
+    for i, (msgid, msgstr, fuzzy) in enumerate(rows):
+        po.append(polib.POEntry(msgid=msgid, msgstr=msgstr, flags=['fuzzy'] if fuzzy else [],
+                                linenum=10 * (i + 1)))
+    return po
+
+
+def _column(proxy, col=0):
+    return [proxy.data(proxy.index(r, col)) for r in range(proxy.rowCount())]
+
+
+def test_proxy_sorts_without_touching_catalog():
+    po = _po([("b", "x", False), ("C", "", False), ("a", "y", True), ("d", "", True)])
+    model = POFileTableModel(column_headers=list("abcde"))
+    model.setEntries(po)
+    proxy = POTableProxyModel()
+    proxy.setSourceModel(model)
+    assert _column(proxy) == ["b", "C", "a", "d"]
+
+    # select "C" (catalog row 1); the selection follows it through sorts
+    sel = QItemSelectionModel(proxy)
+    sel.select(proxy.index(1, 0), QItemSelectionModel.Select | QItemSelectionModel.Rows)
+
+    proxy.sort_by('msgid')
+    assert _column(proxy) == ["a", "b", "C", "d"]
+    assert [e.msgid for e in po] == ["b", "C", "a", "d"]
+    assert [i.row() for i in sel.selectedRows()] == [2]
+    assert proxy.source_row(2) == 1 and proxy.proxy_row(1) == 2
+
+    proxy.sort(0, Qt.DescendingOrder)
+    assert _column(proxy) == ["d", "C", "b", "a"]
+    assert [i.row() for i in sel.selectedRows()] == [1]
+
+    proxy.sort_by('untranslated')
+    assert _column(proxy) == ["C", "d", "b", "a"]
+    proxy.sort_by(None)
+    assert _column(proxy) == ["b", "C", "a", "d"]
+
+    # edits through the source reach the view and the cached keys (fuzzy sorts first)
+    proxy.sort_by('fuzzy')
+    assert _column(proxy) == ["a", "d", "b", "C"]
+    assert model.setData(model.index(0, 3), Qt.Checked, Qt.CheckStateRole)
+    assert proxy.data(proxy.index(2, 3), Qt.CheckStateRole) == Qt.Checked
+    proxy.sort_by('fuzzy')
+    assert _column(proxy) == ["b", "a", "d", "C"]
+
+    # a new catalog keeps the sort
+    po.append(polib.POEntry(msgid="e", msgstr="z", flags=['fuzzy']))
+    model.setEntries(po)
+    assert _column(proxy) == ["b", "a", "d", "e", "C"]
@@ -0,0 +1,286 @@
+import pytest
+from pref.tran_history.translation_db import TranslationDB
+
+
+@pytest.fixture
+def tdb(tmp_path):
+    db = TranslationDB(str(tmp_path / "translations.db"))
+    yield db
+    db.close()
+
+
+def _add(db, uid, msgid, ctx, versions):
+    db.conn.execute(
+        "INSERT INTO english_text(unique_id, en_text, context) VALUES(?,?,?)",
+        (uid, msgid, ctx)
+    )
+    db.conn.executemany(
+        "INSERT INTO tran_text(unique_id, version_id, tran_text) VALUES(?,?,?)",
+        [(uid, ver, txt) for ver, txt in versions]
+    )
+    db.conn.commit()
+
+
+def test_list_entries_groups_and_filters(tdb):
+    _add(tdb, 1, "File", None, [(1, "Tệp"), (2, "  "), (3, " FILE "), (4, "Tập tin")])
+    _add(tdb, 2, "Edit", "menu", [])
+    _add(tdb, 3, "View", None, [(2, "Xem"), (1, "Hiển thị")])
+
+    records = tdb.list_entries()
+    assert [r.unique_id for r in records] == [1, 2, 3]
+    assert records[0].msgstr_versions == [(1, "Tệp"), (4, "Tập tin")]
+    assert records[1].msgctxt == "menu" and records[1].msgstr_versions == []
+    assert records[2].msgstr_versions == [(1, "Hiển thị"), (2, "Xem")]
+
+
+def test_keyset_paging_and_cached_count(tdb):
+    for uid in (2, 3, 5, 7, 11, 13, 17):
+        _add(tdb, uid, f"Source {uid}", None, [(1, f"Nguồn {uid}")])
+
+    assert tdb.count_entries() == 7
+    assert tdb.entry_ids(after_id=3, limit=3) == [5, 7, 11]
+    assert tdb.entry_ids(after_id=11) == [13, 17]
+    first = tdb.records_between(2, 5)
+    assert [r.unique_id for r in first] == [2, 3, 5]
+    assert first[0].msgstr_versions == [(1, "Nguồn 2")]
+    assert tdb.entry_position(17) == 6
+    assert tdb.entry_position(3) == 1
+    assert tdb.entry_position(4) is None
+
+    tdb.delete_entry(3)
+    tdb.add_entry("Source 19")
+    assert tdb.count_entries() == 7
+    tdb.delete_entry(5)
+    assert tdb.count_entries() == 6
+
+
+def test_get_entry_uses_same_filter(tdb):
+    _add(tdb, 1, "File", None, [(1, "file"), (2, "Tệp")])
+    assert tdb.get_entry("File").msgstr_versions == [(2, "Tệp")]
+    assert tdb.get_entry_by_id(1).msgstr_versions == [(2, "Tệp")]
+    with pytest.raises(ValueError):
+        tdb.get_entry("File", "ctx")
+
+
+def test_import_po_entries_versions_and_skips(tdb):
+    from polib import POEntry
+    _add(tdb, 1, "File", None, [(1, "Tệp")])
+    entries = [
+        POEntry(msgid="File", msgstr="Tập tin"),
+        POEntry(msgid="Edit", msgctxt="menu", msgstr="Sửa"),
+        POEntry(msgid="View", msgstr=""),
+    ]
+    assert tdb.import_po_entries(entries) == 2
+    assert tdb.get_entry("File").msgstr_versions == [(1, "Tệp"), (2, "Tập tin")]
+    assert tdb.get_entry("Edit", "menu").msgstr_versions == [(1, "Sửa")]
+    assert tdb.get_entry("View").msgstr_versions == []
+
+    # re-importing the same file adds nothing
+    assert tdb.import_po_entries(entries) == 0
+    assert len(tdb.list_entries()) == 3
+
+
+def test_migration_merges_duplicate_sources(tmp_path):
+    import sqlite3
+    from pref.tran_history.tran_db_migrations import SCHEMA_VERSION, get_schema_version
+    path = str(tmp_path / "old.db")
+    db = TranslationDB(path)
+    db.conn.execute("DROP INDEX english_text_key")
+    db.conn.execute("PRAGMA user_version = 0")
+    _add(db, 1, "File", None, [(1, "Tệp"), (2, "Tập tin")])
+    _add(db, 2, "File", "", [(1, "Tập tin"), (2, "Hồ sơ")])
+    _add(db, 3, "File", None, [(1, "Tệp tin")])
+    db.close()
+
+    db = TranslationDB(path)
+    assert get_schema_version(db.conn) == SCHEMA_VERSION
+    assert [r.unique_id for r in db.list_entries()] == [1]
+    assert db.get_entry("File").msgstr_versions == [
+        (1, "Tệp"), (2, "Tập tin"), (3, "Hồ sơ"), (4, "Tệp tin")
+    ]
+    with pytest.raises(sqlite3.IntegrityError):
+        db.conn.execute("INSERT INTO english_text(en_text, context) VALUES('File', '')")
+    db.close()
+
+
+def test_connections_are_per_thread_and_wal(tdb):
+    import threading
+    _add(tdb, 1, "File", None, [(1, "Tệp")])
+    assert tdb.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert tdb.conn is tdb.conn
+
+    seen = {}
+    writer_ready = threading.Event()
+    reader_done = threading.Event()
+
+    def writer():
+        conn = tdb.conn
+        seen["writer"] = conn
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("INSERT INTO tran_text(unique_id, version_id, tran_text) VALUES(1, 2, 'Tập tin')")
+        writer_ready.set()
+        reader_done.wait(5)
+        conn.commit()
+
+    t = threading.Thread(target=writer)
+    t.start()
+    writer_ready.wait(5)
+    # the uncommitted write neither blocks nor leaks into this thread's reads
+    assert tdb.get_entry("File").msgstr_versions == [(1, "Tệp")]
+    reader_done.set()
+    t.join()
+    assert seen["writer"] is not tdb.conn
+    assert tdb.get_entry("File").msgstr_versions == [(1, "Tệp"), (2, "Tập tin")]
+
+
+def test_db_opens_lazily(tmp_path):
+    path = tmp_path / "lazy" / "translations.db"
+    db = TranslationDB(str(path))
+    assert not path.exists()
+    assert db.list_entries() == []
+    assert path.exists()
+    db.close()
+    assert db.list_entries() == []
+    db.close()
+
+
+def test_writer_coalesces_and_commits(tdb):
+    from pref.tran_history.tran_db_record import DatabasePORecord
+    from pref.tran_history.tran_db_writer import TranslationWriter
+    writer = TranslationWriter(tdb, coalesce_window=5)
+
+    rec = DatabasePORecord(msgid="File", msgstr_versions=[(1, "Tệp")])
+    writer.submit(rec, ["Tệp"])
+    rec.msgstr_versions.append((2, "Tập tin"))
+    writer.submit(rec, ["Tập tin"])
+    assert writer.lookup("File", "").msgstr_versions == [(1, "Tệp"), (2, "Tập tin")]
+
+    assert writer.flush(timeout=5)
+    writer.stop()
+    assert writer.lookup("File", None) is None
+    assert tdb.get_entry("File").msgstr_versions == [(1, "Tệp"), (2, "Tập tin")]
+    assert len(tdb.conn.execute("SELECT * FROM tran_text").fetchall()) == 2
+
+
+def test_writer_keeps_versions_stored_meanwhile(tdb):
+    from pref.tran_history.tran_db_writer import TranslationWriter
+    _add(tdb, 1, "File", None, [(1, "Tệp"), (2, "Tập")])
+    writer = TranslationWriter(tdb, coalesce_window=5)
+
+    rec = tdb.get_entry("File")
+    rec.msgstr_versions = [(1, "Tệp"), (2, "Tập tin")]
+    writer.submit(rec, added=["Tập tin"], removed=["Tập"])
+    writer.submit(rec, added=["Tệp tin"])
+    writer.submit(rec, removed=["Tệp tin"])  # undone before it was written
+    # imported while the edit is queued: not in the record the writer holds
+    tdb.add_version(1, "Hồ sơ")
+
+    assert writer.flush(timeout=5)
+    writer.stop()
+    assert tdb.get_entry("File").msgstr_versions == [(1, "Tệp"), (3, "Hồ sơ"), (4, "Tập tin")]
+
+
+def test_sync_versions_touches_only_changes(tdb):
+    from pref.tran_history.translation_db import sync_versions
+    _add(tdb, 1, "File", None, [(1, "a"), (2, "b"), (3, "c")])
+    ids = dict(tdb.conn.execute("SELECT tran_text, id FROM tran_text").fetchall())
+
+    with tdb.conn:
+        assert sync_versions(tdb.conn.cursor(), 1, ["a", "b", "c", "d"]) == (1, 0, 0)
+    with tdb.conn:
+        assert sync_versions(tdb.conn.cursor(), 1, ["b", "c", "d"]) == (0, 1, 3)
+    with tdb.conn:
+        # swap needs the negative parking path
+        assert sync_versions(tdb.conn.cursor(), 1, ["c", "b", "d"]) == (0, 0, 2)
+
+    rows = tdb.conn.execute(
+        "SELECT version_id, tran_text, id FROM tran_text WHERE unique_id = 1 ORDER BY version_id"
+    ).fetchall()
+    assert [(v, t) for v, t, _ in rows] == [(1, "c"), (2, "b"), (3, "d")]
+    assert rows[0][2] == ids["c"] and rows[1][2] == ids["b"]
+
+
+def test_search_ranks_and_highlights(tdb):
+    _add(tdb, 1, "Open File", None, [(1, "Mở tệp")])
+    _add(tdb, 2, "Save", None, [(1, "Lưu tệp tin"), (2, "Lưu tập tin")])
+    _add(tdb, 3, "Quit", None, [(1, "Thoát")])
+
+    hits = tdb.search("TỆP", mark_open="[", mark_close="]")
+    assert sorted(h.unique_id for h in hits) == [1, 2]
+    assert {h.field for h in hits} == {"msgstr"}
+    assert "[tệp]" in next(h.snippet for h in hits if h.unique_id == 1)
+    assert tdb.count_search("tệp") == 2
+
+    assert [h.unique_id for h in tdb.search("file", scope="msgid")] == [1]
+    assert tdb.search("file", scope="msgstr") == []
+    assert [h.unique_id for h in tdb.search("tin", limit=1, offset=0)] != []
+    # short queries fall back to LIKE
+    short = tdb.search("qu", scope="msgid", mark_open="[", mark_close="]")
+    assert [(h.unique_id, h.snippet) for h in short] == [(3, "[Qu]it")]
+
+    # triggers keep the index in sync
+    tdb.conn.execute("UPDATE tran_text SET tran_text = 'Đóng' WHERE unique_id = 3")
+    tdb.delete_entry(1)
+    tdb.conn.commit()
+    assert [h.unique_id for h in tdb.search("đóng")] == [3]
+    assert [h.unique_id for h in tdb.search("tệp")] == [2]
+
+
+def test_history_model_fetches_and_decodes_lazily(tdb):
+    from pref.tran_history import history_table_model as htm
+    for uid in range(1, 201):
+        _add(tdb, uid, f"Source {uid}", None, [(1, f"Nguồn {uid}")])
+
+    model = htm.HistoryTableModel(tdb, [("ID", 0), ("msgid", 0), ("msgstr", 0)],
+                                  fetch_batch=100, cache_size=htm.DECODE_BLOCK)
+    assert model.rowCount() == 0 and model.canFetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 100 and not model._cache
+
+    assert model.data(model.index(3, 1)) == "Source 4"
+    assert len(model._cache) == htm.DECODE_BLOCK
+    assert model.fetchUpTo(150) and model.rowCount() >= 151
+    assert model.record(150).msgstr_versions == [(1, "Nguồn 151")]
+    assert len(model._cache) == htm.DECODE_BLOCK and 4 not in model._cache
+
+    assert not model.fetchUpTo(500)
+    assert model.rowCount() == 200 and not model.canFetchMore()
+
+
+def test_new_record_starts_with_entry_msgstr(monkeypatch):
+    from types import SimpleNamespace
+    from PySide6.QtGui import QStandardItemModel
+    from polib import POEntry
+    import main_utils  # noqa: F401  (gv is only importable after it, as in the app)
+    from gv import main_gv
+    from pref.tran_history import tran_db_writer
+    from pref.tran_history.tran_db_record import DatabasePORecord
+    from sugg.suggestion_controller import SuggestionController
+
+    submitted = []
+    fake_writer = SimpleNamespace(
+        committed=SimpleNamespace(connect=lambda slot: None),
+        submit=lambda rec, added=(), removed=(): submitted.append((rec.unique_id, list(added))),
+    )
+    monkeypatch.setattr(tran_db_writer, "writer", fake_writer)
+    edit = SimpleNamespace(text="OK")
+    window = SimpleNamespace(translation_edit=SimpleNamespace(toPlainText=lambda: edit.text))
+    controller = SuggestionController(window, SimpleNamespace(setRecord=lambda rec: None))
+    table = QStandardItemModel(1, 1)
+    monkeypatch.setattr(main_gv, "po", [POEntry(msgid="OK")], raising=False)
+
+    # kept as is, like insert_po_entry() did, even though the pane hides a copy of the msgid
+    monkeypatch.setattr(main_gv, "current_suggestion_record", DatabasePORecord(msgid="OK"), raising=False)
+    controller._commit_previous_suggestion(table.index(0, 0))
+    assert submitted == [(None, ["OK"])]
+    assert main_gv.current_suggestion_record.msgstr_versions == []
+
+    # a stored record only gets the texts that are new to it
+    submitted.clear()
+    monkeypatch.setattr(main_gv, "current_suggestion_record",
+                        DatabasePORecord(unique_id=1, msgid="OK", msgstr_versions=[(1, "Được")]))
+    controller._commit_previous_suggestion(table.index(0, 0))
+    assert submitted == []
+    edit.text = "Đồng ý"
+    controller._commit_previous_suggestion(table.index(0, 0))
+    assert submitted == [(1, ["Đồng ý"])]
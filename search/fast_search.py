@@ -3,9 +3,19 @@ import mmap
 import multiprocessing
 import fnmatch
 import argparse
-import re
 from pathlib import Path
 
+try:
+    from search.line_index import line_index_for
+    from search.trigram_index import narrow_files
+    from search.query import SearchQuery, query_matches
+    from search.file_catalog import catalog_for
+except ImportError:  # run as a script from inside search/
+    from line_index import line_index_for
+    from trigram_index import narrow_files
+    from query import SearchQuery, query_matches
+    from file_catalog import catalog_for
+
 EXCLUDED_DIRS = {'.git', 'node_modules', '__pycache__', '.venv'}
 
 class SearchRequest:
@@ -15,19 +25,31 @@ class SearchRequest:
         root_path: str - directory to search
         keyword: str - search string or pattern
         glob_patterns: list[str] or None - file patterns to include
-        use_regex: bool - whether to use regex engine
-        ignore_case: bool - case-insensitive flag for regex
+        use_regex: bool - keywords are regular expressions
+        ignore_case: bool - Unicode case-insensitive matching
+        whole_word: bool - only matches not touching a word character
         context: int - number of chars to include around match
+        keywords: list[str] - keyword plus extra_keywords
+        use_index: bool - narrow files with the trigram index first
+        query: SearchQuery - what the workers run
     """
     def __init__(self, root_path: str, keyword: str,
                  glob: str = None, use_regex: bool = False,
-                 ignore_case: bool = False, context: int = 40):
+                 ignore_case: bool = False, context: int = 40,
+                 extra_keywords: list[str] = None, use_index: bool = True,
+                 whole_word: bool = False):
         self.root_path = root_path
         self.keyword = keyword
+        # any of these matches, found in one pass per file
+        self.keywords = [keyword] + list(extra_keywords or [])
+        self.use_index = use_index
         self.glob_patterns = [g.strip() for g in glob.split(',')] if glob else None
         self.use_regex = use_regex
         self.ignore_case = ignore_case
+        self.whole_word = whole_word
         self.context = context
+        self.query = SearchQuery(tuple(self.keywords), regex=use_regex,
+                                 ignore_case=ignore_case, whole_word=whole_word)
 
 class SearchResult:
     """
@@ -49,47 +71,11 @@ class SearchResult:
 def should_skip_dir(dirpath: str) -> bool:
     return any(part in EXCLUDED_DIRS for part in Path(dirpath).parts)
 
-# ====== Boyer–Moore Algorithm ======
-
-def build_skip_table(pattern: bytes) -> dict:
-    skip = {}
-    plen = len(pattern)
-    for i in range(plen - 1):
-        skip[pattern[i]] = plen - i - 1
-    return skip
-
-
-def boyer_moore_search_mmap(mm: mmap.mmap, pattern: bytes) -> list[int]:
-    skip = build_skip_table(pattern)
-    matches = []
-    i, plen, tlen = 0, len(pattern), len(mm)
-    while i <= tlen - plen:
-        j = plen - 1
-        while j >= 0 and mm[i + j] == pattern[j]:
-            j -= 1
-        if j < 0:
-            matches.append(i)
-            i += plen
-        else:
-            i += skip.get(mm[i + plen - 1], plen)
-    return matches
-
 # ====== Shared Helpers ======
 
-def calculate_line_and_column(mm: mmap.mmap, positions: list[int]) -> list[tuple[int,int]]:
-    data = mm[:]
-    lines = data.split(b'\n')
-    offsets = []
-    curr = 0
-    for line in lines:
-        offsets.append(curr)
-        curr += len(line) + 1
-    out = []
-    for pos in positions:
-        ln = next((i for i, off in enumerate(offsets) if off > pos), len(offsets))
-        start = offsets[ln-1] if ln > 0 else 0
-        out.append((ln, pos - start))
-    return out
+def calculate_line_and_column(mm: mmap.mmap, positions: list[int], filepath: str = None) -> list[tuple[int,int]]:
+    # (1-based line, column) via bisect on a line index cached per file
+    return line_index_for(mm, filepath).line_cols(positions)
 
 
 def extract_preview(mm: mmap.mmap, match_pos: int, match_len: int, context: int = 40) -> str:
@@ -116,63 +102,47 @@ def find_all_files(root_path: str, glob_patterns: list[str] | None) -> list[str]
             out.append(os.path.join(dirpath, fn))
     return out
 
-# ====== Regex Search Path ======
+# ====== Search Path ======
 
-def regex_search_in_file(filepath: str, pattern: str, ignore_case: bool, context: int) -> list[SearchResult] | None:
-    flags = re.IGNORECASE if ignore_case else 0
-    # allow any whitespace run in place of spaces
-    regex = re.compile(re.escape(pattern).replace(r"\\ ", r"\\s+"), flags)
+def search_in_file(filepath: str, query: SearchQuery, context: int) -> list[SearchResult] | None:
+    # literal, regex, case folding and whole-word all resolved by query_matches
     try:
-        text = open(filepath, 'r', encoding='utf-8', errors='ignore').read()
-    except Exception:
-        return None
-    matches = [(m.start(), m.end() - m.start()) for m in regex.finditer(text)]
-    if not matches:
+        with open(filepath, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
         return None
-    with open(filepath, 'rb') as f:
-        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
-    results = []
-    linecols = calculate_line_and_column(mm, [pos for pos,_ in matches])
-    for (pos, length), (ln, col) in zip(matches, linecols):
-        preview = extract_preview(mm, pos, length, context)
-        results.append(SearchResult(filepath, ln, col, preview))
-    mm.close()
+    with mm:
+        matches = query_matches(mm, query)
+        if not matches:
+            return None
+        linecols = calculate_line_and_column(mm, [pos for pos, _ in matches], filepath)
+        results = []
+        for (pos, length), (ln, col) in zip(matches, linecols):
+            preview = extract_preview(mm, pos, length, context)
+            results.append(SearchResult(filepath, ln, col, preview))
     return results
 
-# ====== Literal Search Path ======
 
-def literal_search_in_file(filepath: str, keyword: str, context: int) -> list[SearchResult] | None:
-    keyword_bytes = keyword.encode('utf-8')
-    try:
-        with open(filepath, 'rb') as f:
-            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
-            positions = boyer_moore_search_mmap(mm, keyword_bytes)
-            if not positions:
-                mm.close()
-                return None
-            linecols = calculate_line_and_column(mm, positions)
-            results = []
-            for pos, (ln, col) in zip(positions, linecols):
-                preview = extract_preview(mm, pos, len(keyword_bytes), context)
-                results.append(SearchResult(filepath, ln, col, preview))
-            mm.close()
-            return results
-    except Exception:
-        return None
+def regex_search_in_file(filepath: str, pattern: str, ignore_case: bool, context: int) -> list[SearchResult] | None:
+    return search_in_file(filepath, SearchQuery((pattern,), regex=True, ignore_case=ignore_case), context)
+
+
+def literal_search_in_file(filepath: str, keywords: list[str], context: int) -> list[SearchResult] | None:
+    return search_in_file(filepath, SearchQuery(tuple(keywords)), context)
 
 # ====== Worker Function ======
 
 def search_worker(args) -> list[SearchResult] | None:
     filepath, req = args
-    if req.use_regex:
-        return regex_search_in_file(filepath, req.keyword, req.ignore_case, req.context)
-    else:
-        return literal_search_in_file(filepath, req.keyword, req.context)
+    return search_in_file(filepath, req.query, req.context)
 
 # ====== Parallel Search ======
 
 def parallel_search(request: SearchRequest) -> list[SearchResult]:
-    files = find_all_files(request.root_path, request.glob_patterns)
+    # the saved catalogue is validated by directory mtimes instead of re-walking
+    files = catalog_for(request.root_path).files(request.glob_patterns, under=request.root_path)
+    if request.use_index:
+        files = narrow_files(files, request.query.trigram_query())
     args_list = [(f, request) for f in files]
     results: list[SearchResult] = []
     with multiprocessing.Pool(processes=os.cpu_count()) as pool:
@@ -190,11 +160,17 @@ def main():
     parser.add_argument('--glob', default=None,
                         help='Comma-separated glob patterns, e.g. "*.py,*.rst"')
     parser.add_argument('--regex', action='store_true',
-                        help='Use regex mode (\s+ for spaces)')
+                        help='Treat keywords as regular expressions')
     parser.add_argument('--ignore-case', action='store_true',
-                        help='Case-insensitive search (regex only)')
+                        help='Case-insensitive search (Unicode)')
+    parser.add_argument('--whole-word', action='store_true',
+                        help='Only matches not touching a letter/digit/_ on either side')
     parser.add_argument('--context', type=int, default=40,
                         help='Nuber of chars of context around match, 10 will give 10 chars around the found pattern')
+    parser.add_argument('--also', action='append', default=[], metavar='KEYWORD',
+                        help='Extra keyword searched in the same pass (repeatable)')
+    parser.add_argument('--no-index', action='store_true',
+                        help='Scan every file instead of narrowing with the trigram index')
     args = parser.parse_args()
 
     req = SearchRequest(
@@ -203,7 +179,10 @@ def main():
         glob=args.glob,
         use_regex=args.regex,
         ignore_case=args.ignore_case,
-        context=args.context
+        whole_word=args.whole_word,
+        context=args.context,
+        extra_keywords=args.also,
+        use_index=not args.no_index,
     )
 
     matches = parallel_search(req)
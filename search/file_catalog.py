@@ -0,0 +1,375 @@
+"""
+Change-aware catalogue of the files under a search root.
+
+A FileCatalog records every file under its root, excluding EXCLUDED_DIRS,
+with its (mtime_ns, size), grouped by directory, along with each
+directory's mtime. It is walked once, then kept current two ways:
+
+- with watch=True, a watchdog observer applies create/delete/modify/move
+  events as they happen, so listing files costs no I/O at all;
+- otherwise (or if the observer can't start), refresh() re-stats only the
+  known directories and re-lists those whose mtime changed, which is what
+  adding, removing or renaming an entry does. This runs at most every
+  VALIDATE_INTERVAL seconds.
+
+Catalogues are pickled per root under CATALOG_DIR, so a new process (the
+CLI, or the next GUI session) validates the saved one instead of walking
+the tree again. catalog_for() shares one catalogue per root: a search of a
+sub-directory is answered from an ancestor's catalogue.
+"""
+import fnmatch
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from lg import logger
+except ImportError:  # run as a script from inside search/
+    logger = logging.getLogger(__name__)
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog is optional; catalogues then validate by mtime
+    FileSystemEventHandler = object
+    Observer = None
+
+CATALOG_DIR = Path.home() / '.fast_search_catalogs'
+CATALOG_VERSION = 1
+
+EXCLUDED_DIRS = frozenset({'.git', 'node_modules', '__pycache__', '.venv'})
+# Minimum seconds between mtime validations of an unwatched catalogue
+VALIDATE_INTERVAL = 2.0
+# Trees with more directories aren't watched (one inotify watch per directory)
+MAX_WATCHED_DIRS = 50_000
+
+FileStat = Tuple[int, int]  # (mtime_ns, size)
+
+
+def catalog_file(root: str) -> Path:
+    """Pickle path of the catalogue of `root`."""
+    digest = hashlib.sha1(root.encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+    return CATALOG_DIR / f"{Path(root).name or 'root'}-{digest}.pkl"
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, catalog: "FileCatalog"):
+        super().__init__()
+        self._catalog = catalog
+
+    def on_any_event(self, event):
+        if event.event_type not in ('created', 'deleted', 'modified', 'moved'):
+            return
+        self._catalog.refresh_path(os.fsdecode(event.src_path))
+        dest = getattr(event, 'dest_path', '')
+        if dest:
+            self._catalog.refresh_path(os.fsdecode(dest))
+
+
+class FileCatalog:
+    def __init__(self, root: str, excluded_dirs: Iterable[str] = EXCLUDED_DIRS,
+                 cache_path: Optional[Path] = None):
+        self.root = os.path.abspath(root)
+        self.excluded_dirs = frozenset(excluded_dirs)
+        self.cache_path = catalog_file(self.root) if cache_path is None else cache_path
+        self._lock = threading.RLock()
+        # dir path -> {file name: (mtime_ns, size)}, and dir path -> dir mtime_ns
+        self._entries: Dict[str, Dict[str, FileStat]] = {}
+        self._dir_mtimes: Dict[str, int] = {}
+        self._loaded = False
+        self._dirty = False
+        self._validated_at = 0.0
+        self._observer = None
+        # bumped on every added/removed file; keys the listing cache
+        self.generation = 0
+        self._listings: Dict[tuple, List[str]] = {}
+
+    # ─── Loading and validation ─────────────────────────────────────────
+    def load(self):
+        """Restore the saved catalogue and validate it, or walk the tree once."""
+        with self._lock:
+            if self._loaded:
+                return
+            if self._restore():
+                self._validate()
+            else:
+                self._walk(self.root)
+            self._loaded = True
+            self._validated_at = time.monotonic()
+            self.save()
+
+    def _restore(self) -> bool:
+        try:
+            with open(self.cache_path, 'rb') as f:
+                data = pickle.load(f)
+        except Exception:
+            return False
+        if data.get('version') != CATALOG_VERSION or data.get('root') != self.root:
+            return False
+        self._entries = data['entries']
+        self._dir_mtimes = data['dirs']
+        return True
+
+    def save(self):
+        """Write the catalogue to cache_path if it changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {'version': CATALOG_VERSION, 'root': self.root,
+                    'entries': self._entries, 'dirs': self._dir_mtimes}
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.cache_path.with_suffix('.tmp')
+                with open(tmp, 'wb') as f:
+                    pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, self.cache_path)
+                self._dirty = False
+            except OSError:
+                pass
+
+    def _changed(self):
+        self.generation += 1
+        self._listings.clear()
+        self._dirty = True
+
+    def _scan_dir(self, path: str) -> List[str]:
+        """(Re)list one directory; returns its sub-directories that aren't excluded."""
+        try:
+            mtime = os.stat(path).st_mtime_ns  # before listing: a change during it rescans later
+            scanner = os.scandir(path)
+        except OSError:
+            self._drop_tree(path)
+            return []
+        files: Dict[str, FileStat] = {}
+        subdirs = []
+        with scanner:
+            for entry in scanner:
+                try:
+                    if entry.is_dir():
+                        if entry.name not in self.excluded_dirs:
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        files[entry.name] = (st.st_mtime_ns, st.st_size)
+                except OSError:
+                    continue
+        rescan = path in self._dir_mtimes
+        if files.keys() != self._entries.get(path, {}).keys():
+            self._changed()
+        elif files != self._entries.get(path):
+            self._dirty = True
+        self._entries[path] = files
+        self._dir_mtimes[path] = mtime
+        if rescan:
+            # sub-directories that disappeared since the last scan
+            known = {d for d in self._dir_mtimes if os.path.dirname(d) == path}
+            for gone in known.difference(subdirs):
+                self._drop_tree(gone)
+        return subdirs
+
+    def _walk(self, top: str):
+        stack = [top]
+        while stack:
+            stack.extend(self._scan_dir(stack.pop()))
+
+    def _drop_tree(self, path: str):
+        prefix = path + os.sep
+        gone = [d for d in self._dir_mtimes if d == path or d.startswith(prefix)]
+        for d in gone:
+            del self._dir_mtimes[d]
+            if self._entries.pop(d, None):
+                self._changed()
+        if gone:
+            self._dirty = True
+
+    def _validate(self):
+        """Re-list the directories whose mtime changed; walk new sub-directories."""
+        for path, mtime in list(self._dir_mtimes.items()):
+            if path not in self._dir_mtimes:  # dropped with a parent meanwhile
+                continue
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                self._drop_tree(path)
+                continue
+            if current != mtime:
+                for sub in self._scan_dir(path):
+                    if sub not in self._dir_mtimes:
+                        self._walk(sub)
+        if self.root not in self._dir_mtimes:
+            self._walk(self.root)
+
+    def refresh(self, force: bool = False):
+        """Validate by directory mtimes (no-op while a watcher keeps the catalogue current)."""
+        with self._lock:
+            if not self._loaded:
+                self.load()
+                return
+            if self.watching and not force:
+                return
+            now = time.monotonic()
+            if force or now - self._validated_at >= VALIDATE_INTERVAL:
+                self._validate()
+                self._validated_at = now
+
+    def refresh_path(self, path: str):
+        """Bring one changed file or directory up to date (filesystem-event entry point)."""
+        path = os.path.abspath(path)
+        if path != self.root and not path.startswith(self.root + os.sep):
+            return
+        rel_parts = Path(os.path.relpath(path, self.root)).parts
+        if any(part in self.excluded_dirs for part in rel_parts):
+            return
+        parent, name = os.path.split(path)
+        with self._lock:
+            if not self._loaded:
+                return
+            if os.path.isdir(path):
+                if path not in self._dir_mtimes:
+                    self._walk(path)
+                return
+            try:
+                st = os.stat(path)
+                is_file = os.path.isfile(path)
+            except OSError:
+                st, is_file = None, False
+            if path in self._dir_mtimes:  # a known directory was removed
+                self._drop_tree(path)
+            files = self._entries.get(parent)
+            if files is None:
+                if is_file and path != self.root:
+                    self._walk(parent)
+                return
+            if is_file:
+                if name not in files:
+                    self._changed()
+                files[name] = (st.st_mtime_ns, st.st_size)
+                self._dirty = True
+            elif files.pop(name, None) is not None:
+                self._changed()
+
+    # ─── Watching ───────────────────────────────────────────────────────
+    @property
+    def watching(self) -> bool:
+        return self._observer is not None
+
+    def watch(self) -> bool:
+        """Follow filesystem events from now on. False if watchdog is unavailable or fails."""
+        with self._lock:
+            if self._observer is not None:
+                return True
+            if Observer is None:
+                return False
+            self.load()
+            if len(self._dir_mtimes) > MAX_WATCHED_DIRS:
+                return False
+            observer = Observer()
+            try:
+                observer.schedule(_EventHandler(self), self.root, recursive=True)
+                observer.daemon = True
+                observer.start()
+            except Exception as e:  # e.g. the inotify watch limit
+                logger.warning(f"File catalogue: not watching {self.root} ({e})")
+                return False
+            self._observer = observer
+            # catch anything that changed between the validation and the watch
+            self._validate()
+            return True
+
+    def close(self):
+        """Stop watching and save."""
+        observer, self._observer = self._observer, None
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=2)
+        self.save()
+
+    # ─── Queries ────────────────────────────────────────────────────────
+    def files(self, glob_patterns: Optional[List[str]] = None, under: Optional[str] = None) -> List[str]:
+        """
+        Files matching any of `glob_patterns` (all files if None), optionally
+        only those below the directory `under`. Listings are cached until
+        a file is added or removed.
+        """
+        self.refresh()
+        under = os.path.abspath(under) if under else self.root
+        key = (tuple(glob_patterns) if glob_patterns else None, under)
+        with self._lock:
+            listing = self._listings.get(key)
+            if listing is None:
+                prefix = under + os.sep
+                listing = []
+                for d, names in self._entries.items():
+                    if d != under and not d.startswith(prefix):
+                        continue
+                    for name in names:
+                        if glob_patterns and not any(fnmatch.fnmatch(name, p) for p in glob_patterns):
+                            continue
+                        listing.append(os.path.join(d, name))
+                self._listings[key] = listing
+            return list(listing)
+
+    def stat(self, path: str) -> Optional[FileStat]:
+        """Recorded (mtime_ns, size) of `path`, or None if it isn't catalogued."""
+        parent, name = os.path.split(path)
+        with self._lock:
+            return self._entries.get(parent, {}).get(name)
+
+    def __contains__(self, path: str) -> bool:
+        return self.stat(path) is not None
+
+
+_catalogs: Dict[str, FileCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def catalog_for(root: str, watch: bool = False) -> FileCatalog:
+    """
+    The shared catalogue covering `root`: an existing one for `root` or one
+    of its ancestors, else a new one loaded now. With watch=True it follows
+    filesystem events.
+    """
+    root = os.path.abspath(root)
+    with _catalogs_lock:
+        catalog = _catalogs.get(root)
+        if catalog is None:
+            for other in _catalogs.values():
+                rel = os.path.relpath(root, other.root)
+                if rel.startswith(os.pardir) or any(p in other.excluded_dirs for p in Path(rel).parts):
+                    continue
+                catalog = other
+                break
+        if catalog is None:
+            catalog = _catalogs[root] = FileCatalog(root)
+    catalog.load()
+    if watch:
+        catalog.watch()
+    return catalog
+
+
+def catalog_files(root: str, glob_patterns: Optional[List[str]] = None) -> List[str]:
+    """Files under `root` matching `glob_patterns`, from the shared catalogue."""
+    return catalog_for(root).files(glob_patterns, under=root)
+
+
+def catalog_stat(root: str) -> Optional[Callable[[str], Optional[FileStat]]]:
+    """
+    Stat lookup for files under `root` if its catalogue is watched (and so
+    current), else None: callers then stat the files themselves.
+    """
+    catalog = catalog_for(root)
+    return catalog.stat if catalog.watching else None
+
+
+def close_catalogs():
+    """Stop every watcher and save every catalogue (call on exit)."""
+    with _catalogs_lock:
+        catalogs = list(_catalogs.values())
+        _catalogs.clear()
+    for catalog in catalogs:
+        catalog.close()
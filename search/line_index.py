@@ -0,0 +1,86 @@
+"""
+Byte offset -> (line, column) mapping for the fast search tools.
+
+A LineIndex holds the start offset of every line in an array('q'), built
+in one C-level pass over the buffer, and answers lookups with bisect.
+line_index_for() caches indexes per (path, mtime, size), so repeated
+searches over an unchanged tree don't rescan files for newlines.
+"""
+import os
+import re
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+# Indexes kept per process, least recently used dropped first
+LINE_INDEX_CACHE_SIZE = 256
+
+_NEWLINE = re.compile(b"\n")
+
+
+class LineIndex:
+    """Line start offsets of one buffer; lines are 1-based, columns 0-based byte offsets."""
+
+    def __init__(self, starts: array):
+        self.starts = starts
+
+    @classmethod
+    def from_buffer(cls, buf) -> "LineIndex":
+        """Index a bytes-like buffer (bytes, mmap) without copying it."""
+        starts = array('q', [0])
+        starts.extend(m.end() for m in _NEWLINE.finditer(buf))
+        return cls(starts)
+
+    @property
+    def line_count(self) -> int:
+        return len(self.starts)
+
+    def line_col(self, pos: int) -> Tuple[int, int]:
+        ln = bisect_right(self.starts, pos)
+        return ln, pos - self.starts[ln - 1]
+
+    def line_cols(self, positions: Iterable[int]) -> List[Tuple[int, int]]:
+        """
+        (line, column) per position. Ascending runs are resolved with the
+        previous line as the bisect lower bound, so sorted input costs
+        about one short search per match.
+        """
+        starts, out, lo = self.starts, [], 0
+        for pos in positions:
+            if pos < starts[lo]:
+                lo = 0
+            ln = bisect_right(starts, pos, lo)
+            out.append((ln, pos - starts[ln - 1]))
+            lo = ln - 1
+        return out
+
+
+_cache: "OrderedDict[Tuple[str, int, int], LineIndex]" = OrderedDict()
+
+
+def line_index_for(buf, path: Optional[str] = None) -> LineIndex:
+    """
+    LineIndex of `buf`. With `path`, the index is cached under the file's
+    (path, mtime, size) and reused until the file changes.
+    """
+    if path is None:
+        return LineIndex.from_buffer(buf)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return LineIndex.from_buffer(buf)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    index = _cache.get(key)
+    if index is None:
+        index = LineIndex.from_buffer(buf)
+        _cache[key] = index
+        while len(_cache) > LINE_INDEX_CACHE_SIZE:
+            _cache.popitem(last=False)
+    else:
+        _cache.move_to_end(key)
+    return index
+
+
+def clear_line_index_cache() -> None:
+    _cache.clear()
@@ -0,0 +1,156 @@
+"""
+Pluggable literal matchers for the fast search tools.
+
+A matcher finds every non-overlapping occurrence of one or more byte
+patterns in a bytes-like buffer (bytes, mmap) and returns (offset, length)
+pairs in ascending offset order. Where matches of different patterns
+overlap, the leftmost wins, and the longest at the same offset.
+
+Backends:
+    find         bytes.find / mmap.find loop (two-way/BM search in C)
+    regex        one compiled alternation of the escaped patterns (C)
+    boyer_moore  the former pure-Python loop; reference for benchmarks only
+
+make_matcher() picks the backend from BACKEND_BY_LENGTH / MULTI_BACKEND,
+which bench/bench_matchers.py measures.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple, Type
+
+Match = Tuple[int, int]  # (byte offset, byte length)
+
+
+class Matcher:
+    """Base class: subclasses implement search()."""
+    name = ""
+
+    def __init__(self, patterns: Sequence[bytes]):
+        patterns = tuple(p for p in patterns if p)
+        if not patterns:
+            raise ValueError("at least one non-empty pattern is required")
+        self.patterns = patterns
+
+    def search(self, buf) -> List[Match]:
+        raise NotImplementedError
+
+    def positions(self, buf) -> List[int]:
+        return [pos for pos, _ in self.search(buf)]
+
+
+def _merge_matches(per_pattern: List[List[Match]]) -> List[Match]:
+    """Combine single-pattern results into leftmost-longest, non-overlapping order."""
+    if len(per_pattern) == 1:
+        return per_pattern[0]
+    merged = sorted((m for ms in per_pattern for m in ms), key=lambda m: (m[0], -m[1]))
+    out, end = [], 0
+    for pos, length in merged:
+        if pos >= end:
+            out.append((pos, length))
+            end = pos + length
+    return out
+
+
+class FindMatcher(Matcher):
+    """Repeated buf.find() per pattern; the scan itself runs in C."""
+    name = "find"
+
+    def search(self, buf) -> List[Match]:
+        per_pattern = []
+        for pat in self.patterns:
+            plen, found = len(pat), []
+            i = buf.find(pat)
+            while i != -1:
+                found.append((i, plen))
+                i = buf.find(pat, i + plen)
+            per_pattern.append(found)
+        return _merge_matches(per_pattern)
+
+
+class RegexMatcher(Matcher):
+    """All patterns in one compiled alternation, longest first; one pass over buf."""
+    name = "regex"
+
+    def __init__(self, patterns: Sequence[bytes]):
+        super().__init__(patterns)
+        ordered = sorted(set(self.patterns), key=len, reverse=True)
+        self._regex = re.compile(b"|".join(re.escape(p) for p in ordered))
+
+    def search(self, buf) -> List[Match]:
+        return [(m.start(), m.end() - m.start()) for m in self._regex.finditer(buf)]
+
+
+class BoyerMooreMatcher(Matcher):
+    """Pure-Python Boyer–Moore–Horspool, indexing the buffer byte by byte."""
+    name = "boyer_moore"
+
+    @staticmethod
+    def _skip_table(pattern: bytes) -> dict:
+        plen = len(pattern)
+        return {pattern[i]: plen - i - 1 for i in range(plen - 1)}
+
+    def _search_one(self, buf, pattern: bytes) -> List[Match]:
+        skip = self._skip_table(pattern)
+        matches, i, plen, tlen = [], 0, len(pattern), len(buf)
+        while i <= tlen - plen:
+            j = plen - 1
+            while j >= 0 and buf[i + j] == pattern[j]:
+                j -= 1
+            if j < 0:
+                matches.append((i, plen))
+                i += plen
+            else:
+                i += skip.get(buf[i + plen - 1], plen)
+        return matches
+
+    def search(self, buf) -> List[Match]:
+        return _merge_matches([self._search_one(buf, p) for p in self.patterns])
+
+
+MATCHER_BACKENDS: Dict[str, Type[Matcher]] = {
+    cls.name: cls for cls in (FindMatcher, RegexMatcher, BoyerMooreMatcher)
+}
+
+# Single pattern: (minimum pattern length in bytes, backend), checked in order.
+# bench/bench_matchers.py over 32 MB of Python sources: find is fastest or
+# within noise of regex at every length (1-32 bytes), 25-80x boyer_moore.
+BACKEND_BY_LENGTH: List[Tuple[int, str]] = [
+    (1, "find"),
+]
+# Several patterns: one find() pass per pattern still beat the alternation
+# for 2-32 patterns (re has no multi-pattern automaton); regex only pulls
+# ahead when most of the buffer is matches.
+MULTI_BACKEND = "find"
+
+
+def select_backend(patterns: Sequence[bytes]) -> str:
+    if len(set(patterns)) > 1:
+        return MULTI_BACKEND
+    plen = len(patterns[0])
+    backend = BACKEND_BY_LENGTH[0][1]
+    for min_len, name in BACKEND_BY_LENGTH:
+        if plen >= min_len:
+            backend = name
+    return backend
+
+
+@lru_cache(maxsize=64)
+def make_matcher(patterns: Tuple[bytes, ...], backend: str = None) -> Matcher:
+    """
+    Matcher for `patterns` (a tuple, so results are cached per search).
+    `backend` forces one of MATCHER_BACKENDS; default is select_backend().
+    """
+    patterns = tuple(p for p in patterns if p)
+    if not patterns:
+        raise ValueError("at least one non-empty pattern is required")
+    name = backend or select_backend(patterns)
+    try:
+        cls = MATCHER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown matcher backend {name!r}; expected one of {sorted(MATCHER_BACKENDS)}")
+    return cls(patterns)
+
+
+def keyword_patterns(keywords: Sequence[str]) -> Tuple[bytes, ...]:
+    """UTF-8 encode search keywords for make_matcher(), dropping empties and duplicates."""
+    return tuple(dict.fromkeys(k.encode("utf-8") for k in keywords if k))
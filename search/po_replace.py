@@ -0,0 +1,345 @@
+"""
+PO-structure-aware replace across many files.
+
+Replacing is done in two steps, so a bulk replace can be previewed and
+never leaves a catalog half-written:
+
+1. plan_replacement() runs in the search workers, one file at a time: it
+   parses the file, substitutes in the selected entry fields (decoded text,
+   so the re-serialised entries are wrapped and escaped correctly), writes
+   the result to a temporary file next to the original and returns a
+   FileReplacement with a unified diff for the preview. Only the changed
+   entries are re-serialised; the rest of the file is copied byte for byte.
+2. apply_replacements() checks that no original changed since it was
+   planned, keeps a backup of each beside it, and renames every temporary
+   file over its original. os.replace() is atomic, so each file is either
+   the old or the new version; if a rename fails, the files already
+   replaced are restored. The returned ReplaceUndo restores the backups
+   later. Temporary files and backups stay in the original's folder, so
+   every rename is within one file system.
+
+discard_replacements() removes the temporary files of a cancelled preview.
+"""
+import difflib
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Set, Tuple
+
+import polib
+
+try:
+    from search.po_index import index_entries
+    from search.po_search import entry_fields
+    from search.query import SearchQuery, preserve_case
+except ImportError:  # run as a script from inside search/
+    from po_index import index_entries
+    from po_search import entry_fields
+    from query import SearchQuery, preserve_case
+
+# Scopes replaced when none is selected: translations only, never the source
+DEFAULT_REPLACE_FIELDS = ('msgstr',)
+# Lines of context around each change in the preview diff
+DIFF_CONTEXT = 1
+
+FileStat = Tuple[int, int]  # (mtime_ns, size)
+
+
+class ReplaceConflict(Exception):
+    """Files changed on disk between planning and applying a replace."""
+
+    def __init__(self, paths: Sequence[str]):
+        self.paths = list(paths)
+        super().__init__("Changed on disk since the preview:\n" + "\n".join(self.paths))
+
+
+class ReplaceRollbackError(OSError):
+    """A replace failed, and some files it had already replaced couldn't be restored."""
+
+    def __init__(self, error: OSError, failed: Sequence[Tuple[str, str]]):
+        self.error = error
+        self.failed = list(failed)  # (path, backup kept for it)
+        super().__init__(
+            f"{error}\nNot restored, the backups were kept:\n"
+            + "\n".join(f"{path} (backup: {backup})" for path, backup in self.failed)
+        )
+
+
+@dataclass(frozen=True)
+class ReplaceSpec:
+    """
+    What to replace.
+
+    Attributes:
+        query (SearchQuery): What to find; regex replacements may use \\1, \\g<name>.
+        replacement (str): Replacement text.
+        fields (tuple[str, ...]): PO scopes to replace in (see po_search.PO_FIELDS).
+        preserve_case (bool): Match each replacement to the case of the text it replaces.
+        target (tuple | None): (entry index, field, start, end) to replace only that
+            one match, as found by search_po_file(); None replaces all.
+    """
+    query: SearchQuery
+    replacement: str
+    fields: Tuple[str, ...] = DEFAULT_REPLACE_FIELDS
+    preserve_case: bool = False
+    target: Optional[Tuple[int, str, int, int]] = None
+
+
+@dataclass
+class FileReplacement:
+    """
+    A planned (then applied) replace in one file.
+
+    Attributes:
+        filepath (str): File to rewrite.
+        count (int): Number of matches replaced.
+        diff (str): Unified diff of the change.
+        temp_path (str): The new content, until applied or discarded.
+        original (FileStat): (mtime_ns, size) the plan was made from.
+    """
+    filepath: str
+    count: int
+    diff: str
+    temp_path: str
+    original: FileStat
+
+
+@dataclass
+class ReplaceUndo:
+    """Backups of the files an applied replace rewrote: [(path, backup, stat written)]."""
+    files: List[Tuple[str, str, FileStat]]
+
+    @property
+    def paths(self) -> List[str]:
+        return [path for path, _, _ in self.files]
+
+
+def _stat(path: str) -> FileStat:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _set_field(entry: polib.POEntry, name: str, text: str):
+    if name.startswith('msgstr['):
+        entry.msgstr_plural[int(name[7:-1])] = text
+    else:
+        setattr(entry, name, text)
+
+
+def _substitute(spec: ReplaceSpec, text: str, span: Optional[Tuple[int, int]] = None) -> Tuple[str, int]:
+    """`text` with the matches (only the one at `span`, if given) replaced, and their count."""
+    pattern = spec.query.pattern
+    parts, last, count = [], 0, 0
+    for m in pattern.finditer(text):
+        if m.end() == m.start() or (span is not None and m.span() != span):
+            continue
+        new = m.expand(spec.replacement) if spec.query.regex else spec.replacement
+        if spec.preserve_case:
+            new = preserve_case(m.group(0), new)
+        parts.append(text[last:m.start()])
+        parts.append(new)
+        last = m.end()
+        count += 1
+    if not count:
+        return text, 0
+    parts.append(text[last:])
+    return "".join(parts), count
+
+
+def _splice(data: bytes, po: polib.POFile, changed: Set[int]) -> Optional[bytes]:
+    """
+    `data` with the entries at the `changed` indexes of `po` re-serialised
+    and everything else as it was, or None if the entries can't be told
+    apart in `data` (see po_index.index_entries).
+    """
+    bounds = index_entries(data)
+    if bounds is None:
+        return None
+    first = len(bounds) - 1 - len(po)  # 1 if the file has a header entry
+    if first not in (0, 1):
+        return None
+    parts = []
+    for block, (start, end) in enumerate(zip(bounds, bounds[1:])):
+        index = block - first
+        if index not in changed:
+            parts.append(data[start:end])
+            continue
+        old = data[start:end]
+        tail = old[len(old.rstrip()):]  # the blank lines up to the next entry
+        parts.append(po[index].__unicode__(po.wrapwidth).encode(po.encoding))
+        parts.append(tail[tail.find(b'\n') + 1:])
+    return b"".join(parts)
+
+
+def plan_replacement(filepath: str, spec: ReplaceSpec) -> List[FileReplacement]:
+    """
+    Worker side: replace in one file's entries and write the result to a
+    temporary file beside it. Returns [] if nothing matched.
+    """
+    try:
+        original = _stat(filepath)  # before reading: a later write makes the plan stale
+        with open(filepath, 'rb') as f:
+            data = f.read()
+        po = polib.pofile(filepath)
+    except Exception:
+        return []
+    scopes = set(spec.fields)
+    changed = set()
+    total = 0
+    try:
+        for index, entry in enumerate(po):
+            if entry.obsolete:
+                continue
+            if spec.target is not None and index != spec.target[0]:
+                continue
+            for name, scope, text in entry_fields(entry):
+                if scope not in scopes:
+                    continue
+                span = None
+                if spec.target is not None:
+                    if name != spec.target[1]:
+                        continue
+                    span = spec.target[2:]
+                new_text, count = _substitute(spec, text, span)
+                if count:
+                    _set_field(entry, name, new_text)
+                    changed.add(index)
+                    total += count
+    except (re.error, IndexError) as e:  # a bad group reference in the replacement
+        raise ValueError(f"Invalid replacement: {e}") from None
+    if not total:
+        return []
+
+    new_data = _splice(data, po, changed)
+    if new_data is None:
+        new_data = po.__unicode__().encode(po.encoding)
+    folder, name = os.path.split(os.path.abspath(filepath))
+    fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".replace-tmp", dir=folder)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(new_data)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(filepath, temp_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    old_text = data.decode(po.encoding, 'replace')
+    new_text = new_data.decode(po.encoding, 'replace')
+    diff = "".join(difflib.unified_diff(
+        old_text.splitlines(keepends=True), new_text.splitlines(keepends=True),
+        fromfile=filepath, tofile=filepath, n=DIFF_CONTEXT,
+    ))
+    return [FileReplacement(filepath, total, diff, temp_path, original)]
+
+
+def discard_replacements(edits: Sequence[FileReplacement]):
+    """Remove the temporary files of planned replacements that won't be applied."""
+    for edit in edits:
+        try:
+            os.unlink(edit.temp_path)
+        except OSError:
+            pass
+
+
+def _backup(path: str) -> str:
+    """Keep the current content of `path` in a hidden file beside it; returns its path."""
+    folder, name = os.path.split(os.path.abspath(path))
+    backup = os.path.join(folder, f".{name}.{uuid.uuid4().hex[:8]}.replace-bak")
+    try:
+        os.link(path, backup)  # the replaced inode lives on as the backup
+    except OSError:
+        try:
+            shutil.copy2(path, backup)
+        except OSError:
+            _remove(backup)
+            raise
+    return backup
+
+
+def _remove(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def apply_replacements(edits: Sequence[FileReplacement]) -> ReplaceUndo:
+    """
+    Rename every planned file over its original, all or none. Raises
+    ReplaceConflict (and discards the plan) if an original changed since
+    it was planned, or the OSError after restoring the files already
+    replaced; ReplaceRollbackError if some of those couldn't be restored.
+    """
+    stale = []
+    for edit in edits:
+        try:
+            if _stat(edit.filepath) != edit.original:
+                stale.append(edit.filepath)
+        except OSError:
+            stale.append(edit.filepath)
+    if stale:
+        discard_replacements(edits)
+        raise ReplaceConflict(stale)
+
+    undo = ReplaceUndo([])
+    replaced = []  # (path, backup) of the files renamed over so far
+    try:
+        for edit in edits:
+            backup = _backup(edit.filepath)
+            try:
+                os.replace(edit.temp_path, edit.filepath)
+            except OSError:
+                _remove(backup)
+                raise
+            replaced.append((edit.filepath, backup))
+            undo.files.append((edit.filepath, backup, _stat(edit.filepath)))
+    except OSError as e:
+        failed = []
+        for path, backup in replaced:
+            try:
+                os.replace(backup, path)
+            except OSError:
+                failed.append((path, backup))
+        discard_replacements(edits)
+        if failed:
+            raise ReplaceRollbackError(e, failed) from e
+        raise
+    return undo
+
+
+def undo_replacements(undo: ReplaceUndo) -> Tuple[List[str], List[str], List[Tuple[str, str]]]:
+    """
+    Restore the files of an applied replace. Files edited since are left
+    alone. Returns (restored paths, skipped paths, failed), where failed
+    lists the (path, backup) pairs that couldn't be restored; their
+    backups are kept.
+    """
+    restored, skipped, failed = [], [], []
+    for path, backup, written in undo.files:
+        try:
+            unchanged = _stat(path) == written
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            skipped.append(path)
+            _remove(backup)
+            continue
+        try:
+            os.replace(backup, path)
+        except OSError:
+            failed.append((path, backup))
+        else:
+            restored.append(path)
+    undo.files = []
+    return restored, skipped, failed
+
+
+def discard_undo(undo: ReplaceUndo):
+    """Drop the backups of an applied replace (it can no longer be undone)."""
+    for _, backup, _ in undo.files:
+        _remove(backup)
+    undo.files = []
@@ -0,0 +1,137 @@
+"""
+PO-structure-aware search.
+
+Instead of matching raw bytes (which also hits the header, `#:` references
+and the quoting of wrapped continuation lines), a .po file is parsed into
+entries and the pattern is run over the decoded text of the selected
+fields, with continuation lines already joined and escapes resolved.
+
+A hit names the entry (its index in the file, which is its row in the
+editor table, and the line it starts on), the field, and the character
+span inside that field's text.
+
+Parsed files are cached per (path, mtime, size) in the process that
+searches them, so the persistent search workers parse each file once.
+"""
+import os
+import re
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import polib
+
+# Searchable scopes and the entry attributes they cover
+PO_FIELDS = ('msgid', 'msgstr', 'msgctxt', 'comments')
+
+# Parsed files kept per process, least recently used dropped first
+PO_CACHE_SIZE = 128
+
+
+class POSearchHit:
+    """
+    One match inside a PO entry field.
+
+    Attributes:
+        filepath (str): File path.
+        entry_index (int): Index of the entry in the file (editor table row).
+        field (str): 'msgid', 'msgid_plural', 'msgstr', 'msgstr[N]', 'msgctxt',
+            'tcomment' or 'comment'.
+        start, end (int): Character span within the field text.
+        line (int): Line where the entry starts in the file (polib linenum).
+        column (int): Always 0; kept so hits display like SearchResult.
+        preview (str): Field text around the match, on one line.
+    """
+    def __init__(self, filepath: str, entry_index: int, field: str, start: int, end: int,
+                 line: int, preview: str):
+        self.filepath = filepath
+        self.entry_index = entry_index
+        self.field = field
+        self.start = start
+        self.end = end
+        self.line = line
+        self.column = 0
+        self.preview = preview
+
+    @property
+    def span(self) -> Tuple[int, int]:
+        return self.start, self.end
+
+
+# (entry index, first line, [(field name, scope, text), ...]) per live entry
+ParsedEntry = Tuple[int, int, List[Tuple[str, str, str]]]
+
+_cache: "OrderedDict[Tuple[str, int, int], List[ParsedEntry]]" = OrderedDict()
+
+
+def entry_fields(entry: polib.POEntry) -> List[Tuple[str, str, str]]:
+    """(field name, scope, text) of the entry's non-empty fields; names as in POSearchHit.field."""
+    fields = [('msgid', 'msgid', entry.msgid)]
+    if entry.msgid_plural:
+        fields.append(('msgid_plural', 'msgid', entry.msgid_plural))
+    if entry.msgstr_plural:
+        for n in sorted(entry.msgstr_plural):
+            fields.append((f'msgstr[{n}]', 'msgstr', entry.msgstr_plural[n]))
+    else:
+        fields.append(('msgstr', 'msgstr', entry.msgstr))
+    if entry.msgctxt:
+        fields.append(('msgctxt', 'msgctxt', entry.msgctxt))
+    if entry.tcomment:
+        fields.append(('tcomment', 'comments', entry.tcomment))
+    if entry.comment:
+        fields.append(('comment', 'comments', entry.comment))
+    return [f for f in fields if f[2]]
+
+
+def parse_entries(filepath: str) -> List[ParsedEntry]:
+    """Searchable fields of every non-obsolete entry, cached until the file changes."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return []
+    key = (os.path.abspath(filepath), st.st_mtime_ns, st.st_size)
+    parsed = _cache.get(key)
+    if parsed is not None:
+        _cache.move_to_end(key)
+        return parsed
+    try:
+        po = polib.pofile(filepath)
+    except Exception:
+        return []
+    parsed = [
+        (index, entry.linenum or 0, entry_fields(entry))
+        for index, entry in enumerate(po)
+        if not entry.obsolete
+    ]
+    _cache[key] = parsed
+    while len(_cache) > PO_CACHE_SIZE:
+        _cache.popitem(last=False)
+    return parsed
+
+
+def clear_po_cache() -> None:
+    _cache.clear()
+
+
+def _preview(text: str, start: int, end: int, context: int) -> str:
+    snippet = text[max(start - context, 0):end + context]
+    return " ".join(snippet.split())
+
+
+def search_po_file(filepath: str, pattern: "re.Pattern", fields: Optional[Sequence[str]] = None,
+                   context: int = 40) -> List[POSearchHit]:
+    """
+    Every match of `pattern` in the `fields` scopes (default: all of
+    PO_FIELDS) of the file's entries, in file order.
+    """
+    scopes = set(fields or PO_FIELDS)
+    hits = []
+    for index, line, entry_fields in parse_entries(filepath):
+        for name, scope, text in entry_fields:
+            if scope not in scopes:
+                continue
+            for m in pattern.finditer(text):
+                if m.end() == m.start():
+                    continue
+                hits.append(POSearchHit(filepath, index, name, m.start(), m.end(), line,
+                                        _preview(text, m.start(), m.end(), context)))
+    return hits
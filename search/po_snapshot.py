@@ -0,0 +1,126 @@
+"""
+Writing parsed-catalog snapshots (see main_utils.po_catalog_cache).
+
+A snapshot needs a full parse, so it is written in a search worker
+process. This module is what such a worker imports: it only needs polib,
+not main_utils, whose package loads the editor GUI. It holds the snapshot
+format (header, entry rows, file naming) that po_catalog_cache reads back.
+"""
+import hashlib
+import marshal
+import os
+import struct
+from pathlib import Path
+from typing import Optional
+
+import polib
+
+try:
+    from search.po_index import detect_encoding
+except ImportError:  # run as a script from inside search/
+    from po_index import detect_encoding
+
+CACHE_DIR = Path.home() / '.po_catalog_cache'
+CACHE_VERSION = 2
+# Total size of the snapshots kept; least recently used go first
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+# magic, cache version, marshal version, source size, source mtime_ns, source digest,
+# then the length of the marshal-ed catalog info that precedes the pages
+HEADER = struct.Struct('<4sHHQQ16sQ')
+MAGIC = b'POCC'
+
+
+def snapshot_file(path: str) -> Path:
+    """Snapshot path of the catalog at `path`."""
+    path = os.path.abspath(path)
+    key = hashlib.sha1(path.encode('utf-8', 'surrogateescape')).hexdigest()[:16]
+    return CACHE_DIR / f"{os.path.basename(path)}-{key}.pocache"
+
+
+def digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def entry_row(e: polib.POEntry) -> tuple:
+    return (e.msgid, e.msgctxt, e.msgid_plural, e.msgstr, tuple(sorted(e.msgstr_plural.items())),
+            tuple(e.flags), e.comment, e.tcomment, tuple(e.occurrences),
+            e.previous_msgctxt, e.previous_msgid, e.previous_msgid_plural, e.obsolete, e.linenum)
+
+
+def row_entry(row: tuple) -> polib.POEntry:
+    (msgid, msgctxt, msgid_plural, msgstr, plural, flags, comment, tcomment, occurrences,
+     previous_msgctxt, previous_msgid, previous_msgid_plural, obsolete, linenum) = row
+    return polib.POEntry(
+        msgid=msgid, msgctxt=msgctxt, msgid_plural=msgid_plural, msgstr=msgstr,
+        msgstr_plural=dict(plural), flags=list(flags), comment=comment, tcomment=tcomment,
+        occurrences=list(occurrences), previous_msgctxt=previous_msgctxt,
+        previous_msgid=previous_msgid, previous_msgid_plural=previous_msgid_plural,
+        obsolete=obsolete, linenum=linenum,
+    )
+
+
+def write_snapshot(path: str, page_size: int) -> Optional[Path]:
+    """
+    Parse the catalog at `path` and store its snapshot, `page_size` entries
+    to a page; returns the snapshot path, or None.
+    """
+    try:
+        st = os.stat(path)  # before reading: a later write makes the snapshot stale
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    encoding = detect_encoding(data)
+    try:
+        po = polib.pofile(data.decode(encoding), encoding=encoding)
+    except Exception:
+        return None
+    rows = [entry_row(e) for e in po]
+    pages, page_ends, end = [], [], 0
+    for first in range(0, len(rows), page_size):
+        pages.append(marshal.dumps(rows[first:first + page_size]))
+        end += len(pages[-1])
+        page_ends.append(end)
+    info = marshal.dumps((po.encoding, po.header, po.metadata, po.metadata_is_fuzzy,
+                          len(rows), page_size, page_ends))
+    cache = snapshot_file(path)
+    tmp = cache.with_name(f"{cache.name}.{os.getpid()}.tmp")
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, CACHE_VERSION, marshal.version,
+                                st.st_size, st.st_mtime_ns, digest(data), len(info)))
+            f.write(info)
+            f.writelines(pages)
+        os.replace(tmp, cache)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        return None
+    evict()
+    return cache
+
+
+def evict(max_bytes: Optional[int] = None):
+    """Remove the least recently used snapshots until they fit in `max_bytes` (MAX_CACHE_BYTES)."""
+    limit = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    snapshots = []
+    try:
+        for entry in os.scandir(CACHE_DIR):
+            if entry.name.endswith('.pocache'):
+                st = entry.stat()
+                snapshots.append((st.st_mtime_ns, st.st_size, entry.path))
+    except OSError:
+        return
+    total = sum(size for _, size, _ in snapshots)
+    for _, size, snapshot in sorted(snapshots):
+        if total <= limit:
+            break
+        try:
+            os.unlink(snapshot)
+            total -= size
+        except OSError:
+            pass
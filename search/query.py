@@ -0,0 +1,130 @@
+"""
+Compiled search queries for the fast search tools.
+
+A SearchQuery is the picklable description of what to find: keywords,
+whether they are regular expressions, case folding and whole-word
+matching. It travels to the worker processes with the request, and each
+worker compiles it once (compile_query() is cached per query), so every
+filter runs inside the search instead of on the results afterwards.
+
+- Plain literals (case-sensitive, not whole-word) use the C byte matchers
+  of search.matchers on the raw file.
+- Everything else runs a str regex over the decoded file: whole-word
+  boundaries use Unicode word characters plus combining marks, so
+  decomposed Vietnamese text ("é") is not split mid-letter, and
+  IGNORECASE folds non-ASCII letters (Đ/đ). Match offsets are mapped
+  back to byte offsets for line/column lookup.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Tuple
+
+try:
+    from search.matchers import keyword_patterns, make_matcher
+    from search.trigram_index import TrigramQuery, literal_query, regex_query
+except ImportError:  # run as a script from inside search/
+    from matchers import keyword_patterns, make_matcher
+    from trigram_index import TrigramQuery, literal_query, regex_query
+
+# \w plus the combining-mark blocks: a mark continues the word it follows
+WORD_CHAR = "[\\w\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]"
+
+Match = Tuple[int, int]  # (byte offset, byte length)
+
+
+@dataclass(frozen=True)
+class SearchQuery:
+    """
+    What to search for.
+
+    Attributes:
+        keywords (tuple[str, ...]): Alternatives; any of them matches.
+        regex (bool): Keywords are regular expressions (re syntax, MULTILINE).
+        ignore_case (bool): Unicode case-insensitive matching.
+        whole_word (bool): Matches must not touch a word character on either side.
+    """
+    keywords: Tuple[str, ...]
+    regex: bool = False
+    ignore_case: bool = False
+    whole_word: bool = False
+
+    @property
+    def is_plain_literal(self) -> bool:
+        """True if the byte matchers can run this query directly."""
+        return not (self.regex or self.ignore_case or self.whole_word)
+
+    @property
+    def pattern(self) -> "re.Pattern":
+        """The compiled str pattern (cached); raises ValueError for an invalid regex."""
+        return compile_query(self)
+
+    def trigram_query(self) -> TrigramQuery:
+        """Literal runs every match needs, for search.trigram_index."""
+        if not self.regex:
+            return literal_query(self.keywords)
+        alternatives = []
+        for keyword in self.keywords:
+            alts = regex_query(keyword)
+            if alts == [[]]:
+                return [[]]
+            alternatives.extend(alts)
+        return alternatives or [[]]
+
+
+@lru_cache(maxsize=128)
+def compile_query(query: SearchQuery) -> "re.Pattern":
+    keywords = [k for k in query.keywords if k]
+    if not keywords:
+        raise ValueError("empty search")
+    if query.regex:
+        source = "|".join(f"(?:{k})" for k in keywords)
+    else:
+        # longest first, so the alternation prefers the longest literal at a position
+        source = "|".join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True))
+    if query.whole_word:
+        source = f"(?<!{WORD_CHAR})(?:{source})(?!{WORD_CHAR})"
+    flags = (re.IGNORECASE if query.ignore_case else 0) | (re.MULTILINE if query.regex else 0)
+    try:
+        return re.compile(source, flags)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression: {e}") from None
+
+
+def _byte_spans(text: str, spans) -> List[Match]:
+    """Map ascending (char start, char end) spans of `text` to (byte offset, byte length)."""
+    out = []
+    char_pos = byte_pos = 0
+    for start, end in spans:
+        byte_pos += len(text[char_pos:start].encode('utf-8', 'surrogateescape'))
+        char_pos = start
+        out.append((byte_pos, len(text[start:end].encode('utf-8', 'surrogateescape'))))
+    return out
+
+
+def query_matches(buf, query: SearchQuery) -> List[Match]:
+    """Every non-empty, non-overlapping match of `query` in a bytes-like buffer, by byte offset."""
+    if query.is_plain_literal:
+        return make_matcher(keyword_patterns(query.keywords)).search(buf)
+    # surrogateescape keeps undecodable bytes one char each, so offsets map back exactly
+    text = bytes(buf).decode('utf-8', 'surrogateescape')
+    spans = [m.span() for m in query.pattern.finditer(text) if m.end() > m.start()]
+    if text.isascii():
+        return [(start, end - start) for start, end in spans]
+    return _byte_spans(text, spans)
+
+
+def preserve_case(matched: str, replacement: str) -> str:
+    """
+    `replacement` in the case style of the text it replaces: ALL CAPS,
+    Capitalized or lower case; anything else is left as given.
+    """
+    if not matched or not any(c.isalpha() for c in matched):
+        return replacement
+    if matched.isupper():
+        return replacement.upper()
+    if matched.islower():
+        return replacement.lower()
+    if matched[0].isupper() and (len(matched) == 1 or matched[1:].islower()):
+        return replacement[:1].upper() + replacement[1:]
+    return replacement
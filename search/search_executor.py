@@ -0,0 +1,159 @@
+"""
+Long-lived process pool for the in-app search.
+
+Starting a multiprocessing.Pool per query costs far more than searching a
+few hundred .po files: every worker is spawned (a fresh interpreter
+importing the search modules on macOS) and torn down again. The
+SearchExecutor keeps one ProcessPoolExecutor for the whole session,
+created on first use or by warm_up() at app start.
+
+Work is sent in chunks of file paths, so the request is pickled once per
+chunk rather than once per file. A CancelToken stops a search between
+chunks: queued chunks are dropped and finished ones are no longer
+collected, so a superseded search frees the pool within one chunk per
+worker.
+"""
+import importlib
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, List, Optional, Sequence
+
+# Bounds on files per task; within them a search is split into about
+# CHUNKS_PER_WORKER tasks per worker, so small searches still use every core.
+MIN_CHUNK_SIZE = 1
+MAX_CHUNK_SIZE = 64
+CHUNKS_PER_WORKER = 4
+
+
+class CancelToken:
+    """Set by the caller to abandon a running search; checked between chunks."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+def _run_chunk(fn: Callable, items: Sequence, args: tuple) -> list:
+    """Worker side: fn(item, *args) for each item, falsy results skipped, lists concatenated."""
+    out = []
+    for item in items:
+        res = fn(item, *args)
+        if res:
+            out.extend(res)
+    return out
+
+
+def _import_modules(modules: Sequence[str]) -> int:
+    for name in modules:
+        importlib.import_module(name)
+    return os.getpid()
+
+
+class SearchExecutor:
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        """Drop a broken pool so the next search starts a fresh one."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def warm_up(self, modules: Sequence[str] = ()):
+        """
+        Start every worker now and have it import `modules`, so the first
+        search doesn't pay for it. Doesn't wait for the workers.
+        """
+        pool = self._get_pool()
+        for _ in range(self.max_workers):
+            pool.submit(_import_modules, tuple(modules))
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Run fn(*args) in the pool (fn must be picklable); for one-off background work."""
+        pool = self._get_pool()
+        try:
+            return pool.submit(fn, *args)
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise
+
+    def chunk_size(self, count: int) -> int:
+        size = -(-count // (self.max_workers * CHUNKS_PER_WORKER))
+        return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, size))
+
+    def map_chunks(self, fn: Callable, items: Sequence, *args,
+                   token: Optional[CancelToken] = None,
+                   chunk_size: Optional[int] = None) -> Iterator[tuple]:
+        """
+        Run fn(item, *args) over `items` in the pool; fn must be picklable
+        (module level) and return a list or None. Yields (items done, results)
+        per chunk in completion order, until done or `token` is cancelled.
+        """
+        if not items:
+            return
+        size = chunk_size or self.chunk_size(len(items))
+        pool = self._get_pool()
+        try:
+            pending = {
+                pool.submit(_run_chunk, fn, items[i:i + size], args): min(size, len(items) - i)
+                for i in range(0, len(items), size)
+            }
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise
+        try:
+            while pending:
+                if token is not None and token.cancelled:
+                    return
+                done, _ = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                for future in done:
+                    count = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool:
+                        self._discard_pool(pool)
+                        raise
+                    yield count, results
+        finally:
+            # cancelled, failed or abandoned by the caller: drop the queued chunks
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executor: Optional[SearchExecutor] = None
+
+
+def search_executor() -> SearchExecutor:
+    """The process-wide executor; its pool starts on first use."""
+    global _executor
+    if _executor is None:
+        _executor = SearchExecutor()
+    return _executor
+
+
+def shutdown_search_executor():
+    if _executor is not None:
+        _executor.shutdown()
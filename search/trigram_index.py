@@ -0,0 +1,299 @@
+"""
+Persistent trigram index that narrows the files a search has to read.
+
+Every indexed file is one document in a contentless FTS5 table with the
+trigram tokenizer and detail=none: SQLite keeps only, per (case-folded)
+trigram, the list of documents containing it. A keyword can only occur in
+files holding all of its trigrams, so a query is an AND of trigrams (an OR
+of such ANDs for several keywords or regex alternatives) answered from the
+posting lists without touching the files. The literal/regex pass then runs
+on the candidates alone.
+
+Files are re-indexed when their (mtime, size) changes. Contentless FTS5
+rows can't be deleted without their old text, so a changed file gets a new
+document and the old one is left orphaned (filtered out by the join on
+files.doc_id); the FTS table is rebuilt once orphans outnumber live
+documents.
+
+The index lives next to the file-list cache, in INDEX_DB.
+"""
+import logging
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    from lg import logger
+except ImportError:  # run as a script from inside search/
+    logger = logging.getLogger(__name__)
+
+try:  # Python 3.11+ moved the regex parser; the old names warn on import
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:
+    import sre_constants
+    import sre_parse
+
+INDEX_DB = Path.home() / '.fast_search_trigrams.db'
+
+# Larger files are not indexed and always stay candidates
+MAX_INDEXED_SIZE = 64 * 1024 * 1024
+# Files indexed per transaction while syncing
+SYNC_BATCH = 500
+# Rebuild the FTS table once orphaned documents exceed both this and the live count
+MIN_ORPHANS_FOR_REBUILD = 1000
+
+# Regex alternatives kept before a branch is treated as unconstrained
+MAX_ALTERNATIVES = 32
+
+# A query: OR over alternatives, each an AND over literal strings that must
+# all occur. An alternative without usable strings matches every file.
+TrigramQuery = List[List[str]]
+# path -> (mtime_ns, size), or None if unknown
+StatLookup = Callable[[str], Optional[Tuple[int, int]]]
+
+
+# --- Query construction ---
+
+def literal_query(keywords: Sequence[str]) -> TrigramQuery:
+    """Any of the literal keywords."""
+    return [[k] for k in keywords]
+
+
+def _required_literals(parsed) -> Optional[TrigramQuery]:
+    """
+    Walk an sre_parse pattern and return the alternatives of literal runs
+    every match must contain. Returns None where nothing can be required.
+    """
+    alts: TrigramQuery = [[]]
+    run: List[str] = []
+
+    def flush():
+        if run:
+            for alt in alts:
+                alt.append("".join(run))
+            run.clear()
+
+    for op, av in parsed:
+        if op is sre_constants.LITERAL:
+            run.append(chr(av))
+            continue
+        flush()
+        if op is sre_constants.SUBPATTERN:
+            sub = _required_literals(av[-1])
+        elif op is sre_constants.BRANCH:
+            branches = [_required_literals(b) for b in av[1]]
+            sub = None if any(b is None for b in branches) else [a for b in branches for a in b]
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and av[0] >= 1:
+            sub = _required_literals(av[2])
+        else:
+            sub = None
+        if sub and len(alts) * len(sub) <= MAX_ALTERNATIVES:
+            # cross product: every current alternative with every sub alternative
+            alts = [a + s for a in alts for s in sub]
+    flush()
+    return alts
+
+
+def regex_query(pattern: str) -> TrigramQuery:
+    """
+    Best-effort trigram query for a regex: the literal runs every match
+    must contain. Unparseable patterns give a match-everything query.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return [[]]
+    return _required_literals(parsed) or [[]]
+
+
+# Where a .po file may break a decoded string: wrapping at whitespace, and
+# escapes for quotes, backslashes and control characters
+_PO_BREAKS = re.compile(r'[\s"\\]+')
+
+
+def po_query(query: TrigramQuery) -> TrigramQuery:
+    """
+    `query` for text matched after PO decoding: only the pieces between
+    possible line wraps and escapes are sure to appear verbatim in the file.
+    """
+    return [[piece for literal in alt for piece in _PO_BREAKS.split(literal) if piece] for alt in query]
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _match_expression(query: TrigramQuery) -> Optional[str]:
+    """FTS5 MATCH expression for `query`, or None if it can't narrow anything."""
+    ors = []
+    for alt in query:
+        grams = set()
+        for literal in alt:
+            # case folding is left to the tokenizer, as for the indexed text
+            grams |= _trigrams(literal)
+        if not grams:
+            return None  # this alternative may match any file
+        ors.append("(" + " AND ".join('"' + g.replace('"', '""') + '"' for g in sorted(grams)) + ")")
+    return " OR ".join(ors) if ors else None
+
+
+# --- Index ---
+
+class TrigramIndex:
+    def __init__(self, db_path: str = str(INDEX_DB)):
+        self.db_path = str(db_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                  path      TEXT PRIMARY KEY,
+                  doc_id    INTEGER,          -- NULL: too large, always a candidate
+                  mtime_ns  INTEGER NOT NULL,
+                  size      INTEGER NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS files_doc ON files(doc_id)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER)")
+            conn.execute("INSERT OR IGNORE INTO meta(key, value) VALUES('orphans', 0)")
+            self._create_grams(conn)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _create_grams(conn: sqlite3.Connection):
+        conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS grams USING fts5("
+            "body, content='', detail='none', tokenize='trigram')"
+        )
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _read_text(path: str) -> Optional[str]:
+        try:
+            with open(path, 'rb') as f:
+                return f.read().decode('utf-8', errors='ignore')
+        except OSError:
+            return None
+
+    def sync(self, files: Iterable[str], stat: Optional[StatLookup] = None) -> int:
+        """
+        (Re)index files that are new or whose mtime/size changed. Returns how
+        many. `stat` gives a file's (mtime_ns, size) without touching the disk
+        (a watched file catalogue); files it doesn't know are stat'ed.
+        """
+        with self._lock:
+            conn = self.conn
+            known: Dict[str, tuple] = {
+                p: (m, s) for p, m, s in conn.execute("SELECT path, mtime_ns, size FROM files")
+            }
+            stale = []
+            for path in files:
+                current = stat(path) if stat is not None else None
+                if current is None:
+                    try:
+                        st = os.stat(path)
+                    except OSError:
+                        continue
+                    current = (st.st_mtime_ns, st.st_size)
+                if known.get(path) != current:
+                    stale.append((path, *current))
+
+            orphaned = sum(1 for path, _, _ in stale if path in known)
+            self._index_files(conn, stale)
+            if orphaned:
+                with conn:
+                    conn.execute("UPDATE meta SET value = value + ? WHERE key = 'orphans'", (orphaned,))
+                self._rebuild_if_fragmented(conn)
+            return len(stale)
+
+    def _index_files(self, conn: sqlite3.Connection, entries: List[tuple]):
+        """Add one document per (path, mtime_ns, size) and point files at it."""
+        for start in range(0, len(entries), SYNC_BATCH):
+            with conn:
+                for path, mtime_ns, size in entries[start:start + SYNC_BATCH]:
+                    doc_id = None
+                    if size <= MAX_INDEXED_SIZE:
+                        text = self._read_text(path)
+                        if text is None:
+                            continue
+                        doc_id = conn.execute("INSERT INTO grams(body) VALUES(?)", (text,)).lastrowid
+                    conn.execute(
+                        "INSERT OR REPLACE INTO files(path, doc_id, mtime_ns, size) VALUES(?,?,?,?)",
+                        (path, doc_id, mtime_ns, size)
+                    )
+
+    def _rebuild_if_fragmented(self, conn: sqlite3.Connection):
+        orphans = conn.execute("SELECT value FROM meta WHERE key = 'orphans'").fetchone()[0]
+        live = conn.execute("SELECT COUNT(doc_id) FROM files").fetchone()[0]
+        if orphans < max(MIN_ORPHANS_FOR_REBUILD, live):
+            return
+        # re-read every indexed file into a fresh FTS table
+        entries = conn.execute("SELECT path, mtime_ns, size FROM files").fetchall()
+        with conn:
+            conn.execute("DROP TABLE grams")
+            self._create_grams(conn)
+            conn.execute("DELETE FROM files")
+            conn.execute("UPDATE meta SET value = 0 WHERE key = 'orphans'")
+        self._index_files(conn, entries)
+        conn.execute("VACUUM")
+
+    def candidates(self, query: TrigramQuery, files: Sequence[str]) -> List[str]:
+        """
+        The subset of `files` (already synced) that may match `query`, in
+        their original order. Returns `files` unchanged if the query can't
+        narrow the search.
+        """
+        expr = _match_expression(query)
+        if expr is None:
+            return list(files)
+        with self._lock:
+            conn = self.conn
+            hits = {p for p, in conn.execute(
+                "SELECT f.path FROM grams JOIN files AS f ON f.doc_id = grams.rowid"
+                " WHERE grams MATCH ?", (expr,)
+            )}
+            hits.update(p for p, in conn.execute("SELECT path FROM files WHERE doc_id IS NULL"))
+            indexed = {p for p, in conn.execute("SELECT path FROM files")}
+        # files the index doesn't know (unreadable at sync time) stay candidates
+        return [f for f in files if f in hits or f not in indexed]
+
+
+_default_index: Optional[TrigramIndex] = None
+
+
+def default_index() -> TrigramIndex:
+    """Process-wide index at INDEX_DB, opened on first use."""
+    global _default_index
+    if _default_index is None:
+        _default_index = TrigramIndex()
+    return _default_index
+
+
+def narrow_files(files: List[str], query: TrigramQuery, index: Optional[TrigramIndex] = None,
+                 stat: Optional[StatLookup] = None) -> List[str]:
+    """
+    Sync `files` into the index and return those that may match `query`.
+    Any index failure falls back to searching every file.
+    """
+    index = index or default_index()
+    try:
+        index.sync(files, stat)
+        return index.candidates(query, files)
+    except sqlite3.Error as e:
+        logger.warning(f"Trigram index unavailable ({e}); scanning all files")
+        return files
@@ -10,8 +10,10 @@ class SuggestionController:
     Handles suggestion logic on table row changes and integrates with the translation history DB.
     """
     def __init__(self, window, suggestion_model):
+        from pref.tran_history.tran_db_writer import writer
         self.window = window
         self.model = suggestion_model
+        writer.committed.connect(self._on_history_committed)
 
     def on_row_change(self, current: QModelIndex, previous: QModelIndex):
         """
@@ -37,8 +39,10 @@ class SuggestionController:
     def _commit_previous_suggestion(self, previous: QModelIndex):
         """
         Save edits from the suggestion pane back into the DB.
+        The record is updated in memory right away; the DB write is queued on
+        the background writer so row navigation never waits on disk.
         """
-        from pref.tran_history.translation_db import db
+        from pref.tran_history.tran_db_writer import writer
         from pref.tran_history.tran_db_record import DatabasePORecord
 
         sugg_rec: DatabasePORecord = main_gv.current_suggestion_record
@@ -64,18 +68,21 @@ class SuggestionController:
         )
 
         # parent_entry: POEntry = main_gv.old_po_rec
-        # If no DB record exists for suggestions, create it
+        # A record without unique_id gets its english_text row from the writer
         is_my_parent = (sugg_rec.is_my_parent(parent_entry))
         is_sugg_rec_empty = not bool(sugg_rec.unique_id)
-        is_adding_new_po_entry = is_my_parent and is_sugg_rec_empty
-        if is_adding_new_po_entry:
-            sugg_rec = db.insert_po_entry(parent_entry)
-
+        added = []
+        if is_my_parent and is_sugg_rec_empty:
+            # a new record starts with the entry's msgstr as is, as insert_po_entry() stored it
+            added.append(parent_entry.msgstr)
         is_new_text = not sugg_rec.has_tran_text(new_text)
         can_update = (is_my_parent and is_new_text)
         if can_update:
             sugg_rec.add_version_mem(new_text)
-            sugg_rec.update_record_with_changes()
+            if new_text in sugg_rec.normalize_versions():
+                added.append(new_text)
+        if added:
+            writer.submit(sugg_rec, added)
 
         self.model.setRecord(sugg_rec)
         main_gv.current_suggestion_record = sugg_rec
@@ -117,6 +124,7 @@ class SuggestionController:
         Populate editors and suggestion pane for the newly selected POEntry.
         """
         from pref.tran_history.translation_db import db
+        from pref.tran_history.tran_db_writer import writer
         from pref.tran_history.tran_db_record import DatabasePORecord
 
         entry: POEntry = main_gv.current_po_rec
@@ -127,16 +135,30 @@ class SuggestionController:
         )
         self._populate_editors(entry)
 
-        # Load suggestions from DB
-        try:
-            rec = db.get_entry(entry.msgid, entry.msgctxt)
-        except ValueError:
-            rec = DatabasePORecord(msgid=entry.msgid, msgctxt=entry.msgctxt)
+        # Load suggestions: a queued, uncommitted save wins over the DB copy
+        rec = writer.lookup(entry.msgid, entry.msgctxt)
+        if rec is None:
+            try:
+                rec = db.get_entry(entry.msgid, entry.msgctxt)
+            except ValueError:
+                rec = DatabasePORecord(msgid=entry.msgid, msgctxt=entry.msgctxt)
         self.model.setRecord(rec)
         main_gv.current_suggestion_record = rec
         main_gv.current_suggestion_row = None
         translate_suggestion(entry.msgid)
 
+    def _on_history_committed(self, records):
+        """Writer finished a batch: hand new unique_ids to the shown record."""
+        from pref.tran_history.tran_db_writer import record_key
+        current = main_gv.current_suggestion_record
+        if current is None or current.unique_id is not None:
+            return
+        current_key = record_key(current.msgid, current.msgctxt)
+        for rec in records:
+            if record_key(rec.msgid, rec.msgctxt) == current_key:
+                current.unique_id = rec.unique_id
+                break
+
     def _clear_all_panes(self):
         from pref.tran_history.tran_db_record import DatabasePORecord
         win = self.window
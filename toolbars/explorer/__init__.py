@@ -1,6 +1,6 @@
 # toolbars/explorer/__init__.py
 
-from .toolbar_explorer_model import HighlightingFileSystemModel
+from .toolbar_explorer_model import HighlightingFileSystemModel, POFilesProxyModel
 from .toolbar_explorer_panel import ExplorerPanel
 
-__all__ = ["HighlightingFileSystemModel", "ExplorerPanel"]
+__all__ = ["HighlightingFileSystemModel", "POFilesProxyModel", "ExplorerPanel"]
@@ -3,7 +3,7 @@
 import os
 from PySide6.QtWidgets import QFileSystemModel
 from PySide6.QtGui      import QBrush, QColor
-from PySide6.QtCore     import Qt
+from PySide6.QtCore     import Qt, QSortFilterProxyModel
 
 class HighlightingFileSystemModel(QFileSystemModel):
     """Extends QFileSystemModel to give .po files a special background."""
@@ -13,3 +13,63 @@ class HighlightingFileSystemModel(QFileSystemModel):
             if os.path.isfile(path) and path.lower().endswith(".po"):
                 return QBrush(QColor("#fff2b8"))  # light yellow
         return super().data(index, role)
+
+
+class POFilesProxyModel(QSortFilterProxyModel):
+    """
+    Filters a QFileSystemModel down to the .po files under a root, and the
+    folders leading to them, by a listing from the root's file catalogue
+    (see search.file_catalog). Filtering is off until enabled; sorting is
+    left to the file system model, which keeps folders first.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._enabled = False
+        self._prefix = ""  # the root and a separator; empty until listed
+        self._files: set[str] = set()
+        self._dirs: set[str] = set()
+
+    def set_enabled(self, enabled: bool):
+        self._filter_changing()
+        self._enabled = enabled
+        self._filter_changed()
+
+    def set_listing(self, root: str, files: list[str]):
+        """The .po files under `root` (absolute paths)."""
+        if self._enabled:
+            self._filter_changing()
+        self._prefix = os.path.join(os.path.normcase(os.path.abspath(root)), "")
+        self._files = {os.path.normcase(f) for f in files}
+        self._dirs = set()
+        for f in self._files:
+            d = os.path.dirname(f)
+            while d not in self._dirs and d.startswith(self._prefix):
+                self._dirs.add(d)
+                d = os.path.dirname(d)
+        if self._enabled:
+            self._filter_changed()
+
+    def _filter_changing(self):
+        if hasattr(self, "beginFilterChange"):  # Qt 6.9+, which deprecates invalidateRowsFilter()
+            self.beginFilterChange()
+
+    def _filter_changed(self):
+        if hasattr(self, "endFilterChange"):
+            self.endFilterChange(QSortFilterProxyModel.Direction.Rows)
+        else:
+            self.invalidateRowsFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._enabled or not self._prefix:
+            return True
+        model = self.sourceModel()
+        index = model.index(source_row, 0, source_parent)
+        path = os.path.normcase(os.path.abspath(model.filePath(index)))
+        if not path.startswith(self._prefix):
+            return True  # the root itself and its ancestors
+        if model.isDir(index):
+            return path in self._dirs
+        return path in self._files
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
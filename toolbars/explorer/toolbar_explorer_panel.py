@@ -5,9 +5,38 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QToolButton,
     QFileDialog, QTreeView, QSizePolicy, QFileSystemModel, QHeaderView
 )
-from PySide6.QtCore    import Qt, QDir, QSettings
+from PySide6.QtCore    import Qt, QDir, QSettings, QObject, QRunnable, QThreadPool, QTimer, Signal
 
 from gv import main_gv  # your global vars holder
+from lg import logger
+from main_utils.safe_emit import safe_emit_signal
+from search.file_catalog import catalog_for
+from .toolbar_explorer_model import POFilesProxyModel
+
+# Changes in the view are collected this long (ms) before the .po files are listed again
+RELIST_DELAY = 300
+
+
+class _ListingSignals(QObject):
+    listed = Signal(str, list)  # root, its .po files
+
+
+class _ListPOFiles(QRunnable):
+    """Loads and watches the file catalogue of a root off the GUI thread, and lists its .po files."""
+
+    def __init__(self, root: str, signals: _ListingSignals):
+        super().__init__()
+        self.root = root
+        self.signals = signals
+
+    def run(self):
+        try:
+            files = catalog_for(self.root, watch=True).files(["*.po"], under=self.root)
+        except OSError as e:
+            logger.warning("Could not list the .po files under %s: %s", self.root, e)
+            return
+        safe_emit_signal(self.signals.listed, self.root, files)  # the panel may be gone
+
 
 class ExplorerPanel(QWidget):
     """
@@ -31,19 +60,37 @@ class ExplorerPanel(QWidget):
         self.browse_btn.setToolTip("Browse for folder")
         self.browse_btn.clicked.connect(self._on_browse)
 
+        self.po_only_btn = QToolButton(self)
+        self.po_only_btn.setText(".po")
+        self.po_only_btn.setCheckable(True)
+        self.po_only_btn.setToolTip("Show only .po files and the folders holding them")
+
         top = QWidget(self)
         top_l = QHBoxLayout(top)
         top_l.setContentsMargins(0, 0, 0, 0)
         top_l.setSpacing(4)
         top_l.addWidget(self.path_edit)
+        top_l.addWidget(self.po_only_btn)
         top_l.addWidget(self.browse_btn)
 
         # ── Bottom: file-system view ────────────────────────────
         self.fs_model = QFileSystemModel(self)
         self.fs_model.setFilter(QDir.AllEntries | QDir.NoDotAndDotDot | QDir.AllDirs)
 
+        # the .po listing comes from the file catalogue the Find panel searches
+        self.po_filter = POFilesProxyModel(self)
+        self.po_filter.setSourceModel(self.fs_model)
+        self._listing = _ListingSignals(self)
+        self._listing.listed.connect(self._on_po_files_listed)
+        self._relist_timer = QTimer(self)
+        self._relist_timer.setSingleShot(True)
+        self._relist_timer.setInterval(RELIST_DELAY)
+        self._relist_timer.timeout.connect(self._list_po_files)
+        self.fs_model.rowsInserted.connect(self._relist_timer.start)
+        self.fs_model.rowsRemoved.connect(self._relist_timer.start)
+
         self.view = QTreeView(self)
-        self.view.setModel(self.fs_model)
+        self.view.setModel(self.po_filter)
         self.view.setHeaderHidden(False)
         self.view.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.view.doubleClicked.connect(self._on_double_click)
@@ -69,7 +116,11 @@ class ExplorerPanel(QWidget):
         # ── Initialize to last‐used dir or HOME ─────────────────
         settings = QSettings("com.poeditor", "POEditor")
         last = settings.value("lastDirectory", QDir.homePath())
+        self._root = ""
         self._set_directory(last)
+        self.po_only_btn.setChecked(settings.value("explorerPoOnly", False, type=bool))
+        self.po_only_btn.toggled.connect(self._on_po_only_toggled)
+        self._on_po_only_toggled(self.po_only_btn.isChecked())
         # allow this panel to grow & shrink in the splitter
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 
@@ -113,14 +164,29 @@ class ExplorerPanel(QWidget):
         self.path_edit.setText(path)
         # 2) Update tree view root
         idx = self.fs_model.setRootPath(path)
-        self.view.setRootIndex(idx)
+        self.view.setRootIndex(self.po_filter.mapFromSource(idx))
         # 3) Update global and settings
         main_gv.current_dir = path
         QSettings("com.poeditor", "POEditor").setValue("lastDirectory", path)
+        # 4) List its .po files from the file catalogue, off the GUI thread
+        self._root = path
+        self._list_po_files()
         # **DO NOT** call on_open_path here any more.
 
+    def _list_po_files(self):
+        if self._root:
+            QThreadPool.globalInstance().start(_ListPOFiles(self._root, self._listing))
+
+    def _on_po_files_listed(self, root: str, files: list):
+        if root == self._root:  # else the directory changed meanwhile
+            self.po_filter.set_listing(root, files)
+
+    def _on_po_only_toggled(self, checked: bool):
+        self.po_filter.set_enabled(checked)
+        QSettings("com.poeditor", "POEditor").setValue("explorerPoOnly", checked)
+
     def _on_double_click(self, idx):
-        path = self.fs_model.filePath(idx)
+        path = self.fs_model.filePath(self.po_filter.mapToSource(idx))
         if os.path.isdir(path):
             self._set_directory(path)
         else:
@@ -5,13 +5,14 @@ High-performance CLI search utility with optional regex, progress bar, and exter
 
 Processing Steps:
 1. **Collect Files**: Walk `root_path`, skip excluded dirs, apply optional glob filters.
-2. **Parallel Search**: Spawn worker processes to search each file (literal or regex).
+2. **Parallel Search**: Search files in chunks on a long-lived worker pool (literal or regex).
 3. **Map Matches**: Calculate line/column and preview snippet for each match.
 4. **Output/Open**: Print matches or open in VS Code/Chrome with highlighting.
 
 Usage:
     fast_search.py <root_path> <keyword> [--glob GLOBS] [--regex] [--ignore-case]
-                   [--context N] [--open] [--progress]
+                   [--whole-word] [--context N] [--open] [--progress] [--also KEYWORD ...]
+                   [--no-index]
 
 example:
     python3 fast_search_open_ext_editor.py
@@ -28,12 +29,9 @@ Environment:
     REPLACE_PART points to 'manual-old/manual' within that tree.
 """
 import os
-import pickle
 import mmap
-import multiprocessing
 import fnmatch
 import argparse
-import re
 import subprocess
 import urllib.parse
 from pathlib import Path
@@ -41,9 +39,15 @@ from pathlib import Path
 import pyperclip
 from tqdm import tqdm
 
-# --- Configuration Constants ---
-CACHE_FILE = Path.home() / '.fast_search_file_list.pkl'
+from search.line_index import line_index_for
+from search.trigram_index import narrow_files, po_query
+from search.query import SearchQuery, query_matches
+from search.po_search import search_po_file
+from search.po_replace import ReplaceSpec, plan_replacement
+from search.file_catalog import catalog_for
+from search.search_executor import CancelToken, search_executor
 
+# --- Configuration Constants ---
 EXCLUDED_DIRS = {'.git', 'node_modules', '__pycache__', '.venv'}
 BLENDER_WEB_ROOT = os.getenv('BLENDER_WEB_ROOT', '')
 REPLACE_PART = 'manual-old/manual'
@@ -56,11 +60,17 @@ class SearchRequest:
         root_path (str): Directory to search.
         keyword (str): Search term or regex.
         glob_patterns (list[str]|None): File patterns to include.
-        use_regex (bool): Regex mode flag.
-        ignore_case (bool): Case-insensitive for regex.
+        use_regex (bool): Keywords are regular expressions.
+        ignore_case (bool): Unicode case-insensitive matching.
+        whole_word (bool): Only matches not touching a word character.
         context (int): Preview characters around match.
         open_results (bool): Open matches externally.
         show_progress (bool): Display progress bar.
+        keywords (list[str]): keyword plus extra_keywords.
+        query (SearchQuery): The compiled-on-demand query the workers run.
+        use_index (bool): Narrow files with the trigram index first.
+        po_fields (list[str]|None): Search these PO scopes (search.po_search.PO_FIELDS)
+            of parsed entries instead of raw text; hits are POSearchHits.
     """
     def __init__(
         self,
@@ -72,12 +82,23 @@ class SearchRequest:
         context: int = 40,
         open_results: bool = False,
         show_progress: bool = False,
+        extra_keywords: list[str] = None,
+        use_index: bool = True,
+        po_fields: list[str] = None,
+        whole_word: bool = False,
     ):
         self.root_path = root_path
         self.keyword = keyword
+        # any of these matches, found in one pass per file
+        self.keywords = [keyword] + list(extra_keywords or [])
+        self.use_index = use_index
+        self.po_fields = list(po_fields) if po_fields else None
         self.glob_patterns = [g.strip() for g in glob.split(',')] if glob else None
         self.use_regex = use_regex
         self.ignore_case = ignore_case
+        self.whole_word = whole_word
+        self.query = SearchQuery(tuple(self.keywords), regex=use_regex,
+                                 ignore_case=ignore_case, whole_word=whole_word)
         self.context = context
         self.open_results = open_results
         self.show_progress = show_progress
@@ -104,47 +125,11 @@ def should_skip_dir(dirpath: str) -> bool:
     """Skip VCS and virtual env directories."""
     return any(part in EXCLUDED_DIRS for part in Path(dirpath).parts)
 
-# --- Boyer–Moore (Literal) ---
-
-def build_skip_table(pattern: bytes) -> dict:
-    """Bad-character skip table for Boyer–Moore."""
-    skip = {}
-    plen = len(pattern)
-    for i in range(plen - 1):
-        skip[pattern[i]] = plen - i - 1
-    return skip
-
-
-def boyer_moore_search_mmap(mm: mmap.mmap, pattern: bytes) -> list[int]:
-    """Return byte offsets of literal pattern occurrences."""
-    skip = build_skip_table(pattern)
-    matches, i, plen, tlen = [], 0, len(pattern), len(mm)
-    while i <= tlen - plen:
-        j = plen - 1
-        while j >= 0 and mm[i + j] == pattern[j]:
-            j -= 1
-        if j < 0:
-            matches.append(i)
-            i += plen
-        else:
-            i += skip.get(mm[i + plen - 1], plen)
-    return matches
-
 # --- Shared Helpers ---
 
-def calculate_line_and_column(mm: mmap.mmap, positions: list[int]) -> list[tuple[int,int]]:
-    """Convert byte offsets to (line, column)."""
-    data = mm[:]
-    offsets, curr = [], 0
-    for line in data.split(b'\n'):
-        offsets.append(curr)
-        curr += len(line) + 1
-    result = []
-    for pos in positions:
-        ln = next((i for i, off in enumerate(offsets) if off > pos), len(offsets))
-        start = offsets[ln-1] if ln > 0 else 0
-        result.append((ln + 1, pos - start))  # 1-based line
-    return result
+def calculate_line_and_column(mm: mmap.mmap, positions: list[int], filepath: str = None) -> list[tuple[int,int]]:
+    """Convert byte offsets to (1-based line, column); the line index is cached per file."""
+    return line_index_for(mm, filepath).line_cols(positions)
 
 
 def extract_preview(mm: mmap.mmap, pos: int, length: int, context: int) -> str:
@@ -157,24 +142,10 @@ def extract_preview(mm: mmap.mmap, pos: int, length: int, context: int) -> str:
 
 def load_or_build_file_list(root: str, glob_patterns: list[str]|None) -> list[str]:
     """
-    Load a cached file list if available; otherwise rebuild and cache it.
+    Files under `root` from the shared file catalogue (see search.file_catalog):
+    walked once, then kept current by filesystem events or mtime validation.
     """
-    try:
-        if CACHE_FILE.exists():
-            with open(CACHE_FILE, 'rb') as f:
-                data = pickle.load(f)
-            if data.get('root') == root and data.get('globs') == glob_patterns:
-                return data.get('files', [])
-    except Exception:
-        pass
-    # Rebuild file list
-    files = find_all_files(root, glob_patterns)
-    try:
-        with open(CACHE_FILE, 'wb') as f:
-            pickle.dump({'root': root, 'globs': glob_patterns, 'files': files}, f)
-    except Exception:
-        pass
-    return files
+    return catalog_for(root).files(glob_patterns, under=root)
 
 # --- File Discovery ---
 
@@ -215,46 +186,33 @@ def is_within_html_tag(data: bytes, pos: int) -> bool:
     return last_open > last_close
 
 
-def regex_search_in_file(filepath: str, pattern: str, ignore_case: bool, context: int) -> list[SearchResult]:
-    """Regex search: flexible whitespace, optional case insensitivity."""
-    flags = re.IGNORECASE if ignore_case else 0
-    regex = re.compile(re.escape(pattern).replace(r"\\ ", r"\\s+"), flags)
+def search_in_file(filepath: str, query: SearchQuery, context: int) -> list[SearchResult]:
+    """All matches of `query` in one file; case, whole-word and regex are applied here, in the worker."""
     try:
-        text = open(filepath, encoding='utf-8', errors='ignore').read()
-    except:
-        return []
-    matches = [(m.start(), m.end()-m.start()) for m in regex.finditer(text)]
-    if not matches:
+        with open(filepath, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):  # unreadable, or empty (mmap refuses size 0)
         return []
-    with open(filepath, 'rb') as f:
-        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
-    results = []
-    for pos, length in matches:
-        for ln, col in calculate_line_and_column(mm, [pos]):
+    with mm:
+        matches = query_matches(mm, query)
+        if not matches:
+            return []
+        results = []
+        positions = [pos for pos, _ in matches]
+        for (pos, length), (ln, col) in zip(matches, calculate_line_and_column(mm, positions, filepath)):
             preview = extract_preview(mm, pos, length, context)
             results.append(SearchResult(filepath, ln, col, preview))
-    mm.close()
     return results
 
 
-def literal_search_in_file(filepath: str, keyword: str, context: int) -> list[SearchResult]:
-    """Literal search using Boyer–Moore algorithm."""
-    kb = keyword.encode('utf-8')
-    try:
-        with open(filepath, 'rb') as f:
-            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
-            positions = boyer_moore_search_mmap(mm, kb)
-    except:
-        return []
-    if not positions:
-        mm.close()
-        return []
-    results = []
-    for pos, (ln, col) in zip(positions, calculate_line_and_column(mm, positions)):
-        preview = extract_preview(mm, pos, len(kb), context)
-        results.append(SearchResult(filepath, ln, col, preview))
-    mm.close()
-    return results
+def regex_search_in_file(filepath: str, pattern: str, ignore_case: bool, context: int) -> list[SearchResult]:
+    """Regular-expression search, optionally case-insensitive."""
+    return search_in_file(filepath, SearchQuery((pattern,), regex=True, ignore_case=ignore_case), context)
+
+
+def literal_search_in_file(filepath: str, keywords: list[str], context: int) -> list[SearchResult]:
+    """Literal search for one or more keywords with a C-backed matcher (see search.matchers)."""
+    return search_in_file(filepath, SearchQuery(tuple(keywords)), context)
 
 # --- External Viewer ---
 
@@ -284,26 +242,75 @@ def open_in_editor(result: SearchResult, keyword: str):
 
 # --- Worker & Parallel Search ---
 
-def _worker(arg):
+def _trigram_query(req: SearchRequest):
+    """Trigrams every matching file must contain (see search.trigram_index)."""
+    query = req.query.trigram_query()
+    # PO mode matches decoded text, which the file may wrap or escape
+    return po_query(query) if req.po_fields else query
+
+
+def _worker(filepath: str, req: SearchRequest):
     """Select appropriate search function."""
-    filepath, req = arg
-    if req.use_regex:
-        return regex_search_in_file(filepath, req.keyword, req.ignore_case, req.context)
-    return literal_search_in_file(filepath, req.keyword, req.context)
+    if req.po_fields:
+        return search_po_file(filepath, req.query.pattern, req.po_fields, req.context)
+    return search_in_file(filepath, req.query, req.context)
+
+
+def _request_files(req: SearchRequest) -> list[str]:
+    """Files the request can match in, narrowed by the trigram index if enabled."""
+    # watched from the first search on, so later ones list (and stat) without I/O
+    catalog = catalog_for(req.root_path, watch=True)
+    files = catalog.files(req.glob_patterns, under=req.root_path)
+    if req.use_index:
+        # a watched catalogue's stats are current, so the index needn't stat every file
+        files = narrow_files(files, _trigram_query(req), stat=catalog.stat if catalog.watching else None)
+    return files
+
+
+def _iter_pool(fn, files: list[str], arg, token: CancelToken = None):
+    done = 0
+    yield done, len(files), []
+    for count, res in search_executor().map_chunks(fn, files, arg, token=token):
+        done += count
+        yield done, len(files), res
+
+
+def iter_search(req: SearchRequest, token: CancelToken = None):
+    """
+    Search on the shared worker pool, yielding (files done, files total,
+    results) as each chunk of files finishes. Stops early if `token` is
+    cancelled.
+    """
+    return _iter_pool(_worker, _request_files(req), req, token)
 
 
-def parallel_search(req: SearchRequest) -> list[SearchResult]:
-    """Run search over files in parallel, optionally with progress and opening."""
-    files = find_all_files(req.root_path, req.glob_patterns)
-    args = [(f, req) for f in files]
+def iter_replace(req: SearchRequest, spec: ReplaceSpec, token: CancelToken = None):
+    """
+    Plan `spec` in every file `req` matches (its po_fields should be
+    spec.fields), yielding (files done, files total, FileReplacements)
+    like iter_search. Nothing is written until the plan is applied.
+    """
+    return _iter_pool(plan_replacement, _request_files(req), spec, token)
+
+
+def parallel_search(req: SearchRequest, token: CancelToken = None) -> list[SearchResult]:
+    """
+    Run search over files on the shared worker pool, optionally with
+    progress and opening. Returns what was found so far if `token` is
+    cancelled.
+    """
     results = []
-    with multiprocessing.Pool() as pool:
-        iterator = pool.imap_unordered(_worker, args)
+    progress = None
+    for done, total, res in iter_search(req, token):
+        results.extend(res)
         if req.show_progress:
-            iterator = tqdm(iterator, total=len(args), desc="Searching", unit="file")
-        for res in iterator:
-            results.extend(res)
-    if req.open_results:
+            if progress is None:
+                progress = tqdm(total=total, desc="Searching", unit="file")
+            progress.n = done
+            progress.refresh()
+    if progress is not None:
+        progress.close()
+    if req.open_results and not (token and token.cancelled):
         for r in results:
             open_in_editor(r, req.keyword)
     return results
@@ -326,10 +333,14 @@ def main():
     parser.add_argument('keyword', help='Search term or pattern')
     parser.add_argument('--glob', default=None, help='Comma-separated globs')
     parser.add_argument('--regex', action='store_true', help='Use regex')
-    parser.add_argument('--ignore-case', action='store_true', help='Regex ignore case')
+    parser.add_argument('--ignore-case', action='store_true', help='Case-insensitive (Unicode)')
+    parser.add_argument('--whole-word', action='store_true', help='Only whole-word matches')
     parser.add_argument('--context', type=int, default=40, help='Preview chars')
     parser.add_argument('--open', action='store_true', help='Open matches')
     parser.add_argument('--progress', action='store_true', help='Show progress')
+    parser.add_argument('--also', action='append', default=[], metavar='KEYWORD',
+                        help='Extra keyword searched in the same pass (repeatable)')
+    parser.add_argument('--no-index', action='store_true', help='Scan every file, skip the trigram index')
     args = parser.parse_args()
 
     copy_to_clipboard(args.keyword)
@@ -339,9 +350,12 @@ def main():
         glob=args.glob,
         use_regex=args.regex,
         ignore_case=args.ignore_case,
+        whole_word=args.whole_word,
         context=args.context,
         open_results=args.open,
-        show_progress=args.progress
+        show_progress=args.progress,
+        extra_keywords=args.also,
+        use_index=not args.no_index,
     )
     matches = parallel_search(req)
     # Summary: total matches and number of files
@@ -1,39 +1,94 @@
 # toolbars/search/toolbar_search_replace_actions.py
 
 import os
-from PySide6.QtWidgets import QMessageBox, QTextEdit
+from PySide6.QtWidgets import QDialog, QMessageBox, QTextEdit
 from PySide6.QtCore    import Qt
 from po_editor.po_editor_main_gui import POEditorWindow
 
-from .fast_search import (
-    SearchRequest,
-    parallel_search,
+from .fast_search import SearchRequest, iter_replace
+from .toolbar_search_session import SearchSession, SearchResultModel
+from .toolbar_search_replace_preview import ReplacePreviewDialog
+from search.po_search import PO_FIELDS, POSearchHit, search_po_file
+from search.po_replace import (
+    DEFAULT_REPLACE_FIELDS, ReplaceConflict, ReplaceRollbackError, ReplaceSpec, apply_replacements,
+    discard_replacements, discard_undo, plan_replacement, undo_replacements,
 )
+from main_utils.po_lazy_file import load_po
+from main_utils.po_table_proxy import POTableProxyModel
 from gv import main_gv
 
-def get_search_actions(window, find_widget, editor_manager, get_root_path):
+
+def _select_entry(editor, hit: POSearchHit):
+    """Select the hit's entry in a PO editor's table, once the file is loaded into it."""
+    model = getattr(editor, "table_model", None)
+    if model is None:
+        return
+
+    def select():
+        entries = model.entries()
+        row = hit.entry_index
+        if not (0 <= row < len(entries) and entries[row].linenum == hit.line):
+            # entries were added or removed since: find it by its first line
+            row = next((i for i, e in enumerate(entries) if e.linenum == hit.line), -1)
+        # the table may be sorted: show the catalog row where the view has it
+        view_model = editor.table.model()
+        if isinstance(view_model, POTableProxyModel):
+            row = view_model.proxy_row(row)
+        if row >= 0:
+            editor.table.selectRow(row)
+            editor.table.scrollTo(view_model.index(row, 0))
+
+    def on_loaded():
+        model.modelReset.disconnect(on_loaded)
+        select()
+
+    if model.rowCount():
+        select()
+    else:
+        model.modelReset.connect(on_loaded)
+
+
+def get_search_actions(window, find_widget, editor_manager, get_root_path, results_model=None,
+                       get_po_fields=None):
     """
     window           - your QMainWindow
     find_widget      - instance of ToggleFindReplace
     editor_manager   - instance of EditorTabManager
     get_root_path()  - a callable returning current directory (e.g. main_gv.current_dir)
+    results_model    - SearchResultModel shown by the panel (a private one if None)
+    get_po_fields()  - a callable returning the checked PO scopes (plain text search if empty)
     """
-    # to store last results and current index:
+    model = results_model if results_model is not None else SearchResultModel(window)
+    # running search session, request of the listed results, current result
+    # index and the last applied replace (for undo):
     state = {
-        "results": [],
-        "current": 0
+        "session": None,
+        "request": None,
+        "current": 0,
+        "undo": None,
     }
 
     def on_toggle(show_replace: bool):
         # simply forward to the widget’s toggle logic
         find_widget._on_toggle(show_replace)
 
-    def on_find():
+    def _set_status(text: str):
+        find_widget.lbl_find_result.setText(text)
+        find_widget.lbl_find_result.adjustSize()
+
+    def _cancel_search():
+        session = state["session"]
+        if session is not None:
+            session.cancel()
+            state["session"] = None
+
+    def _request(title: str, po_fields):
+        """SearchRequest for the panel's query, or None (after telling the user) if it's unusable."""
         root = get_root_path() or os.path.expanduser("~")
         keyword = find_widget.find_edit.text().strip()
         if not keyword:
-            QMessageBox.information(window, "Find", "Please enter a search term.")
-            return
+            QMessageBox.information(window, title, "Please enter a search term.")
+            return None
 
         # record in history if new
         hist = main_gv.find_pattern_list or []
@@ -42,9 +97,9 @@ def get_search_actions(window, find_widget, editor_manager, get_root_path):
             main_gv.find_pattern_list = hist
 
         # collect flags
-        use_regex   = find_widget.flag_regex.isChecked()
-        match_case  = find_widget.flag_match_case.isChecked()
-        whole_word  = find_widget.flag_whole_word.isChecked()
+        use_regex   = find_widget.find_edit.flag_regex.isChecked()
+        match_case  = find_widget.find_edit.flag_match_case.isChecked()
+        whole_word  = find_widget.find_edit.flag_whole_word.isChecked()
         ignore_case = not match_case
 
         # assemble and run the search request, but only on .po files
@@ -54,24 +109,75 @@ def get_search_actions(window, find_widget, editor_manager, get_root_path):
             glob="*.po",  # ← limit to PO files
             use_regex=use_regex,
             ignore_case=ignore_case,
+            whole_word=whole_word,
             context=40,
             open_results=False,
             show_progress=False,
+            po_fields=po_fields,
         )
-        # you could incorporate whole_word by post-filtering matches if needed
+        try:
+            req.query.pattern  # compile once here, so a bad regex is reported before searching
+        except ValueError as e:
+            QMessageBox.warning(window, title, str(e))
+            return None
+        return req
+
+    def on_find():
+        req = _request("Find", get_po_fields() if get_po_fields else None)
+        if req is None:
+            return
 
-        results = parallel_search(req)
-        state["results"] = results
+        # a new search supersedes the running one; results stream in as files finish
+        _cancel_search()
+        model.clear()
         state["current"] = 0
+        state["request"] = req
+        session = SearchSession(req, window)
+        state["session"] = session
+
+        def on_batch(batch):
+            if session is not state["session"]:
+                return  # queued from a superseded search
+            first = model.rowCount() == 0
+            model.append_results(batch)
+            if first:
+                _show_result(0)
+
+        def on_progress(done, total):
+            if session is state["session"]:
+                _set_status(f"{model.rowCount()} results ({done}/{total} files)")
+
+        def on_finished(cancelled):
+            if session is state["session"]:
+                state["session"] = None
+                _set_status(f"{model.rowCount()} results")
+            session.deleteLater()
+
+        def on_failed(message):
+            if session is state["session"]:
+                QMessageBox.warning(window, "Find", f"Search failed:\n{message}")
 
-        # update UI
-        find_widget.lbl_find_result.setText(f"{len(results)} results")
-        if results:
-            _show_result(0)
+        session.resultsReady.connect(on_batch)
+        session.progress.connect(on_progress)
+        session.finished.connect(on_finished)
+        session.failed.connect(on_failed)
+        _set_status("Searching…")
+        session.start()
+
+    def on_query_edited(_text: str = ""):
+        """The query changed: results of the running search are stale."""
+        if state["session"] is not None:
+            _cancel_search()
+            _set_status(f"{model.rowCount()} results (stopped)")
+
+    def on_result_activated(index):
+        if index.isValid():
+            state["current"] = index.row()
+            _show_result(index.row())
 
     def _show_result(idx: int):
         """Helper to open/navigate to result #idx."""
-        res = state["results"][idx]
+        res = model.result(idx)
         # for .po, use your POEditorWindow, else a plain text viewer
         ext = os.path.splitext(res.filepath)[1].lower()
         if ext == ".po":
@@ -84,6 +190,10 @@ def get_search_actions(window, find_widget, editor_manager, get_root_path):
             except Exception as e:
                 editor.setPlainText(f"Could not load:\n{e}")
         editor_manager.add_tab(editor, res.filepath)
+        if isinstance(res, POSearchHit):
+            # PO-aware hits know their entry: jump to its table row
+            _select_entry(editor, res)
+            return
         # move cursor to line/column:
         try:
             cursor = editor.textCursor()
@@ -98,47 +208,199 @@ def get_search_actions(window, find_widget, editor_manager, get_root_path):
             pass
 
     def on_next_found():
-        if not state["results"]:
+        if not model.rowCount():
             return
-        state["current"] = (state["current"] + 1) % len(state["results"])
+        state["current"] = (state["current"] + 1) % model.rowCount()
         _show_result(state["current"])
 
     def on_prev_found():
-        if not state["results"]:
+        if not model.rowCount():
             return
-        state["current"] = (state["current"] - 1) % len(state["results"])
+        state["current"] = (state["current"] - 1) % model.rowCount()
         _show_result(state["current"])
 
     def on_close():
-        # clear state and reset UI
-        state["results"].clear()
+        # stop any running search, clear state and reset UI
+        _cancel_search()
+        model.clear()
         state["current"] = 0
         find_widget.lbl_find_result.setText("No results")
         # optionally close the panel
         find_widget._on_toggle(False)
 
-    def on_replace_current():
-        # record in history if new
-        pat = find_widget.replace_edit.text().strip()
+    def _replacement() -> str:
+        """The replace text; recorded in history if new."""
+        text = find_widget.replace_edit.text()
+        pat = text.strip()
         if pat:
             rh = main_gv.replace_pattern_list or []
             if pat not in rh:
                 rh.append(pat)
                 main_gv.replace_pattern_list = rh
+        return text
 
-        # now perform your replace‐current logic…
-        QMessageBox.information(window, "Replace", "Replace Current not yet implemented.")
+    def _reload_open_editors(paths):
+        """Reload the tables of open editors showing any of `paths`."""
+        changed = {os.path.abspath(p) for p in paths}
+        for tab in editor_manager.tabs:
+            table_model = getattr(tab.widget, "table_model", None)
+            if table_model is None or os.path.abspath(tab.path) not in changed:
+                continue
+            try:
+                table_model.setEntries(load_po(tab.path, cache=True))
+            except Exception:
+                pass
+
+    def _apply(edits, title: str) -> bool:
+        """Write planned replacements; the previous replace can no longer be undone."""
+        try:
+            undo = apply_replacements(edits)
+        except ReplaceConflict as e:
+            QMessageBox.warning(window, title, f"Nothing was replaced.\n{e}")
+            return False
+        except ReplaceRollbackError as e:
+            QMessageBox.critical(window, title, f"Replace failed, and could not be rolled back:\n{e}")
+            _reload_open_editors([path for path, _ in e.failed])
+            return False
+        except OSError as e:
+            QMessageBox.warning(window, title, f"Replace failed, nothing was changed:\n{e}")
+            return False
+        if state["undo"] is not None:
+            discard_undo(state["undo"])
+        state["undo"] = undo
+        find_widget.btn_undo_replace.setEnabled(True)
+        _reload_open_editors(undo.paths)
+        return True
+
+    def on_replace_current():
+        replacement = _replacement()
+        req = state["request"]
+        if req is None or not model.rowCount():
+            QMessageBox.information(window, "Replace", "Find something to replace first.")
+            return
+        idx = min(state["current"], model.rowCount() - 1)
+        hit = model.result(idx)
+        if not isinstance(hit, POSearchHit):
+            QMessageBox.information(
+                window, "Replace",
+                "Replace Current needs a PO-scoped search (id/str/ctx/#) to locate the match "
+                "in its entry. Use Replace All for a plain search.")
+            return
+
+        spec = ReplaceSpec(
+            req.query, replacement, PO_FIELDS,
+            preserve_case=find_widget.replace_edit.flag_preserve_case.isChecked(),
+            target=(hit.entry_index, hit.field, hit.start, hit.end),
+        )
+        try:
+            edits = plan_replacement(hit.filepath, spec)
+        except ValueError as e:
+            QMessageBox.warning(window, "Replace", str(e))
+            return
+        if not edits:
+            QMessageBox.information(window, "Replace", "The match has changed since the search; run Find again.")
+            return
+        if not _apply(edits, "Replace"):
+            return
+
+        # re-search the edited file; the current index then points at the next match
+        before = sum(1 for r in model.results()[:idx] if r.filepath == hit.filepath)
+        hits = search_po_file(hit.filepath, req.query.pattern, req.po_fields, req.context)
+        first = model.replace_file_results(hit.filepath, hits)
+        state["current"] = min(first + before, max(model.rowCount() - 1, 0))
+        _set_status(f"Replaced 1, {model.rowCount()} results")
 
     def on_replace_all():
-        # stub: you’ll need to integrate your replace-all logic here
-        QMessageBox.information(window, "Replace", "Replace All not yet implemented.")
+        replacement = _replacement()
+        fields = tuple(get_po_fields() or ()) if get_po_fields else ()
+        fields = fields or DEFAULT_REPLACE_FIELDS
+        req = _request("Replace", fields)
+        if req is None:
+            return
+        spec = ReplaceSpec(
+            req.query, replacement, fields,
+            preserve_case=find_widget.replace_edit.flag_preserve_case.isChecked(),
+        )
+
+        # plan in the worker pool: each file is rewritten into a temporary file,
+        # nothing is replaced until the preview is accepted
+        _cancel_search()
+        edits, errors = [], []
+        session = SearchSession(req, window, run=lambda r, token: iter_replace(r, spec, token))
+        state["session"] = session
+
+        def on_progress(done, total):
+            if session is state["session"]:
+                _set_status(f"Preparing replace ({done}/{total} files)")
+
+        def on_finished(cancelled):
+            if session is state["session"]:
+                state["session"] = None
+            session.deleteLater()
+            if cancelled or errors:
+                discard_replacements(edits)
+                if errors:
+                    QMessageBox.warning(window, "Replace", f"Replace failed:\n{errors[0]}")
+                _set_status("Replace cancelled")
+                return
+            if not edits:
+                _set_status("Nothing to replace")
+                return
+            dlg = ReplacePreviewDialog(edits, fields, window)
+            if dlg.exec() != QDialog.Accepted:
+                discard_replacements(edits)
+                _set_status("Replace cancelled")
+                return
+            if _apply(edits, "Replace All"):
+                # the listed results no longer match the files
+                model.clear()
+                state["current"] = 0
+                state["request"] = None
+                count = sum(e.count for e in edits)
+                _set_status(f"Replaced {count} in {len(edits)} files")
+
+        session.resultsReady.connect(edits.extend)
+        session.progress.connect(on_progress)
+        session.finished.connect(on_finished)
+        session.failed.connect(errors.append)
+        _set_status("Preparing replace…")
+        session.start()
+
+    def on_undo_replace():
+        undo = state["undo"]
+        if undo is None:
+            return
+        state["undo"] = None
+        find_widget.btn_undo_replace.setEnabled(False)
+        restored, skipped, failed = undo_replacements(undo)
+        _reload_open_editors(restored)
+        if skipped:
+            QMessageBox.warning(window, "Undo Replace",
+                                "Not restored, changed since the replace:\n" + "\n".join(skipped))
+        if failed:
+            QMessageBox.critical(window, "Undo Replace",
+                                 "Could not restore, the backups were kept:\n"
+                                 + "\n".join(f"{path} (backup: {backup})" for path, backup in failed))
+        _set_status(f"Restored {len(restored)} files")
+
+    def on_quit():
+        """Remove the backups kept for undo; the replace can't be undone after quitting."""
+        undo = state["undo"]
+        if undo is None:
+            return
+        state["undo"] = None
+        discard_undo(undo)
 
     return {
         "on_toggle":          on_toggle,
         "on_find":            on_find,
+        "on_query_edited":    on_query_edited,
+        "on_result_activated": on_result_activated,
         "on_next_found":      on_next_found,
         "on_prev_found":      on_prev_found,
         "on_close":           on_close,
         "on_replace_current": on_replace_current,
         "on_replace_all":     on_replace_all,
+        "on_undo_replace":    on_undo_replace,
+        "on_quit":            on_quit,
     }
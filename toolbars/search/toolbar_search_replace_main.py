@@ -2,7 +2,7 @@
 
 import os
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QHBoxLayout
+    QWidget, QVBoxLayout, QLabel, QHBoxLayout, QListView, QAbstractItemView, QToolButton
 )
 from PySide6.QtCore    import (
     Qt, QEvent,
@@ -12,12 +12,15 @@ from .toolbar_search_replace_symbol   import ButtonSymbol
 from .toolbar_search_replace_settings import load_include_exclude, save_include_exclude
 from .toolbar_search_replace_widget   import ToggleFindReplace
 from .toolbar_search_replace_flag_line_edit import FlagLineEdit
+from .toolbar_search_session          import SearchResultModel
 from gv import main_gv
 
 class FindReplaceMain(QWidget):
     """
     Top: ToggleFindReplace (find/replace + flags)
-    Bottom: two FlagLineEdits for 'Files to include' and 'Files to exclude'
+    Middle: two FlagLineEdits for 'Files to include' and 'Files to exclude',
+            then the PO scope toggles (msgid/msgstr/msgctxt/comments)
+    Bottom: results list, filled while the search runs
     """
 
     def __init__(self, parent=None):
@@ -53,12 +56,40 @@ class FindReplaceMain(QWidget):
         h.addWidget(self.include_edit)
         h.addWidget(self.exclude_edit)
 
+        # PO scopes: with any checked, .po entries are parsed and only those fields searched
+        scope_row = QHBoxLayout()
+        scope_row.setContentsMargins(0,0,0,0)
+        scope_row.setSpacing(4)
+        scope_row.addWidget(QLabel("in:", bottom))
+        self.scope_buttons = {}
+        for field, sym in (("msgid",    ButtonSymbol.SCOPE_MSGID),
+                           ("msgstr",   ButtonSymbol.SCOPE_MSGSTR),
+                           ("msgctxt",  ButtonSymbol.SCOPE_MSGCTXT),
+                           ("comments", ButtonSymbol.SCOPE_COMMENTS)):
+            btn = QToolButton(bottom)
+            btn.setText(sym.symbol)
+            btn.setToolTip(sym.tooltip)
+            btn.setCheckable(True)
+            scope_row.addWidget(btn)
+            self.scope_buttons[field] = btn
+            setattr(self, f"btn_{sym.name.lower()}", btn)
+        scope_row.addStretch(1)
+        h.addLayout(scope_row)
+
+        # ─── Results: virtual list, rows appended per batch ─────
+        self.results_model = SearchResultModel(self)
+        self.results_view = QListView(self)
+        self.results_view.setModel(self.results_model)
+        self.results_view.setUniformItemSizes(True)  # lets the view skip measuring every row
+        self.results_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+
         # ─── Layout ─────────────────────────────────────────────
         main_lay = QVBoxLayout(self)
         main_lay.setContentsMargins(0,0,0,0)
         main_lay.setSpacing(6)
         main_lay.addWidget(self.toggle_widget)
         main_lay.addWidget(bottom)
+        main_lay.addWidget(self.results_view, 1)
 
         # save initial include/exclude back to gv
         main_gv.include_flag_list = self.include_edit.text().split(",")
@@ -68,6 +99,10 @@ class FindReplaceMain(QWidget):
         self.include_edit.editingFinished.connect(self._save_include)
         self.exclude_edit.editingFinished.connect(self._save_exclude)
 
+    def po_fields(self) -> list[str]:
+        """Checked PO scopes; empty means plain text search."""
+        return [field for field, btn in self.scope_buttons.items() if btn.isChecked()]
+
     def _on_include_enter(self):
         val = self.include_edit.text().strip()
         if not val:
@@ -0,0 +1,38 @@
+# toolbars/search/toolbar_search_replace_preview.py
+
+from PySide6.QtGui import QFontDatabase
+from PySide6.QtWidgets import QDialog, QDialogButtonBox, QLabel, QPlainTextEdit, QVBoxLayout
+
+from search.po_replace import FileReplacement
+
+
+class ReplacePreviewDialog(QDialog):
+    """
+    Shows the unified diff of a planned Replace All; accepting it applies
+    the replacement.
+    """
+    def __init__(self, edits: list[FileReplacement], fields: tuple, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Replace All – Preview")
+        self.resize(900, 600)
+
+        count = sum(e.count for e in edits)
+        summary = QLabel(
+            f"{count} replacements in {len(edits)} files "
+            f"(in {', '.join(fields)}). Review the changes:", self)
+
+        diff_view = QPlainTextEdit(self)
+        diff_view.setReadOnly(True)
+        diff_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        diff_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        diff_view.setPlainText("\n".join(e.diff for e in sorted(edits, key=lambda e: e.filepath)))
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Cancel, self)
+        buttons.addButton("Replace All", QDialogButtonBox.AcceptRole)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(summary)
+        layout.addWidget(diff_view)
+        layout.addWidget(buttons)
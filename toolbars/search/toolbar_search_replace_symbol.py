@@ -16,9 +16,15 @@ class ButtonSymbol(Enum):
     CLOSE                     = ("❌",  "Close find/replace panel")
     REPLACE_CURRENT           = ("♦", "Replace current match")
     REPLACE_ALL               = ("♻", "Replace all matches")
+    UNDO_REPLACE              = ("↶", "Undo the last replace")
     # ── new buttons for main panel ───────────────────────────
     SEARCH_OPENED = ("⊞", "Search only in opened files")
     USE_SETTINGS = ("⚙", "Use excludes settings and ignore files")
+    # ── PO scopes: any checked switches to entry-aware search ─
+    SCOPE_MSGID   = ("id",  "Search msgid of PO entries")
+    SCOPE_MSGSTR  = ("str", "Search msgstr of PO entries")
+    SCOPE_MSGCTXT = ("ctx", "Search msgctxt of PO entries")
+    SCOPE_COMMENTS = ("#",  "Search comments of PO entries")
 
     def __init__(self, sym: str, tip: str):
         self.symbol  = sym
@@ -108,7 +108,8 @@ class ToggleFindReplace(QWidget):
 
         for sym in [
             ButtonSymbol.REPLACE_CURRENT,
-            ButtonSymbol.REPLACE_ALL
+            ButtonSymbol.REPLACE_ALL,
+            ButtonSymbol.UNDO_REPLACE
         ]:
             btn = QToolButton(self)
             ico = icon_from_text(sym.symbol)
@@ -119,6 +120,9 @@ class ToggleFindReplace(QWidget):
             replace_button_layout.addWidget(btn)
             setattr(self, f"btn_{sym.name.lower()}", btn)
 
+        # enabled once there is a replace to undo
+        self.btn_undo_replace.setEnabled(False)
+
         # insert that sub‐layout into the main replace_layout
         replace_layout.addLayout(replace_button_layout)
         replace_layout.addStretch(1)
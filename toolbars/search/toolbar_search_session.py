@@ -0,0 +1,130 @@
+# toolbars/search/toolbar_search_session.py
+
+import os
+import time
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, QAbstractListModel, QModelIndex, Qt
+
+from .fast_search import SearchRequest, SearchResult, iter_search
+from search.search_executor import CancelToken
+
+# Results are collected for this long before a batch is sent to the GUI thread
+BATCH_INTERVAL = 0.05
+
+
+class SearchSession(QObject):
+    """
+    One Find (or Replace planning) run, off the GUI thread.
+
+    The search itself runs on the shared worker pool (search.search_executor);
+    a QRunnable on the global QThreadPool collects the per-chunk results and
+    forwards them in batches, so the panel fills in while workers are busy.
+    cancel() (e.g. when the query is edited) stops it between chunks.
+    """
+    resultsReady = Signal(list)        # batch of SearchResult
+    progress     = Signal(int, int)    # files done, files total
+    finished     = Signal(bool)        # True if cancelled
+    failed       = Signal(str)
+
+    def __init__(self, request: SearchRequest, parent=None, run=iter_search):
+        super().__init__(parent)
+        self.request = request
+        # run(request, token) yields (done, total, results); e.g. iter_replace with its spec bound
+        self.runner = run
+        self.token = CancelToken()
+        self._task = None
+
+    def start(self):
+        self._task = _SearchTask(self)
+        QThreadPool.globalInstance().start(self._task)
+
+    def cancel(self):
+        self.token.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+
+class _SearchTask(QRunnable):
+    def __init__(self, session: SearchSession):
+        super().__init__()
+        self.session = session
+
+    def run(self):
+        session = self.session
+        batch, sent_at = [], time.monotonic()
+        try:
+            for done, total, results in session.runner(session.request, session.token):
+                batch.extend(results)
+                now = time.monotonic()
+                if done == total or now - sent_at >= BATCH_INTERVAL:
+                    if batch:
+                        session.resultsReady.emit(batch)
+                        batch = []
+                    session.progress.emit(done, total)
+                    sent_at = now
+            if batch and not session.cancelled:
+                session.resultsReady.emit(batch)
+        except Exception as e:
+            session.failed.emit(str(e))
+        session.finished.emit(session.cancelled)
+
+
+class SearchResultModel(QAbstractListModel):
+    """
+    Flat list of SearchResults that grows as batches arrive. Rows are only
+    formatted when the view paints them.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._results: list[SearchResult] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._results)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        res = self._results[index.row()]
+        if role == Qt.DisplayRole:
+            field = getattr(res, "field", None)  # PO-aware hits name the entry field
+            where = f"{res.line} {field}" if field else f"{res.line}"
+            return f"{os.path.basename(res.filepath)}:{where}  {res.preview}"
+        if role == Qt.ToolTipRole:
+            return f"{res.filepath}:{res.line}:{res.column}"
+        if role == Qt.UserRole:
+            return res
+        return None
+
+    def result(self, row: int) -> SearchResult:
+        return self._results[row]
+
+    def results(self) -> list[SearchResult]:
+        return self._results
+
+    def append_results(self, batch: list[SearchResult]):
+        if not batch:
+            return
+        first = len(self._results)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        self._results.extend(batch)
+        self.endInsertRows()
+
+    def replace_file_results(self, filepath: str, results: list[SearchResult]) -> int:
+        """
+        Swap the results of one file (contiguous: a file is searched in one
+        piece) for `results`, e.g. after it was edited. Returns their first row.
+        """
+        rows = [i for i, r in enumerate(self._results) if r.filepath == filepath]
+        first = rows[0] if rows else len(self._results)
+        self.beginResetModel()
+        self._results = [r for r in self._results if r.filepath != filepath]
+        self._results[first:first] = results
+        self.endResetModel()
+        return first
+
+    def clear(self):
+        self.beginResetModel()
+        self._results = []
+        self.endResetModel()